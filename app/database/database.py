@@ -17,6 +17,29 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+def add_analytics_month_bucket(cursor):
+    """为分析统计表添加月分区键列、回填历史数据并建立索引（可重复执行）"""
+    cursor.execute("PRAGMA table_info(analytics_hourly);")
+    columns = {row[1] for row in cursor.fetchall()}
+    if not columns:
+        # 表尚未创建，由 create_all 按模型建表
+        return
+    
+    if 'month_bucket' not in columns:
+        logger.info("添加分析统计月分区列: analytics_hourly.month_bucket")
+        cursor.execute("ALTER TABLE analytics_hourly ADD COLUMN month_bucket INTEGER;")
+    
+    cursor.execute("""
+        UPDATE analytics_hourly
+        SET month_bucket = CAST(strftime('%Y%m', hour_timestamp) AS INTEGER)
+        WHERE month_bucket IS NULL;
+    """)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS ix_analytics_hourly_month_bucket 
+        ON analytics_hourly(month_bucket);
+    """)
+
 class SessionContextManager:
     """数据库会话上下文管理器"""
     
@@ -67,6 +90,7 @@ class DatabaseManager:
         """创建所有数据库表"""
         try:
             Base.metadata.create_all(bind=self.engine)
+            self.upgrade_schema()
             logger.info("数据库表创建成功")
             
             # 检查是否需要创建默认用户
@@ -76,6 +100,23 @@ class DatabaseManager:
             logger.error(f"创建数据库表失败: {e}")
             raise
     
+    def upgrade_schema(self):
+        """为已有数据库补齐后续新增的列和索引
+        
+        create_all 不会修改已存在的表，模型新增的列需要在这里补齐；
+        所有步骤均可重复执行。
+        """
+        if 'sqlite' not in self.database_url:
+            return
+        
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            add_analytics_month_bucket(cursor)
+            raw_conn.commit()
+        finally:
+            raw_conn.close()
+    
     def _ensure_default_user(self):
         """确保存在默认用户"""
         try:
@@ -90,6 +90,10 @@ class EnhancedDatabaseManager(BaseDBManager):
                     logger.warning("数据库完整性检查失败，尝试修复")
                     self._repair_database()
                     result['details']['repair_attempted'] = True
+                
+                # 已有数据库：补齐模型新增的列和索引
+                self.upgrade_schema()
+                result['details']['schema_upgraded'] = True
                     
             # 运行数据库优化
             self._optimize_database()
@@ -16,6 +16,7 @@ from pathlib import Path
 from datetime import datetime
 from app.utils.logger import get_logger
 from app.utils.enhanced_config import get_enhanced_config
+from app.database.database import add_analytics_month_bucket
 
 logger = get_logger(__name__)
 
@@ -82,6 +83,9 @@ class PerformanceIndexMigration:
                     ON analytics_hourly(hour_timestamp, project_id);
                 """)
                 
+                # 6. 分析统计按月分区键
+                self._add_analytics_month_bucket(cursor)
+                
                 conn.commit()
                 logger.info("✅ 所有性能索引创建完成！")
                 
@@ -97,11 +101,16 @@ class PerformanceIndexMigration:
             logger.error(f"创建索引失败: {e}", exc_info=True)
             return False
             
+    def _add_analytics_month_bucket(self, cursor):
+        """为分析统计表添加月分区键列、回填历史数据并建立索引"""
+        logger.info("创建分析统计月分区索引: ix_analytics_hourly_month_bucket")
+        add_analytics_month_bucket(cursor)
+        
     def _verify_indexes(self, cursor):
         """验证索引是否创建成功"""
         logger.info("验证索引创建状态...")
         
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_%';")
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND (name LIKE 'idx_%' OR name LIKE 'ix_%');")
         indexes = cursor.fetchall()
         
         expected_indexes = [
@@ -109,7 +118,8 @@ class PerformanceIndexMigration:
             'idx_tasks_project_status', 
             'idx_tasks_scheduled_status',
             'idx_logs_task_published',
-            'idx_analytics_hour_project'
+            'idx_analytics_hour_project',
+            'ix_analytics_hourly_month_bucket'
         ]
         
         created_indexes = [idx[0] for idx in indexes]
@@ -192,7 +202,8 @@ class PerformanceIndexMigration:
                     'idx_tasks_project_status',
                     'idx_tasks_scheduled_status', 
                     'idx_logs_task_published',
-                    'idx_analytics_hour_project'
+                    'idx_analytics_hour_project',
+                    'ix_analytics_hourly_month_bucket'
                 ]
                 
                 for index_name in indexes_to_drop:
@@ -143,12 +143,17 @@ class PublishingLog(Base):
     # 关系
     task = relationship("PublishingTask", back_populates="logs")
 
+def month_bucket_of(timestamp: datetime) -> int:
+    """计算时间戳所属的月分区键 (yyyymm)"""
+    return timestamp.year * 100 + timestamp.month
+
 class AnalyticsHourly(Base):
     """小时级分析统计表 - 用于快速报表生成"""
     __tablename__ = 'analytics_hourly'
     
     id = Column(Integer, primary_key=True)
     hour_timestamp = Column(DateTime, nullable=False)  # 小时时间戳
+    month_bucket = Column(Integer, index=True)  # 月分区键 (yyyymm)，用于按月裁剪范围扫描
     project_id = Column(Integer, ForeignKey('projects.id'), nullable=False)
     successful_tasks = Column(Integer, nullable=False, default=0)
     failed_tasks = Column(Integer, nullable=False, default=0)
@@ -1,8 +1,10 @@
 # app/database/repository.py
 
 from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+import threading
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc, func
+from sqlalchemy import and_, or_, desc, asc, func, cast, Integer, event
 from datetime import datetime, timedelta
 import hashlib
 import secrets
@@ -10,7 +12,7 @@ import json
 
 from .models import (
     User, ApiKey, Project, ContentSource, 
-    PublishingTask, PublishingLog, AnalyticsHourly
+    PublishingTask, PublishingLog, AnalyticsHourly, month_bucket_of
 )
 
 class UserRepository:
@@ -738,9 +740,30 @@ class PublishingLogRepository:
 class AnalyticsRepository:
     """分析统计数据访问层"""
     
+    # 进程级聚合查询结果缓存，键为 (project_id, start_time)；
+    # 写入只标记会话，事务提交或回滚后才整体失效，缓存中只保存已提交的数据
+    _AGG_CACHE_MAX_SIZE = 128
+    _agg_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+    _agg_cache_lock = threading.Lock()
+    # 每次失效递增；查询开始后发生过失效的结果不写入缓存，避免提交前读到的旧数据回填
+    _agg_cache_generation = 0
+    # 会话中存在未提交的分析数据写入时的 session.info 标记
+    _PENDING_WRITE_KEY = 'analytics_agg_pending_write'
+    
     def __init__(self, session: Session):
         self.session = session
     
+    @classmethod
+    def _invalidate_agg_cache(cls):
+        """清空聚合查询缓存"""
+        with cls._agg_cache_lock:
+            cls._agg_cache.clear()
+            cls._agg_cache_generation += 1
+    
+    def _mark_pending_write(self):
+        """标记会话写入了分析数据，提交或回滚时再使缓存失效"""
+        self.session.info[self._PENDING_WRITE_KEY] = True
+    
     def update_hourly_stats(self, project_id: int, hour_timestamp: datetime):
         """更新小时级统计数据"""
         # 计算该小时的统计数据
@@ -776,6 +799,7 @@ class AnalyticsRepository:
             else:
                 hourly_stat = AnalyticsHourly(
                     hour_timestamp=hour_start,
+                    month_bucket=month_bucket_of(hour_start),
                     project_id=project_id,
                     successful_tasks=stats.success or 0,
                     failed_tasks=stats.failed or 0,
@@ -784,6 +808,7 @@ class AnalyticsRepository:
                 self.session.add(hourly_stat)
             
             self.session.flush()
+            self._mark_pending_write()
     
     def get_project_analytics(self, project_id: int, days: int = 7) -> List[AnalyticsHourly]:
         """获取项目分析数据"""
@@ -791,6 +816,7 @@ class AnalyticsRepository:
         return self.session.query(AnalyticsHourly).filter(
             and_(
                 AnalyticsHourly.project_id == project_id,
+                AnalyticsHourly.month_bucket >= month_bucket_of(start_time),
                 AnalyticsHourly.hour_timestamp >= start_time
             )
         ).order_by(AnalyticsHourly.hour_timestamp.desc()).all()
@@ -831,6 +857,7 @@ class AnalyticsRepository:
             # 创建新记录
             hourly_stat = AnalyticsHourly(
                 hour_timestamp=hour_start,
+                month_bucket=month_bucket_of(hour_start),
                 project_id=project_id,
                 successful_tasks=successful_tasks,
                 failed_tasks=failed_tasks,
@@ -839,10 +866,22 @@ class AnalyticsRepository:
             self.session.add(hourly_stat)
         
         self.session.flush()
+        self._mark_pending_write()
     
     def get_project_analytics_summary(self, project_id: int, hours: int = 24):
         """获取项目分析摘要"""
-        start_time = datetime.utcnow() - timedelta(hours=hours)
+        # 小时统计以整点为粒度，截断到分钟不影响结果，同时让相同请求命中缓存
+        start_time = (datetime.utcnow() - timedelta(hours=hours)).replace(second=0, microsecond=0)
+        cache_key = (project_id, start_time.isoformat())
+        # 本会话有未提交的写入时，结果包含未提交数据，既不读也不写缓存
+        use_cache = not self.session.info.get(self._PENDING_WRITE_KEY)
+        
+        with self._agg_cache_lock:
+            generation = self._agg_cache_generation
+            cached = self._agg_cache.get(cache_key) if use_cache else None
+            if cached is not None:
+                self._agg_cache.move_to_end(cache_key)
+                return dict(cached)
         
         result = self.session.query(
             func.sum(AnalyticsHourly.successful_tasks).label('total_successful'),
@@ -852,22 +891,33 @@ class AnalyticsRepository:
         ).filter(
             and_(
                 AnalyticsHourly.project_id == project_id,
+                AnalyticsHourly.month_bucket >= month_bucket_of(start_time),
                 AnalyticsHourly.hour_timestamp >= start_time
             )
         ).first()
         
-        return {
+        summary = {
             'total_successful': result.total_successful or 0,
             'total_failed': result.total_failed or 0,
             'total_duration_seconds': result.total_duration_seconds or 0,
             'average_duration_seconds': result.average_duration_seconds or 0
         }
+        
+        with self._agg_cache_lock:
+            if use_cache and generation == self._agg_cache_generation:
+                self._agg_cache[cache_key] = summary
+                self._agg_cache.move_to_end(cache_key)
+                while len(self._agg_cache) > self._AGG_CACHE_MAX_SIZE:
+                    self._agg_cache.popitem(last=False)
+        
+        return dict(summary)
     
     def get_hourly_analytics_data(self, project_id: int, start_time: datetime, end_time: datetime):
         """获取小时分析数据"""
         return self.session.query(AnalyticsHourly).filter(
             and_(
                 AnalyticsHourly.project_id == project_id,
+                AnalyticsHourly.month_bucket.between(month_bucket_of(start_time), month_bucket_of(end_time)),
                 AnalyticsHourly.hour_timestamp >= start_time,
                 AnalyticsHourly.hour_timestamp <= end_time
             )
@@ -875,17 +925,30 @@ class AnalyticsRepository:
     
     def cleanup_old_analytics(self, days: int = 90) -> int:
         """清理旧分析数据"""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        # 截止时间由SQLite计算（UTC），偏移量作为绑定参数传入，保持语句文本不变
+        offset = f'-{int(days)} days'
+        cutoff_date = func.datetime('now', offset)
+        cutoff_bucket = cast(func.strftime('%Y%m', 'now', offset), Integer)
+        # 月分区键走索引裁剪，时间戳条件保证截止点精确
         deleted = self.session.query(AnalyticsHourly).filter(
+            AnalyticsHourly.month_bucket <= cutoff_bucket,
             AnalyticsHourly.hour_timestamp < cutoff_date
-        ).delete()
+        ).delete(synchronize_session=False)
         self.session.flush()
+        self._mark_pending_write()
         return deleted
     
     def get_all(self) -> List[AnalyticsHourly]:
         """获取所有分析数据"""
         return self.session.query(AnalyticsHourly).all()
 
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _invalidate_analytics_cache_on_transaction_end(session: Session):
+    """写入过分析数据的会话在事务提交或回滚后使聚合缓存失效"""
+    if session.info.pop(AnalyticsRepository._PENDING_WRITE_KEY, False):
+        AnalyticsRepository._invalidate_agg_cache()
+
 class DatabaseRepository:
     """数据库仓库统一入口"""
     
@@ -22,7 +22,7 @@ from app.database.db_manager import EnhancedDatabaseManager
 from app.core.enhanced_scheduler import EnhancedTaskScheduler
 from app.utils.enhanced_config import get_enhanced_config
 from app.utils.error_handler import ErrorHandler
-from app.utils.performance_monitor import PerformanceMonitor
+from app.utils.performance_monitor import get_performance_monitor
 from app.core.publisher import TwitterPublisher
 from app.core.content_generator import ContentGenerator
 from app.utils.logger import setup_logger, get_logger
@@ -33,6 +33,14 @@ try:
 except ImportError:
     ScriptManager = None
 
+# 必需的Twitter API环境变量: (发布器参数名, 环境变量名)
+_REQUIRED_TWITTER_ENV = (
+    ('api_key', 'TWITTER_API_KEY'),
+    ('api_secret', 'TWITTER_API_SECRET'),
+    ('access_token', 'TWITTER_ACCESS_TOKEN'),
+    ('access_token_secret', 'TWITTER_ACCESS_TOKEN_SECRET'),
+)
+
 # 全局变量
 scheduler: Optional[EnhancedTaskScheduler] = None
 running = False
@@ -61,8 +69,8 @@ def setup_signal_handlers():
     signal.signal(signal.SIGTERM, signal_handler)
 
 
-def initialize_system():
-    """初始化系统"""
+async def initialize_system():
+    """初始化系统（数据库初始化与性能监控启动并发执行）"""
     global logger
     
     # 加载环境变量
@@ -84,20 +92,22 @@ def initialize_system():
     error_handler = ErrorHandler()
     logger.info("错误处理器已初始化")
     
-    # 启动性能监控
-    performance_monitor = PerformanceMonitor()
-    logger.info("性能监控已启动")
-    
-    # 初始化数据库
+    performance_monitor = get_performance_monitor()
     db_manager = EnhancedDatabaseManager()
-    init_result = db_manager.initialize_database()
+    
+    # 并发执行相互独立的启动任务：初始化数据库、启动性能监控
+    init_result, _ = await asyncio.gather(
+        asyncio.to_thread(db_manager.initialize_database),
+        asyncio.to_thread(performance_monitor.start_monitoring)
+    )
+    logger.info("性能监控已启动")
     if not init_result['success']:
         logger.error(f"数据库初始化失败: {init_result['message']}")
         sys.exit(1)
     logger.info("增强数据库管理器已初始化")
     
     # 检查系统健康状态
-    health = db_manager.check_health()
+    health = await asyncio.to_thread(db_manager.check_health)
     if not health['healthy']:
         logger.warning(f"系统健康检查警告: {health.get('issues', [])}")
     
@@ -106,14 +116,10 @@ def initialize_system():
 
 def create_scheduler(config, db_manager):
     """创建增强调度器"""
-    import os
-    
     # 从环境变量读取Twitter配置
+    env = os.environ
     twitter_config = {
-        'api_key': os.getenv('TWITTER_API_KEY'),
-        'api_secret': os.getenv('TWITTER_API_SECRET'),
-        'access_token': os.getenv('TWITTER_ACCESS_TOKEN'),
-        'access_token_secret': os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
+        param: env.get(env_key) for param, env_key in _REQUIRED_TWITTER_ENV
     }
     
     missing_keys = [k for k, v in twitter_config.items() if not v]
@@ -193,10 +199,12 @@ def run_single_batch(scheduler, config, project=None, language=None, limit=None)
             language_filter=language
         )
         
-        logger.info(f"批处理完成:")
-        logger.info(f"  已处理: {stats['processed']}")
-        logger.info(f"  成功: {stats['successful']}")
-        logger.info(f"  失败: {stats['failed']}")
+        logger.info(
+            f"批处理完成:\n"
+            f"  已处理: {stats['processed']}\n"
+            f"  成功: {stats['successful']}\n"
+            f"  失败: {stats['failed']}"
+        )
         
         return stats
         
@@ -207,35 +215,38 @@ def run_single_batch(scheduler, config, project=None, language=None, limit=None)
 
 def show_system_status(config, db_manager):
     """显示系统状态"""
-    logger.info("=== 系统状态报告 ===")
+    # 汇总所有状态行后一次性输出
+    lines = ["=== 系统状态报告 ==="]
     
     # 数据库状态
     health = db_manager.check_health()
-    logger.info(f"数据库状态: {'健康' if health['healthy'] else '异常'}")
-    if health.get('issues'):
-        for issue in health['issues']:
-            logger.warning(f"  问题: {issue}")
+    lines.append(f"数据库状态: {'健康' if health['healthy'] else '异常'}")
+    # 问题随报告一起输出，保持在报告标题之后
+    lines.extend(f"  问题: {issue}" for issue in health.get('issues') or ())
     
     # 性能状态
     try:
-        monitor = PerformanceMonitor()
+        # 复用启动时已运行的全局监控器，新建实例没有采集数据
+        monitor = get_performance_monitor()
         metrics = monitor.get_current_metrics()
-        if metrics:
-            logger.info(f"系统性能:")
-            logger.info(f"  CPU使用率: {metrics.cpu_percent:.1f}%")
-            logger.info(f"  内存使用率: {metrics.memory_percent:.1f}%")
-            logger.info(f"  磁盘使用率: {metrics.disk_usage_percent:.1f}%")
-        else:
-            logger.info("系统性能: 监控未启动")
+        if metrics is None:
+            # 监控刚启动、首个采样尚未完成时立即采集一次
+            metrics = monitor.sample_now()
+        lines.append("系统性能:")
+        lines.append(f"  CPU使用率: {metrics.cpu_percent:.1f}%")
+        lines.append(f"  内存使用率: {metrics.memory_percent:.1f}%")
+        lines.append(f"  磁盘使用率: {metrics.disk_usage_percent:.1f}%")
     except Exception as e:
         logger.warning(f"无法获取性能指标: {e}")
     
     # 配置状态
-    logger.info(f"配置状态:")
-    logger.info(f"  发布间隔: {config.get('scheduling', {}).get('interval_hours', 24)}小时")
-    logger.info(f"  批量大小: {config.get('scheduling', {}).get('batch_size', 5)}")
-    logger.info(f"  AI增强: {'启用' if config.get('publishing', {}).get('use_ai_enhancement', True) else '禁用'}")
-    logger.info(f"  性能监控: {'启用' if config.get('performance', {}).get('monitoring_enabled', True) else '禁用'}")
+    lines.append("配置状态:")
+    lines.append(f"  发布间隔: {config.get('scheduling', {}).get('interval_hours', 24)}小时")
+    lines.append(f"  批量大小: {config.get('scheduling', {}).get('batch_size', 5)}")
+    lines.append(f"  AI增强: {'启用' if config.get('publishing', {}).get('use_ai_enhancement', True) else '禁用'}")
+    lines.append(f"  性能监控: {'启用' if config.get('performance', {}).get('monitoring_enabled', True) else '禁用'}")
+    
+    logger.info("\n".join(lines))
 
 
 def run_management_mode(command: str, **kwargs):
@@ -349,7 +360,7 @@ def main():
             sys.exit(0 if success else 1)
         
         # 初始化系统（非管理模式）
-        config, db_manager = initialize_system()
+        config, db_manager = asyncio.run(initialize_system())
         
         if args.mode == 'status':
             # 仅显示状态
@@ -367,11 +378,14 @@ def main():
             # 单次批处理模式
             stats = run_single_batch(scheduler, config, args.project, args.language, args.limit)
             
-            # 显示结果
-            print(f"\n批处理结果:")
-            print(f"  已处理: {stats['processed']}")
-            print(f"  成功: {stats['successful']}")
-            print(f"  失败: {stats['failed']}")
+            # 显示结果（一次性写出）
+            sys.stdout.write(
+                f"\n批处理结果:\n"
+                f"  已处理: {stats['processed']}\n"
+                f"  成功: {stats['successful']}\n"
+                f"  失败: {stats['failed']}\n"
+            )
+            sys.stdout.flush()
         
     except KeyboardInterrupt:
         if logger:
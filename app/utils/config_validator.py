@@ -4,7 +4,11 @@
 """
 
 import os
-from typing import Dict, List, Any, Optional
+import stat
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from app.utils.logger import get_logger
 from app.utils.enhanced_config import get_enhanced_config
@@ -12,33 +16,105 @@ from app.utils.path_manager import get_path_manager
 
 logger = get_logger(__name__)
 
+# 支持的默认语言
+_SUPPORTED_LANGUAGES = frozenset(('en', 'zh', 'es', 'fr', 'de', 'ja', 'ko'))
+
+# 有效的日志级别
+_VALID_LOG_LEVELS = frozenset(('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'))
+
+# 必需的Twitter API配置项
+_REQUIRED_TWITTER_KEYS = ('api_key', 'api_secret', 'access_token', 'access_token_secret')
+
+# SQLite数据库URL前缀
+_SQLITE_PREFIX = 'sqlite:///'
+_SQLITE_PREFIX_LEN = len(_SQLITE_PREFIX)
+
+# validate_config 结果缓存: ((验证模式, 配置文件修改时间键, 环境变量, 文件系统状态键), 验证结果)
+_VALIDATION_CACHE: Optional[Tuple[tuple, Dict[str, Any]]] = None
+
+# 并发执行验证步骤的共享线程池（线程按需创建，各次验证复用）；大小与完整验证的步骤数一致
+_VALIDATION_WORKERS = 5
+_validation_executor = ThreadPoolExecutor(max_workers=_VALIDATION_WORKERS,
+                                          thread_name_prefix='config-validator')
+
+# 全局配置验证器实例
+_validator_instance = None
+_validator_lock = threading.Lock()
+
+class ValidationMode(Enum):
+    """配置验证模式"""
+    SKIP = "skip"    # 仅检查必需的API密钥是否存在
+    FAST = "fast"    # 检查配置项，不访问文件系统
+    FULL = "full"    # 全面验证，包括文件系统检查
+
+
 class ConfigValidator:
     """配置验证器"""
     
     def __init__(self):
         self.config = get_enhanced_config()
+        # 配置文件和环境变量文件路径在运行期间不变，构造一次
+        self._config_paths: Tuple[Path, ...] = tuple(
+            Path(p) for p in (self.config.config_file_path, self.config.env_file_path)
+        )
         self.errors = []
         self.warnings = []
+        self.lock = threading.RLock()
+        # 项目基础路径解析结果缓存: (路径管理器, 配置值, 解析后的路径)
+        self._project_path_cache: Optional[Tuple[Any, str, Path]] = None
     
-    def validate_all(self) -> Dict[str, Any]:
-        """执行全面的配置验证"""
-        self.errors.clear()
-        self.warnings.clear()
-        
-        # 验证基础配置
-        self._validate_basic_config()
+    def reset(self):
+        """重置验证状态（使用新列表，之前返回的结果不受影响）"""
+        self.errors = []
+        self.warnings = []
+    
+    def validate_all(self, mode: ValidationMode = ValidationMode.FULL,
+                     fail_fast: bool = False) -> Dict[str, Any]:
+        """执行配置验证
         
-        # 验证路径配置
-        self._validate_paths()
+        Args:
+            mode: 验证模式，SKIP仅检查API密钥，FAST跳过文件系统检查，FULL执行全面验证
+            fail_fast: 为True时按顺序执行验证步骤，遇到第一个报告错误的步骤即停止
+        """
+        with self.lock:
+            return self._run_validation(mode, fail_fast)
+    
+    def _run_validation(self, mode: ValidationMode, fail_fast: bool) -> Dict[str, Any]:
+        """执行验证步骤并汇总结果"""
+        self.reset()
         
-        # 验证API配置
-        self._validate_api_configs()
+        # 一次性读取各验证步骤所需的配置
+        snapshot = self._take_snapshot()
         
-        # 验证数据库配置
-        self._validate_database_config()
+        if mode is ValidationMode.SKIP:
+            # 仅验证API配置
+            validators = [(self._validate_api_configs, (snapshot,))]
+        else:
+            probe_fs = mode is ValidationMode.FULL
+            validators = [
+                (self._validate_basic_config, (snapshot, probe_fs)),   # 基础配置
+                (self._validate_paths, (snapshot, probe_fs)),          # 路径配置
+                (self._validate_api_configs, (snapshot,)),             # API配置
+                (self._validate_database_config, (snapshot, probe_fs)),  # 数据库配置
+                (self._validate_logging_config, (snapshot,))           # 日志配置
+            ]
         
-        # 验证日志配置
-        self._validate_logging_config()
+        if fail_fast or len(validators) == 1:
+            # 只关心是否通过时顺序执行，出现错误后跳过剩余步骤；单个步骤直接在当前线程执行
+            for fn, args in validators:
+                errors, warnings = fn(*args)
+                self.errors.extend(errors)
+                self.warnings.extend(warnings)
+                if errors and fail_fast:
+                    break
+        else:
+            # 各验证步骤相互独立，在共享线程池中并发执行以重叠文件系统调用的等待时间
+            futures = [_validation_executor.submit(fn, *args) for fn, args in validators]
+            # 按提交顺序合并结果，保持错误和警告的输出顺序稳定
+            for future in futures:
+                errors, warnings = future.result()
+                self.errors.extend(errors)
+                self.warnings.extend(warnings)
         
         return {
             'valid': len(self.errors) == 0,
@@ -47,138 +123,249 @@ class ConfigValidator:
             'summary': self._generate_summary()
         }
     
-    def _validate_basic_config(self):
+    def _take_snapshot(self) -> Dict[str, Any]:
+        """读取配置快照，读取失败的项保存异常，由对应验证步骤报告"""
+        def load(getter):
+            try:
+                return getter()
+            except Exception as e:
+                return e
+        
+        ai_enhancement = load(lambda: self.config.get('ai_enhancement', {}).get('enabled', False))
+        return {
+            'twitter': load(lambda: self.config.get_twitter_config()),
+            'ai_enhancement': ai_enhancement,
+            'gemini': (load(lambda: self.config.get_gemini_config())
+                       if ai_enhancement and not isinstance(ai_enhancement, Exception) else None),
+            'db': load(lambda: self.config.get_database_config()),
+            'logging': load(lambda: self.config.get('logging', {})),
+            'project_base_path': load(lambda: self.config.get('project_base_path')),
+            'default_language': load(lambda: self.config.get('default_language', 'en'))
+        }
+    
+    @staticmethod
+    def _section(snapshot: Dict[str, Any], key: str) -> Any:
+        """取出快照中的配置项，读取时出现的异常在此重新抛出"""
+        value = snapshot[key]
+        if isinstance(value, Exception):
+            raise value
+        return value
+    
+    def _resolve_project_path(self, project_base_path: str) -> Path:
+        """解析项目基础路径，配置值和路径管理器不变时复用上次结果"""
+        path_manager = get_path_manager()
+        cached = self._project_path_cache
+        if cached is not None and cached[0] is path_manager and cached[1] == project_base_path:
+            return cached[2]
+        
+        resolved_path = path_manager.get_project_path(project_base_path)
+        self._project_path_cache = (path_manager, project_base_path, resolved_path)
+        return resolved_path
+    
+    def _filesystem_key(self) -> tuple:
+        """完整验证所检查的项目路径、日志目录和数据库目录的当前状态，用作缓存键的一部分"""
+        snapshot = self._take_snapshot()
+        paths = []
+        
+        try:
+            project_base_path = self._section(snapshot, 'project_base_path')
+            paths.append(self._resolve_project_path(project_base_path) if project_base_path else None)
+        except Exception:
+            paths.append(None)
+        
+        try:
+            paths.append(self._section(snapshot, 'logging').get('log_dir', 'logs'))
+        except Exception:
+            paths.append(None)
+        
+        try:
+            db_url = self._section(snapshot, 'db').get('url')
+            paths.append(Path(db_url[_SQLITE_PREFIX_LEN:]).parent
+                         if db_url and db_url.startswith(_SQLITE_PREFIX) else None)
+        except Exception:
+            paths.append(None)
+        
+        return tuple((str(path), _path_state(path)) if path is not None else None for path in paths)
+    
+    def _validate_basic_config(self, snapshot: Dict[str, Any], probe_fs: bool = True) -> Tuple[List[str], List[str]]:
         """验证基础配置"""
+        errors, warnings = [], []
         try:
-            # 检查必需的配置文件
-            config_files = [
-                self.config.config_file_path,
-                self.config.env_file_path
-            ]
-            
-            for config_file in config_files:
-                if not Path(config_file).exists():
-                    self.errors.append(f"配置文件不存在: {config_file}")
+            if probe_fs:
+                # 检查必需的配置文件，每个父目录只读取一次目录项，用名称集合判断文件是否存在
+                dir_listings = {}
+                for file_path in self._config_paths:
+                    parent = file_path.parent
+                    if parent not in dir_listings:
+                        try:
+                            with os.scandir(parent) as it:
+                                dir_listings[parent] = {entry.name for entry in it}
+                        except OSError:
+                            dir_listings[parent] = set()
+                    if file_path.name not in dir_listings[parent]:
+                        errors.append(f"配置文件不存在: {file_path}")
             
             # 检查默认语言
-            default_language = self.config.get('default_language', 'en')
-            supported_languages = ['en', 'zh', 'es', 'fr', 'de', 'ja', 'ko']
-            if default_language not in supported_languages:
-                self.warnings.append(f"不支持的默认语言: {default_language}")
+            default_language = self._section(snapshot, 'default_language')
+            if default_language not in _SUPPORTED_LANGUAGES:
+                warnings.append(f"不支持的默认语言: {default_language}")
             
         except Exception as e:
-            self.errors.append(f"基础配置验证失败: {e}")
+            errors.append(f"基础配置验证失败: {e}")
+        
+        return errors, warnings
     
-    def _validate_paths(self):
+    def _validate_paths(self, snapshot: Dict[str, Any], probe_fs: bool = True) -> Tuple[List[str], List[str]]:
         """验证路径配置"""
+        errors, warnings = [], []
         try:
             # 验证项目基础路径
-            project_base_path = self.config.get('project_base_path')
+            project_base_path = self._section(snapshot, 'project_base_path')
             if not project_base_path:
-                self.errors.append("未配置项目基础路径 (project_base_path)")
-            else:
+                errors.append("未配置项目基础路径 (project_base_path)")
+            elif probe_fs:
                 # 使用路径管理器正确解析相对路径
-                path_manager = get_path_manager()
-                resolved_path = path_manager.get_project_path(project_base_path)
+                resolved_path = self._resolve_project_path(project_base_path)
                 
-                if not resolved_path.exists():
-                    self.errors.append(f"项目基础路径不存在: {project_base_path} (解析为: {resolved_path})")
-                elif not resolved_path.is_dir():
-                    self.errors.append(f"项目基础路径不是目录: {project_base_path} (解析为: {resolved_path})")
-                elif not os.access(resolved_path, os.R_OK):
-                    self.errors.append(f"项目基础路径无读取权限: {project_base_path} (解析为: {resolved_path})")
+                # 一次stat同时得到存在性和类型
+                try:
+                    st = os.stat(resolved_path)
+                except FileNotFoundError:
+                    errors.append(f"项目基础路径不存在: {project_base_path} (解析为: {resolved_path})")
+                else:
+                    if not stat.S_ISDIR(st.st_mode):
+                        errors.append(f"项目基础路径不是目录: {project_base_path} (解析为: {resolved_path})")
+                    elif not os.access(resolved_path, os.R_OK):
+                        errors.append(f"项目基础路径无读取权限: {project_base_path} (解析为: {resolved_path})")
             
-            # 验证日志目录
-            log_dir = self.config.get('logging', {}).get('log_dir', 'logs')
-            log_path = Path(log_dir)
-            if not log_path.exists():
+            if probe_fs:
+                # 验证日志目录（仅检查，目录创建由 ensure_directories 负责）
+                log_dir = self._section(snapshot, 'logging').get('log_dir', 'logs')
                 try:
-                    log_path.mkdir(parents=True, exist_ok=True)
-                    logger.info(f"创建日志目录: {log_dir}")
-                except Exception as e:
-                    self.errors.append(f"无法创建日志目录 {log_dir}: {e}")
+                    st = os.stat(log_dir)
+                except FileNotFoundError:
+                    warnings.append(f"日志目录不存在: {log_dir}")
+                else:
+                    if not stat.S_ISDIR(st.st_mode):
+                        errors.append(f"日志目录不是目录: {log_dir}")
             
         except Exception as e:
-            self.errors.append(f"路径配置验证失败: {e}")
+            errors.append(f"路径配置验证失败: {e}")
+        
+        return errors, warnings
     
-    def _validate_api_configs(self):
+    def _validate_api_configs(self, snapshot: Dict[str, Any]) -> Tuple[List[str], List[str]]:
         """验证API配置"""
+        errors, warnings = [], []
         try:
             # 验证Twitter API配置
-            twitter_config = self.config.get_twitter_config()
-            required_twitter_keys = [
-                'api_key', 'api_secret', 'access_token', 'access_token_secret'
-            ]
-            
-            for key in required_twitter_keys:
-                if not twitter_config.get(key):
-                    self.errors.append(f"缺少Twitter API配置: {key}")
+            twitter_config = self._section(snapshot, 'twitter')
+            missing = [key for key in _REQUIRED_TWITTER_KEYS if not twitter_config.get(key)]
+            errors.extend(f"缺少Twitter API配置: {key}" for key in missing)
             
             # 验证Gemini API配置（如果启用AI增强）
-            ai_enhancement = self.config.get('ai_enhancement', {}).get('enabled', False)
+            ai_enhancement = self._section(snapshot, 'ai_enhancement')
             if ai_enhancement:
-                gemini_config = self.config.get_gemini_config()
+                gemini_config = self._section(snapshot, 'gemini')
                 if not gemini_config.get('api_key'):
-                    self.errors.append("启用AI增强但缺少Gemini API密钥")
+                    errors.append("启用AI增强但缺少Gemini API密钥")
             
         except Exception as e:
-            self.errors.append(f"API配置验证失败: {e}")
+            errors.append(f"API配置验证失败: {e}")
+        
+        return errors, warnings
     
-    def _validate_database_config(self):
+    def _validate_database_config(self, snapshot: Dict[str, Any], probe_fs: bool = True) -> Tuple[List[str], List[str]]:
         """验证数据库配置"""
+        errors, warnings = [], []
         try:
-            db_config = self.config.get_database_config()
+            db_config = self._section(snapshot, 'db')
             db_url = db_config.get('url')
             
             if not db_url:
-                self.errors.append("缺少数据库URL配置")
-            elif db_url.startswith('sqlite:///'):
+                errors.append("缺少数据库URL配置")
+            elif probe_fs and db_url.startswith(_SQLITE_PREFIX):
                 # SQLite数据库路径验证
-                db_path = db_url.replace('sqlite:///', '')
+                db_path = db_url[_SQLITE_PREFIX_LEN:]
                 db_file = Path(db_path)
                 db_dir = db_file.parent
                 
-                if not db_dir.exists():
-                    try:
-                        db_dir.mkdir(parents=True, exist_ok=True)
-                        logger.info(f"创建数据库目录: {db_dir}")
-                    except Exception as e:
-                        self.errors.append(f"无法创建数据库目录 {db_dir}: {e}")
+                try:
+                    st = os.stat(db_dir)
+                except FileNotFoundError:
+                    warnings.append(f"数据库目录不存在: {db_dir}")
+                else:
+                    if not stat.S_ISDIR(st.st_mode):
+                        errors.append(f"数据库目录不是目录: {db_dir}")
             
         except Exception as e:
-            self.errors.append(f"数据库配置验证失败: {e}")
+            errors.append(f"数据库配置验证失败: {e}")
+        
+        return errors, warnings
     
-    def _validate_logging_config(self):
+    def _validate_logging_config(self, snapshot: Dict[str, Any]) -> Tuple[List[str], List[str]]:
         """验证日志配置"""
+        errors, warnings = [], []
         try:
-            logging_config = self.config.get('logging', {})
+            logging_config = self._section(snapshot, 'logging')
             
             # 验证日志级别
             log_level = logging_config.get('level', 'INFO')
-            valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-            if log_level not in valid_levels:
-                self.warnings.append(f"无效的日志级别: {log_level}")
+            if log_level not in _VALID_LOG_LEVELS:
+                warnings.append(f"无效的日志级别: {log_level}")
             
             # 验证日志文件大小限制
             max_bytes = logging_config.get('max_bytes', 10485760)  # 10MB
             if max_bytes < 1024 * 1024:  # 小于1MB
-                self.warnings.append(f"日志文件大小限制过小: {max_bytes} bytes")
+                warnings.append(f"日志文件大小限制过小: {max_bytes} bytes")
             
         except Exception as e:
-            self.errors.append(f"日志配置验证失败: {e}")
+            errors.append(f"日志配置验证失败: {e}")
+        
+        return errors, warnings
+    
+    def ensure_directories(self) -> List[str]:
+        """创建日志目录和SQLite数据库目录，返回创建失败的错误信息
+        
+        验证过程只读取文件系统，应用启动时在验证通过后调用本方法。
+        """
+        errors = []
+        snapshot = self._take_snapshot()
+        directories = []
+        
+        try:
+            directories.append(('日志目录', Path(self._section(snapshot, 'logging').get('log_dir', 'logs'))))
+        except Exception as e:
+            errors.append(f"无法确定日志目录: {e}")
+        
+        try:
+            db_url = self._section(snapshot, 'db').get('url')
+            if db_url and db_url.startswith(_SQLITE_PREFIX):
+                directories.append(('数据库目录', Path(db_url[_SQLITE_PREFIX_LEN:]).parent))
+        except Exception as e:
+            errors.append(f"无法确定数据库目录: {e}")
+        
+        for label, directory in directories:
+            if os.path.isdir(directory):
+                continue
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+                logger.info(f"创建{label}: {directory}")
+            except Exception as e:
+                errors.append(f"无法创建{label} {directory}: {e}")
+        
+        return errors
     
     def _generate_summary(self) -> str:
         """生成验证摘要"""
-        if len(self.errors) == 0 and len(self.warnings) == 0:
+        error_count, warning_count = len(self.errors), len(self.warnings)
+        if not error_count and not warning_count:
             return "配置验证通过，所有设置正常"
-        
-        summary_parts = []
-        if self.errors:
-            summary_parts.append(f"发现 {len(self.errors)} 个错误")
-        if self.warnings:
-            summary_parts.append(f"发现 {len(self.warnings)} 个警告")
-        
-        return "配置验证完成: " + ", ".join(summary_parts)
+        if error_count and warning_count:
+            return f"配置验证完成: 发现 {error_count} 个错误, 发现 {warning_count} 个警告"
+        if error_count:
+            return f"配置验证完成: 发现 {error_count} 个错误"
+        return f"配置验证完成: 发现 {warning_count} 个警告"
     
     def validate_project_structure(self, project_path: str) -> Dict[str, Any]:
         """验证项目结构"""
@@ -186,24 +373,29 @@ class ConfigValidator:
         warnings = []
         
         try:
-            project_path_obj = Path(project_path)
-            if not project_path_obj.exists():
+            # 一次读取目录项同时完成存在性、目录类型和读取权限检查
+            try:
+                with os.scandir(project_path) as it:
+                    entries = {entry.name: entry for entry in it}
+            except FileNotFoundError:
                 errors.append(f"项目路径不存在: {project_path}")
                 return {'valid': False, 'errors': errors, 'warnings': warnings}
+            except NotADirectoryError:
+                errors.append(f"项目路径不是目录: {project_path}")
+                return {'valid': False, 'errors': errors, 'warnings': warnings}
+            except PermissionError:
+                errors.append(f"项目目录无读取权限: {project_path}")
+                return {'valid': False, 'errors': errors, 'warnings': warnings}
             
-            # 检查必需的目录结构
+            # 检查必需的目录结构（DirEntry.is_dir 使用目录项中的类型信息，仅符号链接需要额外stat）
             required_dirs = ['output_video_music', 'uploader_json']
             for dir_name in required_dirs:
-                dir_path = project_path_obj / dir_name
-                if not dir_path.exists():
+                entry = entries.get(dir_name)
+                if entry is None:
                     warnings.append(f"缺少目录: {dir_name}")
-                elif not dir_path.is_dir():
+                elif not entry.is_dir():
                     errors.append(f"路径不是目录: {dir_name}")
             
-            # 检查文件权限
-            if not os.access(project_path_obj, os.R_OK):
-                errors.append(f"项目目录无读取权限: {project_path}")
-            
         except Exception as e:
             errors.append(f"项目结构验证失败: {e}")
         
@@ -214,13 +406,75 @@ class ConfigValidator:
         }
 
 
-def validate_config() -> Dict[str, Any]:
-    """全局配置验证函数"""
-    validator = ConfigValidator()
-    return validator.validate_all()
+def _config_mtime_key(paths: Tuple[Path, ...]) -> tuple:
+    """以配置文件和环境变量文件的修改时间构造缓存键，文件缺失时记为None"""
+    key = []
+    for path in paths:
+        try:
+            key.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            key.append(None)
+    return tuple(key)
+
+
+def _path_state(path) -> Optional[tuple]:
+    """路径的文件类型、权限位和属主，路径不存在或无法访问时为None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (stat.S_IFMT(st.st_mode), stat.S_IMODE(st.st_mode), st.st_uid)
+
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """复制验证结果，避免调用方修改缓存内容"""
+    return {
+        **result,
+        'errors': list(result['errors']),
+        'warnings': list(result['warnings'])
+    }
+
+
+def invalidate_validation_cache():
+    """清除配置验证结果缓存"""
+    global _VALIDATION_CACHE
+    _VALIDATION_CACHE = None
+
+
+def get_config_validator() -> ConfigValidator:
+    """获取全局配置验证器实例"""
+    global _validator_instance
+    
+    with _validator_lock:
+        if _validator_instance is None:
+            _validator_instance = ConfigValidator()
+            
+    return _validator_instance
+
+
+def validate_config(mode: ValidationMode = ValidationMode.FULL) -> Dict[str, Any]:
+    """全局配置验证函数（配置文件、环境变量和被检查的目录均未变化时直接返回缓存结果）"""
+    global _VALIDATION_CACHE
+    validator = get_config_validator()
+    # 验证结果还取决于环境变量（API密钥等）和完整验证时检查的目录，一并纳入缓存键，
+    # 例如 ensure_directories() 创建目录后不会再返回“目录不存在”的旧警告
+    key = (
+        mode,
+        _config_mtime_key(validator._config_paths),
+        frozenset(os.environ.items()),
+        validator._filesystem_key() if mode is ValidationMode.FULL else None
+    )
+    
+    cached = _VALIDATION_CACHE
+    if cached is not None and cached[0] == key:
+        return _copy_result(cached[1])
+    
+    result = validator.validate_all(mode)
+    _VALIDATION_CACHE = (key, _copy_result(result))
+    return result
 
 
 def validate_project(project_path: str) -> Dict[str, Any]:
     """全局项目验证函数"""
-    validator = ConfigValidator()
+    validator = get_config_validator()
     return validator.validate_project_structure(project_path)
\ No newline at end of file
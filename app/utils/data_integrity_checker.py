@@ -18,16 +18,22 @@
 import sqlite3
 import hashlib
 import json
+import secrets
 import os
-import shutil
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple, Set, Callable
+from typing import Dict, List, Optional, Any, Tuple, Set, Callable, Deque, Iterator
 from dataclasses import dataclass, field
 from enum import Enum
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 import threading
+import sched
+import statistics
 import time
 import re
+import sys
 
 from app.utils.logger import get_logger
 
@@ -56,7 +62,10 @@ class RepairStrategy(Enum):
     RECALCULATE = "recalculate"             # 重新计算
     IGNORE = "ignore"                        # 忽略
 
-@dataclass
+# Python 3.10+ 使用 __slots__ 数据类以减少每个问题记录的内存占用
+_SLOTS_DATACLASS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS_DATACLASS)
 class IntegrityIssue:
     """完整性问题记录"""
     issue_id: str
@@ -99,6 +108,326 @@ class IntegrityReport:
     critical_issues: int
     recommendations: List[str]
 
+# 检查连接的PRAGMA设置: WAL允许检查与写入并发，mmap让整个扫描复用操作系统页缓存
+_READ_CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+)
+_CHECK_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+) + _READ_CONNECTION_PRAGMAS
+
+# 修复连接的PRAGMA设置；外键约束保持默认关闭，与逐条修复时的行为一致
+_REPAIR_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -64000",
+)
+
+# 检查器自身维护的表使用统一前缀，不参与完整性检查
+_INTERNAL_TABLE_PREFIX = 'integrity_'
+
+# 只依赖单行数据的规则，增量检查时只需检查新增或更新过的行；
+# 其余规则（重复、序列、跨行时间顺序等）依赖全表，由定期全量检查覆盖
+_INCREMENTAL_RULES = frozenset({
+    '_check_task_rows',
+    '_check_source_paths',
+    '_check_api_key_validity',
+    '_check_api_key_expiration',
+    '_check_analytics_consistency',
+})
+
+# 结果只取决于表内容（不依赖当前时间或其他表）的规则，
+# 表内容指纹未变化时直接复用上次的结果；没有 updated_at 列的表无法察觉原地更新，不缓存
+_CACHEABLE_RULES = frozenset({
+    '_check_task_duplicates',
+    '_check_log_sequence',
+    '_check_log_timestamps',
+    '_check_project_constraints',
+    '_check_analytics_consistency',
+})
+
+# 分析数据的负值条件，同时用于逐行检查和对应的部分索引，两处必须一致索引才会被使用
+_ANALYTICS_NEGATIVE_CONDITION = "tasks_completed < 0 OR tasks_failed < 0 OR total_engagement < 0"
+
+# 检查查询依赖的索引，初始化时按需创建
+_CHECK_INDEXES = (
+    # 日志时间戳顺序检查：按 task_id 分区、按 id 排序的窗口扫描
+    "CREATE INDEX IF NOT EXISTS idx_logs_task_id ON publishing_logs(task_id, id)",
+    # 任务状态检查：按状态 + 更新时间定位长时间运行的任务
+    "CREATE INDEX IF NOT EXISTS idx_tasks_status_updated ON publishing_tasks(status, updated_at)",
+    # 重复任务检查：部分索引只覆盖待处理任务，按 media_path 分组
+    "CREATE INDEX IF NOT EXISTS idx_tasks_media_status ON publishing_tasks(media_path, status) "
+    "WHERE status IN ('pending', 'retry')",
+    # 时间戳检查
+    "CREATE INDEX IF NOT EXISTS idx_tasks_created ON publishing_tasks(created_at)",
+    # 跨表检查：按任务查找成功日志
+    "CREATE INDEX IF NOT EXISTS idx_logs_task_status ON publishing_logs(task_id, status)",
+    # 分析数据负值检查：部分索引只包含异常行
+    "CREATE INDEX IF NOT EXISTS idx_analytics_negative ON analytics_hourly(id) "
+    f"WHERE {_ANALYTICS_NEGATIVE_CONDITION}",
+)
+
+# 刷新查询规划器统计信息: 0x02 分析可能受益的表，0x10 限制每次分析扫描的行数，
+# 0x10000 检查所有表而不只是本连接用过的表（SQLite 3.46+，旧版本忽略不认识的位）
+_OPTIMIZE_PRAGMA = "PRAGMA optimize=0x10012"
+
+# 统计检查耗时的最近检查数
+_DURATION_WINDOW = 1024
+
+# 监控检查失败后的重试间隔（秒）
+_MONITOR_RETRY_DELAY = 60
+
+# quick_check 最多报告的错误数，以及其NULL值违反消息的格式
+_QUICK_CHECK_MAX_ERRORS = 100
+_QUICK_CHECK_NULL_PATTERN = re.compile(r'^NULL value in (\w+)\.(\w+)$')
+
+# 规则结果集每批取出的行数
+_FETCH_BATCH_SIZE = 1000
+
+# 按 rowid 批量回查时每条 IN 查询的参数个数（低于旧版SQLite 999个绑定参数的上限）
+_ROWID_LOOKUP_BATCH_SIZE = 500
+
+# 修复语句: (SQL, 参数)
+RepairStatement = Tuple[str, Tuple[Any, ...]]
+
+# 外键违规的处理策略: (表名, 外键列) -> (问题类型, 严重程度, 修复策略, 描述模板)
+# 未列出的外键按缺失引用处理，需人工审查
+_FOREIGN_KEY_POLICIES: Dict[Tuple[str, str], Tuple[IntegrityIssueType, int, RepairStrategy, str]] = {
+    ('publishing_tasks', 'project_id'): (
+        IntegrityIssueType.MISSING_REFERENCE, 4, RepairStrategy.CASCADE_DELETE,
+        "任务 {record_id} 引用了不存在的项目 {value}"),
+    ('publishing_tasks', 'source_id'): (
+        IntegrityIssueType.MISSING_REFERENCE, 4, RepairStrategy.CASCADE_DELETE,
+        "任务 {record_id} 引用了不存在的内容源 {value}"),
+    ('publishing_logs', 'task_id'): (
+        IntegrityIssueType.ORPHAN_RECORD, 2, RepairStrategy.CASCADE_DELETE,
+        "日志 {record_id} 引用了不存在的任务 {value}"),
+    ('projects', 'user_id'): (
+        IntegrityIssueType.MISSING_REFERENCE, 5, RepairStrategy.MANUAL_REVIEW,
+        "项目 {record_id} 引用了不存在的用户 {value}"),
+    ('content_sources', 'project_id'): (
+        IntegrityIssueType.MISSING_REFERENCE, 4, RepairStrategy.CASCADE_DELETE,
+        "内容源 {record_id} 引用了不存在的项目 {value}"),
+}
+
+@dataclass(frozen=True)
+class RowCheck:
+    """可融合进单次表扫描的逐行检查"""
+    tag: str
+    condition: str                       # SQL条件
+    description_sql: str                 # 生成问题描述的SQL表达式
+    issue_type: IntegrityIssueType
+    column_name: Optional[str]
+    severity: int
+    repair_strategy: RepairStrategy
+    metadata_columns: Tuple[Tuple[str, str], ...]  # (元数据键, 列名)
+
+def _build_row_check_sql(table_name: str, checks: Tuple[RowCheck, ...]) -> str:
+    """
+    将逐行检查融合为一条查询：WHERE 为各条件的并集，每个检查输出一列描述，
+    命中该检查时非NULL，因此一次表扫描即可得到全部检查结果
+    """
+    columns = ['id']
+    for check in checks:
+        for _, column in check.metadata_columns:
+            if column not in columns:
+                columns.append(column)
+    
+    description_columns = ',\n       '.join(
+        f"CASE WHEN {check.condition} THEN {check.description_sql} END AS {check.tag}"
+        for check in checks
+    )
+    where = '\n   OR '.join(f"({check.condition})" for check in checks)
+    
+    return (
+        f"SELECT {', '.join(columns)},\n       {description_columns}\n"
+        f"FROM {table_name}\n"
+        f"WHERE {where}"
+    )
+
+def _sql_timestamp(value: datetime) -> str:
+    """
+    格式化为数据库中时间戳文本的格式 (YYYY-MM-DD HH:MM:SS.ffffff，UTC)
+    
+    时间戳列以ISO-8601文本存储，字典序即时间顺序，与该格式的常量直接比较
+    可以省去逐行的 datetime() 解析，并允许使用索引。SQLAlchemy 写入时带微秒，
+    常量也必须带微秒：否则同一秒内的 '…:00.123456' 会大于 '…:00'
+    """
+    return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+def _sql_identifier(name: str) -> str:
+    """将表名或列名转为带引号的SQL标识符"""
+    return '"' + name.replace('"', '""') + '"'
+
+def _null_predicate(column: str) -> str:
+    """
+    NULL值判断表达式
+    
+    对声明为NOT NULL的列，查询优化器会把 col IS NULL 直接折叠为假，
+    因此用 typeof() 判断，才能发现绕过约束写入的NULL值
+    """
+    return f"typeof({_sql_identifier(column)}) = 'null'"
+
+@lru_cache(maxsize=128)
+def _build_null_count_sql(table_name: str, columns: Tuple[str, ...]) -> str:
+    """构建一次扫描统计各列NULL值数量的聚合SQL"""
+    sums = ', '.join(f"SUM({_null_predicate(column)})" for column in columns)
+    return f"SELECT {sums} FROM {_sql_identifier(table_name)}"
+
+@lru_cache(maxsize=128)
+def _build_null_check_sql(table_name: str, columns: Tuple[str, ...], limit: int = 10) -> str:
+    """
+    构建一次查询所有NOT NULL列的NULL值检查SQL
+    
+    每列一个带 LIMIT 的子查询，用 UNION ALL 合并，返回 (列名, id)
+    """
+    table = _sql_identifier(table_name)
+    return '\nUNION ALL\n'.join(
+        f"SELECT * FROM (SELECT {_sql_quote(column)} AS column_name, id FROM {table} "
+        f"WHERE {_null_predicate(column)} LIMIT {int(limit)})"
+        for column in columns
+    )
+
+# 问题类型到直方图下标的映射；严重程度为 1-5，直接作为下标
+_ISSUE_TYPE_INDEX: Dict[IntegrityIssueType, int] = {
+    issue_type: index for index, issue_type in enumerate(IntegrityIssueType)
+}
+_SEVERITY_LEVELS = 6
+
+def _issue_histograms(issues: List[IntegrityIssue]) -> Tuple[List[int], List[int]]:
+    """一次遍历统计问题类型和严重程度，返回按下标计数的 (类型直方图, 严重程度直方图)"""
+    type_counts = [0] * len(_ISSUE_TYPE_INDEX)
+    severity_counts = [0] * _SEVERITY_LEVELS
+    type_index = _ISSUE_TYPE_INDEX
+    for issue in issues:
+        type_counts[type_index[issue.issue_type]] += 1
+        severity_counts[issue.severity] += 1
+    return type_counts, severity_counts
+
+def _iter_rows(cursor: sqlite3.Cursor, batch_size: int = _FETCH_BATCH_SIZE) -> Iterator[tuple]:
+    """按批次从游标中取出结果行，避免一次性物化整个结果集"""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+def _sql_quote(value: str) -> str:
+    """将字符串转为SQL字符串字面量"""
+    return "'" + value.replace("'", "''") + "'"
+
+# 合法的任务状态；IN 列表在导入时展开为字面量，检查SQL因此是固定文本，无需每次重建
+_VALID_TASK_STATES = ('pending', 'running', 'completed', 'failed', 'retry', 'cancelled')
+_INVALID_STATUS_LIST = ', '.join(_sql_quote(state) for state in _VALID_TASK_STATES)
+
+# 长时间运行的任务：行本身没有变化，只是随时间推移才命中条件，增量检查的变化视图中
+# 看不到这些行，因此始终查询 main 中的原表（由 idx_tasks_status_updated 索引支持）
+_STUCK_TASK_CHECKS = (
+    RowCheck(
+        tag='stuck_running',
+        condition="status IN ('running', 'processing') AND updated_at < :stale_before",
+        description_sql="printf('任务 %d 长时间处于 %s 状态', id, status)",
+        issue_type=IntegrityIssueType.INCONSISTENT_STATE,
+        column_name='status',
+        severity=3,
+        repair_strategy=RepairStrategy.AUTO_FIX,
+        metadata_columns=(('task_id', 'id'), ('status', 'status'), ('updated_at', 'updated_at'))
+    ),
+)
+_STUCK_TASK_SQL = _build_row_check_sql('main.publishing_tasks', _STUCK_TASK_CHECKS)
+
+# 发布任务表的逐行检查
+_TASK_ROW_CHECKS = (
+    RowCheck(
+        tag='invalid_status',
+        condition=f"status NOT IN ({_INVALID_STATUS_LIST})",
+        description_sql="printf('任务 %d 的状态值无效: %s', id, status)",
+        issue_type=IntegrityIssueType.INVALID_DATA,
+        column_name='status',
+        severity=4,
+        repair_strategy=RepairStrategy.DEFAULT_VALUE,
+        metadata_columns=(('task_id', 'id'), ('invalid_status', 'status'))
+    ),
+    RowCheck(
+        tag='updated_before_created',
+        condition="updated_at < created_at",
+        description_sql="printf('任务 %d 的更新时间早于创建时间', id)",
+        issue_type=IntegrityIssueType.TIMESTAMP_ANOMALY,
+        column_name='updated_at',
+        severity=2,
+        repair_strategy=RepairStrategy.AUTO_FIX,
+        metadata_columns=(('task_id', 'id'), ('created_at', 'created_at'), ('updated_at', 'updated_at'))
+    ),
+    RowCheck(
+        tag='future_created',
+        condition="created_at > :now",
+        description_sql="printf('任务 %d 的创建时间在未来', id)",
+        issue_type=IntegrityIssueType.TIMESTAMP_ANOMALY,
+        column_name='created_at',
+        severity=3,
+        repair_strategy=RepairStrategy.AUTO_FIX,
+        metadata_columns=(('task_id', 'id'), ('created_at', 'created_at'))
+    ),
+)
+_TASK_ROW_CHECK_SQL = _build_row_check_sql('publishing_tasks', _TASK_ROW_CHECKS)
+
+# 小时分析表的逐行检查
+_ANALYTICS_ROW_CHECKS = (
+    RowCheck(
+        tag='negative_counts',
+        condition=_ANALYTICS_NEGATIVE_CONDITION,
+        description_sql="printf('分析记录 %d 包含负值统计数据', id)",
+        issue_type=IntegrityIssueType.INVALID_DATA,
+        column_name=None,
+        severity=3,
+        repair_strategy=RepairStrategy.RECALCULATE,
+        metadata_columns=(('analytics_id', 'id'), ('hour', 'hour_timestamp'), ('project_id', 'project_id'))
+    ),
+)
+_ANALYTICS_ROW_CHECK_SQL = _build_row_check_sql('analytics_hourly', _ANALYTICS_ROW_CHECKS)
+
+# 小时分析数据的间隙：下一小时只在外层行上计算一次，与 a2.hour_timestamp 做一秒宽的
+# 文本范围比较（兼容带小数秒的存储格式），从而可以使用以 hour_timestamp 开头的唯一索引
+_ANALYTICS_GAP_SQL = """
+    SELECT 
+        datetime(a1.hour_timestamp) as hour,
+        datetime(a1.hour_timestamp, '+1 hour') as next_hour
+    FROM analytics_hourly a1
+    LEFT JOIN analytics_hourly a2
+        ON a2.hour_timestamp >= datetime(a1.hour_timestamp, '+1 hour')
+        AND a2.hour_timestamp < datetime(a1.hour_timestamp, '+1 hour', '+1 second')
+    WHERE a2.id IS NULL
+    AND a1.hour_timestamp < ?
+    ORDER BY a1.hour_timestamp DESC
+    LIMIT 10
+"""
+
+# 已完成但没有成功日志的任务
+_ORPHAN_TASKS_SQL = """
+    SELECT t.id
+    FROM publishing_tasks t
+    LEFT JOIN publishing_logs l
+        ON l.task_id = t.id AND l.status = 'success'
+    WHERE t.status = 'completed'
+    AND l.task_id IS NULL
+"""
+
+# 依赖索引的检查查询: 名称 -> (SQL, 示例参数)，调试模式下启动时校验其查询计划
+QUERIES: Dict[str, Tuple[str, Tuple[Any, ...]]] = {
+    'orphan_tasks': (_ORPHAN_TASKS_SQL, ()),
+    'analytics_gaps': (_ANALYTICS_GAP_SQL, ('1970-01-01 00:00:00',)),
+    'analytics_negative': (_ANALYTICS_ROW_CHECK_SQL, ()),
+}
+
+# 不允许出现全表扫描的数据表（小型查找表不在此列）；
+# EXPLAIN QUERY PLAN 以别名报告表，因此同时列出 QUERIES 中这些表使用的别名
+_NO_SCAN_TABLES = frozenset({'publishing_tasks', 't', 'analytics_hourly', 'a1', 'a2'})
+
 class DataIntegrityChecker:
     """🔍 高级数据完整性检查器"""
     
@@ -108,19 +437,27 @@ class DataIntegrityChecker:
         
         # 配置参数
         self.check_interval = self.config.get('check_interval', 3600)  # 1小时
+        self.full_check_interval = self.config.get('full_check_interval', 7 * 24 * 3600)  # 增量检查的全量回退周期（1周）
         self.auto_repair = self.config.get('auto_repair', True)
         self.backup_before_repair = self.config.get('backup_before_repair', True)
         self.max_repair_attempts = self.config.get('max_repair_attempts', 3)
         self.critical_severity_threshold = self.config.get('critical_severity_threshold', 4)
+        self.startup_integrity_check = self.config.get('startup_integrity_check', True)
+        self.debug_query_plans = self.config.get('debug_query_plans', False)
+        self.check_workers = self.config.get('check_workers', 4)  # 并行检查表的线程数
         
         # 表结构缓存
         self.schema_cache: Dict[str, TableSchema] = {}
         self.schema_cache_ttl = timedelta(hours=1)
+        self.last_schema_refresh: Optional[datetime] = None
         
         # 问题追踪
         self.active_issues: Dict[str, IntegrityIssue] = {}
-        self.issue_history: List[IntegrityIssue] = []
-        self.repair_history: List[Dict[str, Any]] = []
+        # 内存中只保留最近的记录，完整的问题历史持久化到 integrity_issue_log 表
+        history_max = self.config.get('history_max', 10000)
+        self.issue_history: Deque[IntegrityIssue] = deque(maxlen=history_max)
+        self.repair_history_max = self.config.get('repair_history_max', history_max)
+        self.repair_history: Deque[Dict[str, Any]] = deque(maxlen=self.repair_history_max or 10000)
         
         # 检查规则
         self.integrity_rules = self._initialize_integrity_rules()
@@ -131,9 +468,20 @@ class DataIntegrityChecker:
         # 监控状态
         self.monitoring = False
         self.monitor_thread = None
+        # 监控线程在调度器上等待到下一次检查的截止时间；停止事件用于提前唤醒
+        self._scheduler = sched.scheduler(time.monotonic, self._wait_for_stop)
+        self._stop_event = threading.Event()
+        # 调度判断使用单调时钟，不受系统时间调整影响；datetime 字段只用于报告
         self.last_check_time = None
+        self.last_full_check_time = None
+        self._last_check_mono: Optional[float] = None
+        self._last_full_check_mono: Optional[float] = None
         self.lock = threading.RLock()
         
+        # 修复使用的长连接（首次修复时打开），监控线程与调用方共享，由锁串行化
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
+        
         # 统计信息
         self.statistics = {
             'total_checks': 0,
@@ -143,32 +491,93 @@ class DataIntegrityChecker:
             'failed_repairs': 0,
             'check_duration_avg': 0.0
         }
+        # 最近检查的耗时，用于计算平均值和P95
+        self._check_durations: Deque[float] = deque(maxlen=_DURATION_WINDOW)
+        
+        # 确保检查查询所需的索引存在，并在启动时校验数据库、刷新统计信息
+        self._prepare_database()
         
         logger.info("🔍 数据完整性检查器已初始化")
         logger.info(f"  - 数据库路径: {self.db_path}")
         logger.info(f"  - 自动修复: {self.auto_repair}")
         logger.info(f"  - 检查间隔: {self.check_interval}秒")
     
+    def _prepare_database(self):
+        """启动时准备数据库（数据库不存在时跳过）"""
+        if not os.path.exists(self.db_path):
+            return
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                self._ensure_indexes(conn)
+                if self.startup_integrity_check:
+                    self._verify_database_integrity(conn)
+                self._optimize_database(conn)
+                if self.debug_query_plans:
+                    self._verify_query_plans(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"🔍 数据库启动准备失败: {e}")
+    
+    def _ensure_indexes(self, conn: sqlite3.Connection):
+        """创建检查查询所需的索引"""
+        for statement in _CHECK_INDEXES:
+            try:
+                conn.execute(statement)
+            except sqlite3.OperationalError as e:
+                # 表尚未创建等情况
+                logger.debug(f"🔍 跳过索引创建: {e}")
+    
+    def _verify_database_integrity(self, conn: sqlite3.Connection):
+        """运行 PRAGMA integrity_check，结果不为 ok 时发出警报"""
+        messages = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+        if messages != ['ok']:
+            self._alert(f"SQLite完整性校验失败: {'; '.join(messages[:10])}")
+    
+    def _verify_query_plans(self, conn: sqlite3.Connection):
+        """
+        校验依赖索引的检查查询没有退化为全表扫描（调试模式）
+        
+        Raises:
+            AssertionError: 查询计划中出现了对 _NO_SCAN_TABLES 的扫描
+        """
+        scans = []
+        for name, (sql, params) in QUERIES.items():
+            try:
+                plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            except sqlite3.OperationalError as e:
+                # 表或列尚不存在
+                logger.debug(f"🔍 跳过查询计划校验 {name}: {e}")
+                continue
+            
+            for row in plan:
+                detail = row[-1].split()
+                if len(detail) > 1 and detail[0] == 'SCAN' and detail[1] in _NO_SCAN_TABLES:
+                    scans.append(f"{name}: {row[-1]}")
+        
+        assert not scans, f"检查查询出现全表扫描: {'; '.join(scans)}"
+    
+    def _optimize_database(self, conn: sqlite3.Connection):
+        """按需刷新查询规划器的统计信息，使检查查询保持在索引计划上"""
+        try:
+            conn.execute(_OPTIMIZE_PRAGMA)
+        except sqlite3.Error as e:
+            logger.warning(f"🔍 PRAGMA optimize 执行失败: {e}")
+    
     def _initialize_integrity_rules(self) -> Dict[str, List[Callable]]:
         """初始化完整性检查规则"""
         return {
             'publishing_tasks': [
-                self._check_task_references,
-                self._check_task_states,
-                self._check_task_timestamps,
+                self._check_task_rows,
                 self._check_task_duplicates
             ],
             'publishing_logs': [
-                self._check_log_references,
                 self._check_log_sequence,
                 self._check_log_timestamps
             ],
             'projects': [
-                self._check_project_references,
                 self._check_project_constraints
             ],
             'content_sources': [
-                self._check_source_references,
                 self._check_source_paths
             ],
             'api_keys': [
@@ -205,6 +614,37 @@ class DataIntegrityChecker:
         """
         logger.info("🔍 开始执行全面数据完整性检查...")
         
+        started = time.monotonic()
+        report = self._run_check()
+        self.last_full_check_time = report.check_time
+        self._last_full_check_mono = started
+        return report
+    
+    def perform_incremental_check(self) -> IntegrityReport:
+        """
+        执行增量完整性检查，只检查上次检查之后新增或更新的行
+        
+        没有检查点或距上次全量检查超过 full_check_interval 时回退为全量检查。
+        
+        Returns:
+            IntegrityReport: 检查报告
+        """
+        full_check_due = (
+            self._last_full_check_mono is None or
+            time.monotonic() - self._last_full_check_mono >= self.full_check_interval
+        )
+        
+        checkpoints = {} if full_check_due else self._load_checkpoints()
+        if not checkpoints:
+            return self.perform_full_check()
+        
+        logger.info("🔍 开始执行增量数据完整性检查...")
+        return self._run_check(checkpoints)
+    
+    def _run_check(self, checkpoints: Optional[Dict[str, Tuple[int, Optional[str]]]] = None) -> IntegrityReport:
+        """执行检查；提供检查点时只对检查点之后变化的行运行单行规则"""
+        incremental = checkpoints is not None
+        
         check_id = self._generate_check_id()
         start_time = datetime.now()
         issues_found = []
@@ -213,43 +653,71 @@ class DataIntegrityChecker:
         
         try:
             with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+                # 规则均按位置访问列，使用默认的元组行以省去 sqlite3.Row 的封装开销
+                self._configure_check_connection(conn)
+                
+                # 整个检查过程使用同一个读事务，避免每条语句重复加锁
+                conn.execute("BEGIN DEFERRED")
                 
                 # 刷新表结构缓存
                 self._refresh_schema_cache(conn)
                 
-                # 对每个表执行检查
-                for table_name, schema in self.schema_cache.items():
-                    logger.info(f"🔍 检查表: {table_name}")
-                    tables_checked += 1
-                    
-                    # 获取表记录数
-                    cursor = conn.execute(f"SELECT COUNT(*) FROM {table_name}")
-                    row_count = cursor.fetchone()[0]
-                    records_checked += row_count
+                # 在同一读快照中记录新的检查点
+                new_checkpoints = self._capture_checkpoints(conn)
+                rule_cache = {} if incremental else self._load_rule_cache(conn)
+                rule_cache_updates = []
+                
+                # 全量检查先运行SQLite内置的页级校验，它同时覆盖NOT NULL约束，
+                # 结果完整时跳过逐列的通用检查
+                skip_structural = False
+                if not incremental:
+                    skip_structural, corruption_issues = self._run_quick_check(conn)
+                    issues_found.extend(corruption_issues)
                     
-                    # 执行表特定的检查规则
-                    if table_name in self.integrity_rules:
-                        for rule_func in self.integrity_rules[table_name]:
-                            try:
-                                table_issues = rule_func(conn, table_name, schema)
-                                issues_found.extend(table_issues)
-                            except Exception as e:
-                                logger.error(f"🔍 规则检查失败 {rule_func.__name__}: {e}")
+                    # 引用完整性交由SQLite原生外键检查一次完成
+                    issues_found.extend(self._check_foreign_keys_native(conn))
+                
+                # 各表规则相互独立，在线程池中使用各自的只读连接并行执行
+                tables = list(self.schema_cache.items())
+                with ThreadPoolExecutor(max_workers=max(1, min(self.check_workers, len(tables)))) as executor:
+                    futures = [
+                        executor.submit(
+                            self._check_table, table_name, schema,
+                            checkpoints.get(table_name) if incremental else None,
+                            incremental, rule_cache, skip_structural
+                        )
+                        for table_name, schema in tables
+                    ]
                     
-                    # 执行通用检查
-                    generic_issues = self._perform_generic_checks(conn, table_name, schema)
-                    issues_found.extend(generic_issues)
+                    # 按提交顺序合并结果，保持问题顺序稳定
+                    for future in futures:
+                        table_issues, row_count, table_cache_updates = future.result()
+                        tables_checked += 1
+                        records_checked += row_count
+                        issues_found.extend(table_issues)
+                        rule_cache_updates.extend(table_cache_updates)
                 
                 # 执行跨表检查
-                cross_table_issues = self._perform_cross_table_checks(conn)
-                issues_found.extend(cross_table_issues)
+                if not incremental:
+                    cross_table_issues = self._perform_cross_table_checks(conn)
+                    issues_found.extend(cross_table_issues)
+                
+                conn.commit()
                 
-            # 记录问题
-            with self.lock:
-                for issue in issues_found:
-                    self.active_issues[issue.issue_id] = issue
-                    self.issue_history.append(issue)
+                # 读事务结束后在同一个写事务中持久化检查点、规则缓存和问题日志，
+                # 避免读事务升级为写事务
+                self._save_checkpoints(conn, new_checkpoints)
+                if rule_cache_updates:
+                    self._save_rule_cache(conn, rule_cache_updates)
+                if issues_found:
+                    self._save_issue_log(conn, check_id, issues_found)
+                conn.commit()
+                
+                # 根据本次检查的查询刷新统计信息
+                self._optimize_database(conn)
+                
+            # 记录问题：工作线程只返回结果，由主线程在检查成功后统一写入
+            self._record_issues(issues_found)
             
             # 自动修复
             auto_fixed = 0
@@ -259,17 +727,14 @@ class DataIntegrityChecker:
             if self.auto_repair and issues_found:
                 logger.info(f"🔍 发现 {len(issues_found)} 个问题，开始自动修复...")
                 
-                for issue in issues_found:
-                    if issue.severity >= self.critical_severity_threshold:
-                        critical_issues += 1
-                    
-                    if issue.repair_strategy == RepairStrategy.AUTO_FIX:
-                        if self._attempt_auto_repair(issue):
-                            auto_fixed += 1
-                        else:
-                            manual_required += 1
-                    else:
-                        manual_required += 1
+                critical_issues = sum(
+                    1 for issue in issues_found
+                    if issue.severity >= self.critical_severity_threshold
+                )
+                
+                # 所有可自动修复的问题在一个事务中批量修复
+                auto_fixed = self._attempt_auto_repair_batch(issues_found)
+                manual_required = len(issues_found) - auto_fixed
             
             # 生成建议
             recommendations = self._generate_recommendations(issues_found)
@@ -296,6 +761,7 @@ class DataIntegrityChecker:
             self._log_report(report)
             
             self.last_check_time = datetime.now()
+            self._last_check_mono = time.monotonic()
             
             return report
             
@@ -303,214 +769,511 @@ class DataIntegrityChecker:
             logger.error(f"🔍 完整性检查失败: {e}")
             raise
     
+    def _configure_check_connection(self, conn: sqlite3.Connection):
+        """为检查连接应用PRAGMA设置（必须在事务开始前执行）"""
+        for pragma in _CHECK_CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+    
+    def _record_issues(self, issues: List[IntegrityIssue]):
+        """将本次检查发现的问题转入活跃问题表和历史记录"""
+        for issue in issues:
+            self.active_issues[issue.issue_id] = issue
+            self.issue_history.append(issue)
+    
     def _refresh_schema_cache(self, conn: sqlite3.Connection):
-        """刷新表结构缓存"""
-        cursor = conn.cursor()
+        """刷新表结构缓存（在 schema_cache_ttl 内复用上次结果）"""
+        now = datetime.now()
+        if self.last_schema_refresh and now - self.last_schema_refresh < self.schema_cache_ttl:
+            return
         
-        # 获取所有表
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = cursor.fetchall()
+        # 通过表值PRAGMA函数一次性获取所有表的列、外键和索引
+        columns_by_table = self._fetch_pragma_by_table(conn, 'pragma_table_info')
+        foreign_keys_by_table = self._fetch_pragma_by_table(conn, 'pragma_foreign_key_list')
+        indexes_by_table = self._fetch_pragma_by_table(conn, 'pragma_index_list')
+        row_counts = self._estimate_row_counts(conn)
         
-        for table_row in tables:
-            table_name = table_row[0]
-            
-            if table_name.startswith('sqlite_'):
-                continue
-            
-            # 获取表信息
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [dict(row) for row in cursor.fetchall()]
-            
+        schema_cache = {}
+        for table_name, columns in columns_by_table.items():
             # 获取主键
             primary_keys = [col['name'] for col in columns if col['pk'] > 0]
             
-            # 获取外键
-            cursor.execute(f"PRAGMA foreign_key_list({table_name})")
-            foreign_keys = [dict(row) for row in cursor.fetchall()]
-            
-            # 获取索引
-            cursor.execute(f"PRAGMA index_list({table_name})")
-            indexes = [dict(row) for row in cursor.fetchall()]
-            
-            # 获取行数
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            row_count = cursor.fetchone()[0]
+            # 获取行数（优先使用 sqlite_stat1 的估计值）
+            row_count = row_counts.get(table_name)
+            if row_count is None:
+                row_count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
             
             # 创建表结构对象
-            schema = TableSchema(
+            schema_cache[table_name] = TableSchema(
                 table_name=table_name,
                 columns=columns,
                 primary_keys=primary_keys,
-                foreign_keys=foreign_keys,
-                indexes=indexes,
+                foreign_keys=foreign_keys_by_table.get(table_name, []),
+                indexes=indexes_by_table.get(table_name, []),
                 constraints=[],  # SQLite不直接提供约束信息
                 row_count=row_count,
-                last_check=datetime.now()
+                last_check=now
             )
-            
-            self.schema_cache[table_name] = schema
+        
+        self.schema_cache = schema_cache
+        self.last_schema_refresh = now
     
-    def _check_task_references(self, conn: sqlite3.Connection, table_name: str, 
-                              schema: TableSchema) -> List[IntegrityIssue]:
-        """检查任务表引用完整性"""
-        issues = []
+    def _fetch_pragma_by_table(self, conn: sqlite3.Connection,
+                               pragma_function: str) -> Dict[str, List[Dict[str, Any]]]:
+        """对所有用户表执行表值PRAGMA函数，按表名分组返回结果"""
+        cursor = conn.execute(f"""
+            SELECT m.name AS __table_name, p.*
+            FROM sqlite_master m
+            JOIN {pragma_function}(m.name) p
+            WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+            AND substr(m.name, 1, ?) <> ?
+            ORDER BY m.rowid
+        """, (len(_INTERNAL_TABLE_PREFIX), _INTERNAL_TABLE_PREFIX))
+        
+        names = [d[0] for d in cursor.description]
+        grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in cursor:
+            grouped[row[0]].append(dict(zip(names[1:], row[1:])))
         
-        # 检查project_id引用
-        cursor = conn.execute("""
-            SELECT t.id, t.project_id 
-            FROM publishing_tasks t
-            LEFT JOIN projects p ON t.project_id = p.id
-            WHERE p.id IS NULL AND t.project_id IS NOT NULL
-        """)
+        return grouped
+    
+    def _estimate_row_counts(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        """从 sqlite_stat1 读取 ANALYZE 得到的表行数估计"""
+        try:
+            cursor = conn.execute("SELECT tbl, stat FROM sqlite_stat1")
+        except sqlite3.OperationalError:
+            # 尚未执行过 ANALYZE
+            return {}
+        
+        # stat 的第一个数字是行数；部分索引只覆盖部分行，因此取各条目中的最大值
+        estimates: Dict[str, int] = {}
+        for tbl, stat in cursor:
+            try:
+                count = int(stat.split()[0])
+            except (AttributeError, ValueError, IndexError):
+                continue
+            if count > estimates.get(tbl, -1):
+                estimates[tbl] = count
         
-        for row in cursor:
-            issue = IntegrityIssue(
-                issue_id=self._generate_issue_id(),
-                issue_type=IntegrityIssueType.MISSING_REFERENCE,
-                table_name=table_name,
-                record_id=row[0],
-                column_name='project_id',
-                description=f"任务 {row[0]} 引用了不存在的项目 {row[1]}",
-                severity=4,
-                detected_at=datetime.now(),
-                repair_strategy=RepairStrategy.CASCADE_DELETE,
-                metadata={'task_id': row[0], 'project_id': row[1]}
+        return estimates
+    
+    def _load_checkpoints(self) -> Dict[str, Tuple[int, Optional[str]]]:
+        """读取各表的增量检查点"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute(
+                    "SELECT table_name, last_rowid, last_updated_at FROM integrity_checkpoint"
+                )
+                return {row[0]: (row[1], row[2]) for row in cursor}
+        except sqlite3.OperationalError:
+            # 检查点表尚未创建
+            return {}
+    
+    def _capture_checkpoints(self, conn: sqlite3.Connection) -> Dict[str, Tuple[int, Optional[str]]]:
+        """记录各表当前的最大rowid和最大updated_at"""
+        checkpoints = {}
+        for table_name, schema in self.schema_cache.items():
+            if any(col['name'] == 'updated_at' for col in schema.columns):
+                row = conn.execute(
+                    f"SELECT MAX(rowid), MAX(updated_at) FROM main.{table_name}"
+                ).fetchone()
+            else:
+                row = conn.execute(f"SELECT MAX(rowid), NULL FROM main.{table_name}").fetchone()
+            checkpoints[table_name] = (row[0] or 0, row[1])
+        return checkpoints
+    
+    def _save_checkpoints(self, conn: sqlite3.Connection,
+                          checkpoints: Dict[str, Tuple[int, Optional[str]]]):
+        """持久化增量检查点"""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS integrity_checkpoint (
+                table_name TEXT PRIMARY KEY,
+                last_rowid INTEGER NOT NULL,
+                last_updated_at TEXT
             )
-            issues.append(issue)
-        
-        # 检查source_id引用
-        cursor = conn.execute("""
-            SELECT t.id, t.source_id 
-            FROM publishing_tasks t
-            LEFT JOIN content_sources s ON t.source_id = s.id
-            WHERE s.id IS NULL AND t.source_id IS NOT NULL
         """)
+        conn.executemany(
+            "INSERT OR REPLACE INTO integrity_checkpoint (table_name, last_rowid, last_updated_at) "
+            "VALUES (?, ?, ?)",
+            [(table_name, rowid, updated_at) for table_name, (rowid, updated_at) in checkpoints.items()]
+        )
+    
+    def _table_fingerprint(self, conn: sqlite3.Connection, table_name: str,
+                           schema: TableSchema) -> Optional[str]:
+        """
+        计算表内容指纹：列定义 + 行数 + 最大rowid + 最大updated_at
         
-        for row in cursor:
-            issue = IntegrityIssue(
-                issue_id=self._generate_issue_id(),
-                issue_type=IntegrityIssueType.MISSING_REFERENCE,
-                table_name=table_name,
-                record_id=row[0],
-                column_name='source_id',
-                description=f"任务 {row[0]} 引用了不存在的内容源 {row[1]}",
-                severity=4,
-                detected_at=datetime.now(),
-                repair_strategy=RepairStrategy.CASCADE_DELETE,
-                metadata={'task_id': row[0], 'source_id': row[1]}
-            )
-            issues.append(issue)
+        没有 updated_at 列的表，原地更新不会改变行数和rowid，指纹无法反映内容变化，返回None
+        """
+        column_names = [col['name'] for col in schema.columns]
+        if 'updated_at' not in column_names:
+            return None
+        
+        row = conn.execute(
+            f"SELECT COUNT(*), MAX(rowid), MAX(updated_at) FROM main.{table_name}"
+        ).fetchone()
         
+        raw = f"{','.join(column_names)}|{row[0]}|{row[1]}|{row[2]}"
+        return hashlib.md5(raw.encode()).hexdigest()
+    
+    def _run_cached_rule(self, conn: sqlite3.Connection, rule_func: Callable, table_name: str,
+                         schema: TableSchema, fingerprint: str,
+                         rule_cache: Dict[Tuple[str, str], Tuple[str, str]],
+                         rule_cache_updates: List[Tuple[str, str, str, str]]) -> List[IntegrityIssue]:
+        """表内容未变化时复用缓存的规则结果，否则执行规则并记录待写入的缓存"""
+        rule_name = rule_func.__name__
+        
+        cached = rule_cache.get((table_name, rule_name))
+        if cached and cached[0] == fingerprint:
+            return self._issues_from_cache(cached[1])
+        
+        issues = list(rule_func(conn, table_name, schema))
+        rule_cache_updates.append((table_name, rule_name, fingerprint, self._issues_to_cache(issues)))
         return issues
     
-    def _check_task_states(self, conn: sqlite3.Connection, table_name: str,
-                          schema: TableSchema) -> List[IntegrityIssue]:
-        """检查任务状态一致性"""
-        issues = []
-        
-        # 检查长时间处于运行状态的任务
-        cursor = conn.execute("""
-            SELECT id, status, updated_at
-            FROM publishing_tasks
-            WHERE status IN ('running', 'processing')
-            AND datetime(updated_at) < datetime('now', '-1 hour')
-        """)
-        
-        for row in cursor:
-            issue = IntegrityIssue(
+    def _issues_to_cache(self, issues: List[IntegrityIssue]) -> str:
+        """序列化规则结果"""
+        return json.dumps([
+            {
+                'issue_type': issue.issue_type.value,
+                'table_name': issue.table_name,
+                'record_id': issue.record_id,
+                'column_name': issue.column_name,
+                'description': issue.description,
+                'severity': issue.severity,
+                'repair_strategy': issue.repair_strategy.value,
+                'metadata': issue.metadata
+            }
+            for issue in issues
+        ], ensure_ascii=False, default=str)
+    
+    def _issues_from_cache(self, result_json: str) -> List[IntegrityIssue]:
+        """从缓存结果重建问题记录（生成新的问题ID和检测时间）"""
+        now = datetime.now()
+        return [
+            IntegrityIssue(
                 issue_id=self._generate_issue_id(),
-                issue_type=IntegrityIssueType.INCONSISTENT_STATE,
-                table_name=table_name,
-                record_id=row[0],
-                column_name='status',
-                description=f"任务 {row[0]} 长时间处于 {row[1]} 状态",
-                severity=3,
-                detected_at=datetime.now(),
-                repair_strategy=RepairStrategy.AUTO_FIX,
-                metadata={'task_id': row[0], 'status': row[1], 'updated_at': row[2]}
+                issue_type=IntegrityIssueType(item['issue_type']),
+                table_name=item['table_name'],
+                record_id=item['record_id'],
+                column_name=item['column_name'],
+                description=item['description'],
+                severity=item['severity'],
+                detected_at=now,
+                repair_strategy=RepairStrategy(item['repair_strategy']),
+                metadata=item['metadata']
             )
-            issues.append(issue)
+            for item in json.loads(result_json)
+        ]
+    
+    def _load_rule_cache(self, conn: sqlite3.Connection) -> Dict[Tuple[str, str], Tuple[str, str]]:
+        """读取规则结果缓存"""
+        try:
+            cursor = conn.execute(
+                "SELECT table_name, rule_name, content_hash, result_json FROM integrity_rule_cache"
+            )
+        except sqlite3.OperationalError:
+            # 缓存表尚未创建
+            return {}
+        return {(row[0], row[1]): (row[2], row[3]) for row in cursor}
+    
+    def _save_rule_cache(self, conn: sqlite3.Connection,
+                         updates: List[Tuple[str, str, str, str]]):
+        """持久化规则结果缓存"""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS integrity_rule_cache (
+                table_name TEXT NOT NULL,
+                rule_name TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                result_json TEXT NOT NULL,
+                PRIMARY KEY (table_name, rule_name)
+            )
+        """)
+        conn.executemany(
+            "INSERT OR REPLACE INTO integrity_rule_cache (table_name, rule_name, content_hash, result_json) "
+            "VALUES (?, ?, ?, ?)",
+            updates
+        )
+    
+    def _save_issue_log(self, conn: sqlite3.Connection, check_id: str,
+                        issues: List[IntegrityIssue]):
+        """将本次检查发现的问题写入持久化的问题日志"""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS integrity_issue_log (
+                issue_id TEXT PRIMARY KEY,
+                check_id TEXT NOT NULL,
+                issue_type TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                record_id TEXT,
+                column_name TEXT,
+                description TEXT NOT NULL,
+                severity INTEGER NOT NULL,
+                detected_at TEXT NOT NULL,
+                repair_strategy TEXT NOT NULL,
+                metadata TEXT
+            )
+        """)
+        conn.executemany(
+            "INSERT OR REPLACE INTO integrity_issue_log (issue_id, check_id, issue_type, table_name, "
+            "record_id, column_name, description, severity, detected_at, repair_strategy, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    issue.issue_id, check_id, issue.issue_type.value, issue.table_name,
+                    None if issue.record_id is None else str(issue.record_id),
+                    issue.column_name, issue.description, issue.severity,
+                    issue.detected_at.isoformat(), issue.repair_strategy.value,
+                    json.dumps(issue.metadata, ensure_ascii=False, default=str)
+                )
+                for issue in issues
+            ]
+        )
+    
+    def _open_read_connection(self) -> sqlite3.Connection:
+        """打开只读检查连接"""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
+        for pragma in _READ_CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _check_table(self, table_name: str, schema: TableSchema,
+                     checkpoint: Optional[Tuple[int, Optional[str]]], incremental: bool,
+                     rule_cache: Dict[Tuple[str, str], Tuple[str, str]],
+                     skip_structural: bool = False
+                     ) -> Tuple[List[IntegrityIssue], int, List[Tuple[str, str, str, str]]]:
+        """
+        在独立的只读连接上执行单个表的检查
         
-        # 检查无效的状态值
-        valid_states = ['pending', 'running', 'completed', 'failed', 'retry', 'cancelled']
-        cursor = conn.execute(f"""
-            SELECT id, status
-            FROM publishing_tasks
-            WHERE status NOT IN ({','.join(['?'] * len(valid_states))})
-        """, valid_states)
+        Returns:
+            (发现的问题, 检查的记录数, 待写入的规则缓存)
+        """
+        logger.info(f"🔍 检查表: {table_name}")
+        issues = []
+        rule_cache_updates = []
         
-        for row in cursor:
-            issue = IntegrityIssue(
-                issue_id=self._generate_issue_id(),
-                issue_type=IntegrityIssueType.INVALID_DATA,
-                table_name=table_name,
-                record_id=row[0],
-                column_name='status',
-                description=f"任务 {row[0]} 的状态值无效: {row[1]}",
-                severity=4,
-                detected_at=datetime.now(),
-                repair_strategy=RepairStrategy.DEFAULT_VALUE,
-                metadata={'task_id': row[0], 'invalid_status': row[1]}
-            )
-            issues.append(issue)
+        conn = self._open_read_connection()
+        try:
+            if checkpoint is not None:
+                # 用只包含变化行的临时视图遮蔽原表，规则SQL无需修改
+                self._create_delta_view(conn, table_name, checkpoint)
+            
+            conn.execute("BEGIN DEFERRED")
+            
+            # 获取检查的记录数：全量检查直接复用结构缓存中的行数估计，
+            # 只有增量检查需要统计视图中变化的行
+            if checkpoint is not None:
+                row_count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+            else:
+                row_count = schema.row_count
+            
+            table_rules = self.integrity_rules.get(table_name, [])
+            
+            # 表内容指纹每张表只计算一次，由该表所有可缓存的规则共用
+            fingerprint = None
+            if not incremental and any(rule.__name__ in _CACHEABLE_RULES for rule in table_rules):
+                fingerprint = self._table_fingerprint(conn, table_name, schema)
+            
+            # 执行表特定的检查规则；规则按批读取结果行，但发现的问题仍全部汇总到报告中，
+            # 每条规则先完整收集结果，执行失败时不会留下半条规则的问题
+            for rule_func in table_rules:
+                rule_name = rule_func.__name__
+                if incremental and rule_name not in _INCREMENTAL_RULES:
+                    continue
+                try:
+                    if fingerprint is not None and rule_name in _CACHEABLE_RULES:
+                        table_issues = self._run_cached_rule(
+                            conn, rule_func, table_name, schema, fingerprint,
+                            rule_cache, rule_cache_updates
+                        )
+                    else:
+                        table_issues = list(rule_func(conn, table_name, schema))
+                    issues.extend(table_issues)
+                except Exception as e:
+                    logger.error(f"🔍 规则检查失败 {rule_name}: {e}")
+            
+            # 执行通用检查（quick_check 已完整校验NOT NULL约束时跳过）
+            if not skip_structural:
+                issues.extend(self._perform_generic_checks(conn, table_name, schema))
+            
+            conn.commit()
+        finally:
+            conn.close()
         
-        return issues
+        return issues, row_count, rule_cache_updates
+    
+    def _create_delta_view(self, conn: sqlite3.Connection, table_name: str,
+                           checkpoint: Tuple[int, Optional[str]]):
+        """创建与表同名的临时视图，只暴露检查点之后变化的行"""
+        last_rowid, last_updated_at = checkpoint
+        predicate = f"rowid > {int(last_rowid)}"
+        if last_updated_at is not None:
+            escaped = str(last_updated_at).replace("'", "''")
+            predicate += f" OR updated_at > '{escaped}'"
+        
+        conn.execute(f"DROP VIEW IF EXISTS temp.{table_name}")
+        conn.execute(
+            f"CREATE TEMP VIEW {table_name} AS SELECT * FROM main.{table_name} WHERE {predicate}"
+        )
     
-    def _check_task_timestamps(self, conn: sqlite3.Connection, table_name: str,
-                              schema: TableSchema) -> List[IntegrityIssue]:
-        """检查任务时间戳一致性"""
+    def _run_quick_check(self, conn: sqlite3.Connection) -> Tuple[bool, List[IntegrityIssue]]:
+        """
+        运行 PRAGMA quick_check
+        
+        quick_check 会逐行校验NOT NULL约束，NULL值违反按列汇总为约束违反问题，
+        其余错误视为数据损坏。
+        
+        Returns:
+            (是否已完整覆盖NOT NULL校验, 发现的问题列表)
+        """
+        messages = [row[0] for row in conn.execute(f"PRAGMA quick_check({_QUICK_CHECK_MAX_ERRORS})")]
+        if messages == ['ok']:
+            return True, []
+        
+        now = datetime.now()
         issues = []
+        null_counts: Dict[Tuple[str, str], int] = defaultdict(int)
         
-        # 检查时间戳异常（更新时间早于创建时间）
-        cursor = conn.execute("""
-            SELECT id, created_at, updated_at
-            FROM publishing_tasks
-            WHERE datetime(updated_at) < datetime(created_at)
-        """)
+        for message in messages:
+            match = _QUICK_CHECK_NULL_PATTERN.match(message)
+            if match:
+                null_counts[(match.group(1), match.group(2))] += 1
+                continue
+            
+            issues.append(IntegrityIssue(
+                issue_id=self._generate_issue_id(),
+                issue_type=IntegrityIssueType.CORRUPTED_DATA,
+                table_name='sqlite_master',
+                record_id=None,
+                column_name=None,
+                description=f"SQLite完整性校验失败: {message}",
+                severity=5,
+                detected_at=now,
+                repair_strategy=RepairStrategy.BACKUP_RESTORE,
+                metadata={'quick_check': message}
+            ))
         
-        for row in cursor:
-            issue = IntegrityIssue(
+        issues.extend(
+            IntegrityIssue(
                 issue_id=self._generate_issue_id(),
-                issue_type=IntegrityIssueType.TIMESTAMP_ANOMALY,
+                issue_type=IntegrityIssueType.CONSTRAINT_VIOLATION,
                 table_name=table_name,
-                record_id=row[0],
-                column_name='updated_at',
-                description=f"任务 {row[0]} 的更新时间早于创建时间",
-                severity=2,
-                detected_at=datetime.now(),
-                repair_strategy=RepairStrategy.AUTO_FIX,
-                metadata={'task_id': row[0], 'created_at': row[1], 'updated_at': row[2]}
+                record_id=None,
+                column_name=column_name,
+                description=f"表 {table_name} 的列 {column_name} 存在 {count} 个NULL值",
+                severity=3,
+                detected_at=now,
+                repair_strategy=RepairStrategy.DEFAULT_VALUE,
+                metadata={'source': 'quick_check'}
             )
-            issues.append(issue)
-        
-        # 检查未来时间戳
-        cursor = conn.execute("""
-            SELECT id, created_at
-            FROM publishing_tasks
-            WHERE datetime(created_at) > datetime('now')
-        """)
+            for (table_name, column_name), count in null_counts.items()
+        )
         
-        for row in cursor:
+        # 错误数达到上限时结果可能不完整，需要继续执行逐列检查
+        return len(messages) < _QUICK_CHECK_MAX_ERRORS, issues
+    
+    def _check_foreign_keys_native(self, conn: sqlite3.Connection) -> List[IntegrityIssue]:
+        """使用 PRAGMA foreign_key_check 检查所有表的引用完整性"""
+        issues = []
+        now = datetime.now()
+        
+        # 先收集全部违规记录，并按 (表, 外键列) 分组记录需要回查的rowid
+        violations = []
+        rowids_by_column: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        cursor = conn.execute("PRAGMA foreign_key_check")
+        for table_name, rowid, parent, fkid in _iter_rows(cursor):
+            schema = self.schema_cache.get(table_name)
+            if schema is None:
+                continue
+            
+            fk = next((f for f in schema.foreign_keys if f['id'] == fkid), None)
+            column_name = fk['from'] if fk else None
+            violations.append((table_name, rowid, parent, fkid, column_name))
+            if column_name and rowid is not None:
+                rowids_by_column[(table_name, column_name)].append(rowid)
+        
+        # 每组用 rowid IN (...) 批量取出外键列的值，避免逐行回查
+        values: Dict[Tuple[str, str, int], Any] = {}
+        for (table_name, column_name), rowids in rowids_by_column.items():
+            for start in range(0, len(rowids), _ROWID_LOOKUP_BATCH_SIZE):
+                batch = rowids[start:start + _ROWID_LOOKUP_BATCH_SIZE]
+                placeholders = ', '.join('?' * len(batch))
+                for rowid, value in conn.execute(
+                    f"SELECT rowid, {column_name} FROM {table_name} WHERE rowid IN ({placeholders})",
+                    batch
+                ):
+                    values[(table_name, column_name, rowid)] = value
+        
+        for table_name, rowid, parent, fkid, column_name in violations:
+            value = values.get((table_name, column_name, rowid)) if column_name else None
+            
+            issue_type, severity, strategy, template = _FOREIGN_KEY_POLICIES.get(
+                (table_name, column_name),
+                (IntegrityIssueType.MISSING_REFERENCE, 4, RepairStrategy.MANUAL_REVIEW,
+                 f"表 {table_name} 的记录 {{record_id}} 引用了 {parent} 中不存在的记录 {{value}}")
+            )
+            
             issue = IntegrityIssue(
                 issue_id=self._generate_issue_id(),
-                issue_type=IntegrityIssueType.TIMESTAMP_ANOMALY,
+                issue_type=issue_type,
                 table_name=table_name,
-                record_id=row[0],
-                column_name='created_at',
-                description=f"任务 {row[0]} 的创建时间在未来",
-                severity=3,
-                detected_at=datetime.now(),
-                repair_strategy=RepairStrategy.AUTO_FIX,
-                metadata={'task_id': row[0], 'created_at': row[1]}
+                record_id=rowid,
+                column_name=column_name,
+                description=template.format(record_id=rowid, value=value),
+                severity=severity,
+                detected_at=now,
+                repair_strategy=strategy,
+                metadata={'record_id': rowid, 'column': column_name, 'value': value,
+                          'parent_table': parent, 'fkid': fkid}
             )
             issues.append(issue)
         
         return issues
     
+    def _check_task_rows(self, conn: sqlite3.Connection, table_name: str,
+                         schema: TableSchema) -> Iterator[IntegrityIssue]:
+        """检查任务状态与时间戳（单次表扫描 + 长时间运行任务的索引查询）"""
+        utc_now = datetime.utcnow()
+        yield from self._run_row_checks(
+            conn, table_name, _TASK_ROW_CHECKS, _TASK_ROW_CHECK_SQL,
+            {'now': _sql_timestamp(utc_now)}
+        )
+        yield from self._run_row_checks(
+            conn, table_name, _STUCK_TASK_CHECKS, _STUCK_TASK_SQL,
+            {'stale_before': _sql_timestamp(utc_now - timedelta(hours=1))}
+        )
+    
+    def _run_row_checks(self, conn: sqlite3.Connection, table_name: str,
+                        checks: Tuple[RowCheck, ...], sql: str,
+                        params: Optional[Dict[str, Any]] = None) -> Iterator[IntegrityIssue]:
+        """执行融合的逐行检查，并按命中的检查标签生成问题"""
+        now = datetime.now()
+        
+        cursor = conn.execute(sql, params or {})
+        names = [d[0] for d in cursor.description]
+        description_offset = len(names) - len(checks)
+        
+        for row in _iter_rows(cursor):
+            values = dict(zip(names[:description_offset], row))
+            for check, description in zip(checks, row[description_offset:]):
+                if description is None:
+                    continue
+                yield IntegrityIssue(
+                    issue_id=self._generate_issue_id(),
+                    issue_type=check.issue_type,
+                    table_name=table_name,
+                    record_id=values['id'],
+                    column_name=check.column_name,
+                    description=description,
+                    severity=check.severity,
+                    detected_at=now,
+                    repair_strategy=check.repair_strategy,
+                    metadata={key: values[column] for key, column in check.metadata_columns}
+                )
+    
     def _check_task_duplicates(self, conn: sqlite3.Connection, table_name: str,
-                              schema: TableSchema) -> List[IntegrityIssue]:
+                              schema: TableSchema) -> Iterator[IntegrityIssue]:
         """检查任务重复"""
-        issues = []
+        now = datetime.now()
         
         # 检查相同媒体文件的重复任务
         cursor = conn.execute("""
@@ -521,8 +1284,8 @@ class DataIntegrityChecker:
             HAVING COUNT(*) > 1
         """)
         
-        for row in cursor:
-            issue = IntegrityIssue(
+        yield from (
+            IntegrityIssue(
                 issue_id=self._generate_issue_id(),
                 issue_type=IntegrityIssueType.DUPLICATE_DATA,
                 table_name=table_name,
@@ -530,142 +1293,98 @@ class DataIntegrityChecker:
                 column_name='media_path',
                 description=f"发现 {row[1]} 个重复的待处理任务使用相同媒体: {row[0]}",
                 severity=3,
-                detected_at=datetime.now(),
+                detected_at=now,
                 repair_strategy=RepairStrategy.AUTO_FIX,
                 metadata={'media_path': row[0], 'count': row[1], 'task_ids': row[2].split(',')}
             )
-            issues.append(issue)
-        
-        return issues
+            for row in _iter_rows(cursor)
+        )
     
-    def _check_log_references(self, conn: sqlite3.Connection, table_name: str,
-                             schema: TableSchema) -> List[IntegrityIssue]:
-        """检查日志表引用完整性"""
-        issues = []
+    def _check_log_sequence(self, conn: sqlite3.Connection, table_name: str,
+                           schema: TableSchema) -> Iterator[IntegrityIssue]:
+        """检查日志序列完整性"""
+        now = datetime.now()
         
-        # 检查task_id引用
+        # 检查ID序列间隙：只有间隙区间返回到Python
         cursor = conn.execute("""
-            SELECT l.id, l.task_id
-            FROM publishing_logs l
-            LEFT JOIN publishing_tasks t ON l.task_id = t.id
-            WHERE t.id IS NULL
+            SELECT gap_start, gap_end, SUM(gap_end - gap_start + 1) OVER () AS total_missing
+            FROM (
+                SELECT id + 1 AS gap_start, next_id - 1 AS gap_end
+                FROM (
+                    SELECT id, LEAD(id) OVER (ORDER BY id) AS next_id
+                    FROM publishing_logs
+                )
+                WHERE next_id <> id + 1
+            )
+            ORDER BY gap_start
+            LIMIT 10
         """)
         
-        for row in cursor:
+        gaps = cursor.fetchall()
+        if gaps:
+            total_missing = gaps[0][2]
+            
+            # 只记录前10个
+            missing_ids = []
+            for gap_start, gap_end, _ in gaps:
+                missing_ids.extend(range(gap_start, min(gap_end, gap_start + 9) + 1))
+                if len(missing_ids) >= 10:
+                    break
+            
             issue = IntegrityIssue(
                 issue_id=self._generate_issue_id(),
-                issue_type=IntegrityIssueType.ORPHAN_RECORD,
+                issue_type=IntegrityIssueType.SEQUENCE_GAP,
                 table_name=table_name,
-                record_id=row[0],
-                column_name='task_id',
-                description=f"日志 {row[0]} 引用了不存在的任务 {row[1]}",
-                severity=2,
-                detected_at=datetime.now(),
-                repair_strategy=RepairStrategy.CASCADE_DELETE,
-                metadata={'log_id': row[0], 'task_id': row[1]}
+                record_id=None,
+                column_name='id',
+                description=f"日志ID序列存在 {total_missing} 个间隙",
+                severity=1,
+                detected_at=now,
+                repair_strategy=RepairStrategy.IGNORE,
+                metadata={'missing_ids': missing_ids[:10]}
             )
-            issues.append(issue)
-        
-        return issues
-    
-    def _check_log_sequence(self, conn: sqlite3.Connection, table_name: str,
-                           schema: TableSchema) -> List[IntegrityIssue]:
-        """检查日志序列完整性"""
-        issues = []
-        
-        # 检查ID序列间隙
-        cursor = conn.execute("""
-            SELECT id FROM publishing_logs ORDER BY id
-        """)
-        
-        ids = [row[0] for row in cursor]
-        if ids:
-            expected_ids = set(range(min(ids), max(ids) + 1))
-            actual_ids = set(ids)
-            missing_ids = expected_ids - actual_ids
-            
-            if missing_ids:
-                issue = IntegrityIssue(
-                    issue_id=self._generate_issue_id(),
-                    issue_type=IntegrityIssueType.SEQUENCE_GAP,
-                    table_name=table_name,
-                    record_id=None,
-                    column_name='id',
-                    description=f"日志ID序列存在 {len(missing_ids)} 个间隙",
-                    severity=1,
-                    detected_at=datetime.now(),
-                    repair_strategy=RepairStrategy.IGNORE,
-                    metadata={'missing_ids': list(missing_ids)[:10]}  # 只记录前10个
-                )
-                issues.append(issue)
-        
-        return issues
+            yield issue
     
     def _check_log_timestamps(self, conn: sqlite3.Connection, table_name: str,
-                             schema: TableSchema) -> List[IntegrityIssue]:
+                             schema: TableSchema) -> Iterator[IntegrityIssue]:
         """检查日志时间戳"""
-        issues = []
+        now = datetime.now()
         
-        # 检查日志时间戳顺序
+        # 检查日志时间戳顺序：同一任务内按ID顺序，发布时间不应早于前一条日志
+        # published_at 以ISO-8601文本存储，可直接按字典序比较
         cursor = conn.execute("""
-            SELECT l1.id, l1.task_id, l1.published_at, l2.published_at
-            FROM publishing_logs l1
-            JOIN publishing_logs l2 ON l1.task_id = l2.task_id
-            WHERE l1.id < l2.id 
-            AND datetime(l1.published_at) > datetime(l2.published_at)
+            SELECT id, task_id, published_at, prev_published_at,
+                   printf('日志 %d 的时间戳顺序异常', id) AS description
+            FROM (
+                SELECT id, task_id, published_at,
+                       LAG(published_at) OVER (PARTITION BY task_id ORDER BY id) AS prev_published_at
+                FROM publishing_logs
+            )
+            WHERE prev_published_at IS NOT NULL
+            AND published_at < prev_published_at
         """)
         
-        for row in cursor:
-            issue = IntegrityIssue(
+        yield from (
+            IntegrityIssue(
                 issue_id=self._generate_issue_id(),
                 issue_type=IntegrityIssueType.TIMESTAMP_ANOMALY,
                 table_name=table_name,
                 record_id=row[0],
                 column_name='published_at',
-                description=f"日志 {row[0]} 的时间戳顺序异常",
+                description=row[4],
                 severity=2,
-                detected_at=datetime.now(),
+                detected_at=now,
                 repair_strategy=RepairStrategy.MANUAL_REVIEW,
-                metadata={'log_id': row[0], 'task_id': row[1]}
+                metadata={'log_id': row[0], 'task_id': row[1],
+                          'published_at': row[2], 'previous_published_at': row[3]}
             )
-            issues.append(issue)
-        
-        return issues
-    
-    def _check_project_references(self, conn: sqlite3.Connection, table_name: str,
-                                 schema: TableSchema) -> List[IntegrityIssue]:
-        """检查项目表引用"""
-        issues = []
-        
-        # 检查user_id引用
-        cursor = conn.execute("""
-            SELECT p.id, p.user_id
-            FROM projects p
-            LEFT JOIN users u ON p.user_id = u.id
-            WHERE u.id IS NULL
-        """)
-        
-        for row in cursor:
-            issue = IntegrityIssue(
-                issue_id=self._generate_issue_id(),
-                issue_type=IntegrityIssueType.MISSING_REFERENCE,
-                table_name=table_name,
-                record_id=row[0],
-                column_name='user_id',
-                description=f"项目 {row[0]} 引用了不存在的用户 {row[1]}",
-                severity=5,
-                detected_at=datetime.now(),
-                repair_strategy=RepairStrategy.MANUAL_REVIEW,
-                metadata={'project_id': row[0], 'user_id': row[1]}
-            )
-            issues.append(issue)
-        
-        return issues
+            for row in _iter_rows(cursor)
+        )
     
     def _check_project_constraints(self, conn: sqlite3.Connection, table_name: str,
-                                  schema: TableSchema) -> List[IntegrityIssue]:
+                                  schema: TableSchema) -> Iterator[IntegrityIssue]:
         """检查项目约束"""
-        issues = []
+        now = datetime.now()
         
         # 检查项目名称唯一性（同一用户下）
         cursor = conn.execute("""
@@ -676,8 +1395,8 @@ class DataIntegrityChecker:
             HAVING COUNT(*) > 1
         """)
         
-        for row in cursor:
-            issue = IntegrityIssue(
+        yield from (
+            IntegrityIssue(
                 issue_id=self._generate_issue_id(),
                 issue_type=IntegrityIssueType.CONSTRAINT_VIOLATION,
                 table_name=table_name,
@@ -685,48 +1404,17 @@ class DataIntegrityChecker:
                 column_name='name',
                 description=f"用户 {row[0]} 下存在 {row[2]} 个同名项目: {row[1]}",
                 severity=3,
-                detected_at=datetime.now(),
+                detected_at=now,
                 repair_strategy=RepairStrategy.MANUAL_REVIEW,
                 metadata={'user_id': row[0], 'name': row[1], 'project_ids': row[3].split(',')}
             )
-            issues.append(issue)
-        
-        return issues
-    
-    def _check_source_references(self, conn: sqlite3.Connection, table_name: str,
-                                schema: TableSchema) -> List[IntegrityIssue]:
-        """检查内容源引用"""
-        issues = []
-        
-        # 检查project_id引用
-        cursor = conn.execute("""
-            SELECT s.id, s.project_id
-            FROM content_sources s
-            LEFT JOIN projects p ON s.project_id = p.id
-            WHERE p.id IS NULL
-        """)
-        
-        for row in cursor:
-            issue = IntegrityIssue(
-                issue_id=self._generate_issue_id(),
-                issue_type=IntegrityIssueType.MISSING_REFERENCE,
-                table_name=table_name,
-                record_id=row[0],
-                column_name='project_id',
-                description=f"内容源 {row[0]} 引用了不存在的项目 {row[1]}",
-                severity=4,
-                detected_at=datetime.now(),
-                repair_strategy=RepairStrategy.CASCADE_DELETE,
-                metadata={'source_id': row[0], 'project_id': row[1]}
-            )
-            issues.append(issue)
-        
-        return issues
+            for row in _iter_rows(cursor)
+        )
     
     def _check_source_paths(self, conn: sqlite3.Connection, table_name: str,
-                           schema: TableSchema) -> List[IntegrityIssue]:
+                           schema: TableSchema) -> Iterator[IntegrityIssue]:
         """检查内容源路径有效性"""
-        issues = []
+        now = datetime.now()
         
         cursor = conn.execute("""
             SELECT id, folder_path
@@ -734,107 +1422,127 @@ class DataIntegrityChecker:
             WHERE is_active = 1
         """)
         
-        for row in cursor:
-            source_id, folder_path = row
+        # 按父目录分组，每个父目录只列举一次
+        by_parent: Dict[str, List[Tuple[Any, str, str]]] = defaultdict(list)
+        for source_id, folder_path in cursor.fetchall():
+            if folder_path:
+                parent, name = os.path.split(folder_path.rstrip(os.sep) or folder_path)
+                by_parent[parent].append((source_id, name, folder_path))
+        
+        for parent, entries in by_parent.items():
+            existing = self._list_directory(parent)
             
-            # 检查路径是否存在
-            if folder_path and not os.path.exists(folder_path):
-                issue = IntegrityIssue(
-                    issue_id=self._generate_issue_id(),
-                    issue_type=IntegrityIssueType.INVALID_DATA,
-                    table_name=table_name,
-                    record_id=source_id,
-                    column_name='folder_path',
-                    description=f"内容源 {source_id} 的文件夹路径不存在: {folder_path}",
-                    severity=3,
-                    detected_at=datetime.now(),
-                    repair_strategy=RepairStrategy.MANUAL_REVIEW,
-                    metadata={'source_id': source_id, 'folder_path': folder_path}
-                )
-                issues.append(issue)
+            for source_id, name, folder_path in entries:
+                # 检查路径是否存在
+                if existing is None or name in ('', '.', '..'):
+                    path_exists = os.path.exists(folder_path)
+                else:
+                    entry = existing.get(name)
+                    # 符号链接需要确认目标存在，与 os.path.exists 语义一致
+                    path_exists = entry is not None and (
+                        not entry.is_symlink() or os.path.exists(folder_path)
+                    )
+                
+                if not path_exists:
+                    issue = IntegrityIssue(
+                        issue_id=self._generate_issue_id(),
+                        issue_type=IntegrityIssueType.INVALID_DATA,
+                        table_name=table_name,
+                        record_id=source_id,
+                        column_name='folder_path',
+                        description=f"内容源 {source_id} 的文件夹路径不存在: {folder_path}",
+                        severity=3,
+                        detected_at=now,
+                        repair_strategy=RepairStrategy.MANUAL_REVIEW,
+                        metadata={'source_id': source_id, 'folder_path': folder_path}
+                    )
+                    yield issue
+    
+    def _list_directory(self, directory: str) -> Optional[Dict[str, os.DirEntry]]:
+        """
+        列举目录内容
         
-        return issues
+        Returns:
+            名称到目录项的映射；目录不存在时为空映射，无法列举（如无读权限）时为None
+        """
+        try:
+            with os.scandir(directory or '.') as it:
+                return {entry.name: entry for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            return {}
+        except OSError:
+            return None
     
     def _check_api_key_validity(self, conn: sqlite3.Connection, table_name: str,
-                               schema: TableSchema) -> List[IntegrityIssue]:
+                               schema: TableSchema) -> Iterator[IntegrityIssue]:
         """检查API密钥有效性"""
-        issues = []
+        now = datetime.now()
         
         # 检查空的或无效的API密钥
         cursor = conn.execute("""
-            SELECT id, key_name, key_value
+            SELECT id, key_name, key_value,
+                   printf('API密钥 %s (ID: %d) 无效或为空', key_name, id) AS description
             FROM api_keys
             WHERE is_active = 1
             AND (key_value IS NULL OR key_value = '' OR LENGTH(key_value) < 10)
         """)
         
-        for row in cursor:
-            issue = IntegrityIssue(
+        yield from (
+            IntegrityIssue(
                 issue_id=self._generate_issue_id(),
                 issue_type=IntegrityIssueType.INVALID_DATA,
                 table_name=table_name,
                 record_id=row[0],
                 column_name='key_value',
-                description=f"API密钥 {row[1]} (ID: {row[0]}) 无效或为空",
+                description=row[3],
                 severity=5,
-                detected_at=datetime.now(),
+                detected_at=now,
                 repair_strategy=RepairStrategy.MANUAL_REVIEW,
                 metadata={'key_id': row[0], 'key_name': row[1]}
             )
-            issues.append(issue)
-        
-        return issues
+            for row in _iter_rows(cursor)
+        )
     
     def _check_api_key_expiration(self, conn: sqlite3.Connection, table_name: str,
-                                 schema: TableSchema) -> List[IntegrityIssue]:
+                                 schema: TableSchema) -> Iterator[IntegrityIssue]:
         """检查API密钥过期"""
-        issues = []
+        now = datetime.now()
         
-        # 检查过期的API密钥
+        # 检查过期的API密钥；密钥随时间过期而行本身不变，增量检查时也查询 main 中的原表
         cursor = conn.execute("""
-            SELECT id, key_name, expires_at
-            FROM api_keys
+            SELECT id, key_name, expires_at,
+                   printf('API密钥 %s (ID: %d) 已过期', key_name, id) AS description
+            FROM main.api_keys
             WHERE is_active = 1
             AND expires_at IS NOT NULL
-            AND datetime(expires_at) < datetime('now')
-        """)
+            AND expires_at < ?
+        """, (_sql_timestamp(datetime.utcnow()),))
         
-        for row in cursor:
-            issue = IntegrityIssue(
+        yield from (
+            IntegrityIssue(
                 issue_id=self._generate_issue_id(),
                 issue_type=IntegrityIssueType.INVALID_DATA,
                 table_name=table_name,
                 record_id=row[0],
                 column_name='expires_at',
-                description=f"API密钥 {row[1]} (ID: {row[0]}) 已过期",
+                description=row[3],
                 severity=4,
-                detected_at=datetime.now(),
+                detected_at=now,
                 repair_strategy=RepairStrategy.AUTO_FIX,
                 metadata={'key_id': row[0], 'key_name': row[1], 'expires_at': row[2]}
             )
-            issues.append(issue)
-        
-        return issues
+            for row in _iter_rows(cursor)
+        )
     
     def _check_analytics_gaps(self, conn: sqlite3.Connection, table_name: str,
-                             schema: TableSchema) -> List[IntegrityIssue]:
+                             schema: TableSchema) -> Iterator[IntegrityIssue]:
         """检查分析数据间隙"""
-        issues = []
+        now = datetime.now()
         
         # 检查小时统计数据的连续性
-        cursor = conn.execute("""
-            SELECT 
-                datetime(hour_timestamp) as hour,
-                datetime(hour_timestamp, '+1 hour') as next_hour
-            FROM analytics_hourly a1
-            WHERE NOT EXISTS (
-                SELECT 1 FROM analytics_hourly a2
-                WHERE datetime(a2.hour_timestamp) = datetime(a1.hour_timestamp, '+1 hour')
-            )
-            AND datetime(hour_timestamp) < datetime('now', '-1 hour')
-            ORDER BY hour_timestamp DESC
-            LIMIT 10
-        """)
+        cursor = conn.execute(
+            _ANALYTICS_GAP_SQL, (_sql_timestamp(datetime.utcnow() - timedelta(hours=1)),)
+        )
         
         gaps = cursor.fetchall()
         if gaps:
@@ -846,91 +1554,74 @@ class DataIntegrityChecker:
                 column_name='hour_timestamp',
                 description=f"分析数据存在 {len(gaps)} 个时间间隙",
                 severity=2,
-                detected_at=datetime.now(),
+                detected_at=now,
                 repair_strategy=RepairStrategy.RECALCULATE,
                 metadata={'gaps': [{'from': g[0], 'to': g[1]} for g in gaps[:5]]}
             )
-            issues.append(issue)
-        
-        return issues
+            yield issue
     
     def _check_analytics_consistency(self, conn: sqlite3.Connection, table_name: str,
-                                   schema: TableSchema) -> List[IntegrityIssue]:
-        """检查分析数据一致性"""
+                                   schema: TableSchema) -> Iterator[IntegrityIssue]:
+        """检查分析数据一致性（单次表扫描）"""
+        return self._run_row_checks(conn, table_name, _ANALYTICS_ROW_CHECKS, _ANALYTICS_ROW_CHECK_SQL)
+    
+    def _perform_generic_checks(self, conn: sqlite3.Connection, table_name: str,
+                               schema: TableSchema) -> List[IntegrityIssue]:
+        """执行通用检查"""
         issues = []
-        
-        # 检查负值统计
-        cursor = conn.execute("""
-            SELECT id, hour_timestamp, project_id
-            FROM analytics_hourly
-            WHERE tasks_completed < 0 
-            OR tasks_failed < 0 
-            OR total_engagement < 0
-        """)
-        
-        for row in cursor:
+        now = datetime.now()
+        
+        # 检查NULL值在NOT NULL列中：列名来自表结构缓存，所有列合并为一次查询
+        if table_name not in self.schema_cache:
+            return issues
+        
+        # 按列的存储顺序(cid)排列，聚合时逐行顺序解码记录中的各列
+        columns = tuple(
+            column['name'] for column in sorted(schema.columns, key=lambda c: c.get('cid', 0))
+            if column.get('notnull') and column['name'] != 'id'
+        )
+        if not columns:
+            return issues
+        
+        # 先用一次聚合扫描统计各列NULL值数量，干净的表到此结束
+        null_counts = conn.execute(_build_null_count_sql(table_name, columns)).fetchone()
+        offenders = tuple(
+            (column_name, count) for column_name, count in zip(columns, null_counts) if count
+        )
+        if not offenders:
+            return issues
+        
+        # 只为存在NULL值的列取出示例记录ID
+        null_records: Dict[str, List[Any]] = defaultdict(list)
+        sql = _build_null_check_sql(table_name, tuple(column_name for column_name, _ in offenders))
+        for column_name, record_id in conn.execute(sql):
+            null_records[column_name].append(record_id)
+        
+        for column_name, count in offenders:
+            record_ids = null_records[column_name]
             issue = IntegrityIssue(
                 issue_id=self._generate_issue_id(),
-                issue_type=IntegrityIssueType.INVALID_DATA,
+                issue_type=IntegrityIssueType.CONSTRAINT_VIOLATION,
                 table_name=table_name,
-                record_id=row[0],
-                column_name=None,
-                description=f"分析记录 {row[0]} 包含负值统计数据",
+                record_id=None,
+                column_name=column_name,
+                description=f"表 {table_name} 的列 {column_name} 存在 {count} 个NULL值",
                 severity=3,
-                detected_at=datetime.now(),
-                repair_strategy=RepairStrategy.RECALCULATE,
-                metadata={'analytics_id': row[0], 'hour': row[1], 'project_id': row[2]}
+                detected_at=now,
+                repair_strategy=RepairStrategy.DEFAULT_VALUE,
+                metadata={'record_ids': record_ids}
             )
             issues.append(issue)
         
         return issues
     
-    def _perform_generic_checks(self, conn: sqlite3.Connection, table_name: str,
-                               schema: TableSchema) -> List[IntegrityIssue]:
-        """执行通用检查"""
-        issues = []
-        
-        # 检查NULL值在NOT NULL列中
-        for column in schema.columns:
-            if column.get('notnull') and column['name'] != 'id':
-                cursor = conn.execute(f"""
-                    SELECT id FROM {table_name} 
-                    WHERE {column['name']} IS NULL
-                    LIMIT 10
-                """)
-                
-                null_records = cursor.fetchall()
-                if null_records:
-                    issue = IntegrityIssue(
-                        issue_id=self._generate_issue_id(),
-                        issue_type=IntegrityIssueType.CONSTRAINT_VIOLATION,
-                        table_name=table_name,
-                        record_id=None,
-                        column_name=column['name'],
-                        description=f"表 {table_name} 的列 {column['name']} 存在 {len(null_records)} 个NULL值",
-                        severity=3,
-                        detected_at=datetime.now(),
-                        repair_strategy=RepairStrategy.DEFAULT_VALUE,
-                        metadata={'record_ids': [r[0] for r in null_records]}
-                    )
-                    issues.append(issue)
-        
-        return issues
-    
     def _perform_cross_table_checks(self, conn: sqlite3.Connection) -> List[IntegrityIssue]:
         """执行跨表检查"""
         issues = []
+        now = datetime.now()
         
         # 检查孤立的任务（没有对应日志的已完成任务）
-        cursor = conn.execute("""
-            SELECT t.id
-            FROM publishing_tasks t
-            WHERE t.status = 'completed'
-            AND NOT EXISTS (
-                SELECT 1 FROM publishing_logs l
-                WHERE l.task_id = t.id AND l.status = 'success'
-            )
-        """)
+        cursor = conn.execute(_ORPHAN_TASKS_SQL)
         
         orphan_tasks = cursor.fetchall()
         if orphan_tasks:
@@ -942,7 +1633,7 @@ class DataIntegrityChecker:
                 column_name='status',
                 description=f"发现 {len(orphan_tasks)} 个已完成但无成功日志的任务",
                 severity=3,
-                detected_at=datetime.now(),
+                detected_at=now,
                 repair_strategy=RepairStrategy.AUTO_FIX,
                 metadata={'task_ids': [t[0] for t in orphan_tasks[:10]]}
             )
@@ -951,221 +1642,231 @@ class DataIntegrityChecker:
         return issues
     
     def _attempt_auto_repair(self, issue: IntegrityIssue) -> bool:
-        """尝试自动修复问题"""
-        if not self.auto_repair:
-            return False
+        """尝试自动修复单个问题"""
+        return self._attempt_auto_repair_batch([issue]) == 1
+    
+    def _attempt_auto_repair_batch(self, issues: List[IntegrityIssue]) -> int:
+        """
+        批量自动修复问题
         
-        if issue.repair_strategy != RepairStrategy.AUTO_FIX:
-            return False
+        先为每个问题生成修复语句，再按语句分组用 executemany 在同一个事务中执行，
+        每组使用独立的保存点，一组失败不影响其他组。组内影响的行数少于语句数时，
+        回滚该组并逐条执行，找出未命中任何行的问题。
         
-        logger.info(f"🔍 尝试自动修复问题: {issue.issue_id}")
+        Returns:
+            int: 修复成功的问题数
+        """
+        if not self.auto_repair:
+            return 0
         
-        # 备份数据
-        if self.backup_before_repair:
-            self._create_backup()
+        # 生成修复语句并按SQL分组
+        grouped: Dict[str, List[Tuple[IntegrityIssue, Tuple[Any, ...]]]] = defaultdict(list)
+        planned: List[IntegrityIssue] = []
         
-        # 根据问题类型选择修复策略
-        if issue.issue_type in self.repair_strategies:
-            repair_func = self.repair_strategies[issue.issue_type]
+        for issue in issues:
+            if issue.repair_strategy != RepairStrategy.AUTO_FIX:
+                continue
+            
+            repair_func = self.repair_strategies.get(issue.issue_type)
+            if repair_func is None:
+                continue
             
+            issue.repair_attempted = True
             try:
-                success = repair_func(issue)
-                
-                # 记录修复结果
-                issue.repair_attempted = True
-                issue.repair_successful = success
-                
-                self._record_repair(issue, success)
-                
-                if success:
-                    logger.info(f"🔍 成功修复问题: {issue.issue_id}")
-                else:
-                    logger.warning(f"🔍 修复失败: {issue.issue_id}")
-                
-                return success
-                
+                statements = repair_func(issue)
             except Exception as e:
-                logger.error(f"🔍 修复过程出错: {e}")
+                logger.error(f"🔍 生成修复语句出错: {e}")
                 issue.repair_error = str(e)
-                return False
+                statements = None
+            
+            if statements is None:
+                issue.repair_successful = False
+                self._record_repair(issue, False)
+                continue
+            
+            for sql, params in statements:
+                grouped[sql].append((issue, params))
+            planned.append(issue)
+        
+        # 执行分组后的修复语句，记录失败问题的错误信息
+        failures: Dict[str, str] = {}
+        if grouped:
+            logger.info(f"🔍 批量修复 {len(planned)} 个问题，共 {len(grouped)} 组语句")
+            
+            with self._conn_lock:
+                try:
+                    conn = self._get_repair_connection()
+                    
+                    # 备份数据
+                    if self.backup_before_repair:
+                        self._create_backup(conn)
+                    
+                    conn.execute("BEGIN IMMEDIATE")
+                    for sql, entries in grouped.items():
+                        self._execute_repair_group(conn, sql, entries, failures)
+                    conn.execute("COMMIT")
+                except sqlite3.Error as e:
+                    logger.error(f"🔍 修复过程出错: {e}")
+                    if self._conn is not None and self._conn.in_transaction:
+                        self._conn.execute("ROLLBACK")
+                    failures = {issue.issue_id: str(e) for issue in planned}
+        
+        # 记录修复结果
+        repaired = 0
+        for issue in planned:
+            error = failures.get(issue.issue_id)
+            success = error is None
+            issue.repair_successful = success
+            if error:
+                issue.repair_error = error
+            self._record_repair(issue, success)
+            
+            if success:
+                repaired += 1
+            else:
+                logger.warning(f"🔍 修复失败: {issue.issue_id}")
         
-        return False
+        return repaired
     
-    def _repair_orphan_record(self, issue: IntegrityIssue) -> bool:
-        """修复孤立记录"""
+    def _execute_repair_group(self, conn: sqlite3.Connection, sql: str,
+                              entries: List[Tuple[IntegrityIssue, Tuple[Any, ...]]],
+                              failures: Dict[str, str]):
+        """在保存点中执行一组修复语句，失败或未命中的问题写入 failures"""
+        conn.execute("SAVEPOINT repair_group")
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                if issue.repair_strategy == RepairStrategy.CASCADE_DELETE:
-                    # 删除孤立记录
-                    conn.execute(f"""
-                        DELETE FROM {issue.table_name}
-                        WHERE id = ?
-                    """, (issue.record_id,))
-                    conn.commit()
-                    return True
-        except Exception as e:
-            logger.error(f"修复孤立记录失败: {e}")
-        return False
+            cursor = conn.executemany(sql, [params for _, params in entries])
+            if cursor.rowcount < len(entries):
+                # 部分语句未影响任何行：回滚本组后逐条执行，定位对应的问题
+                conn.execute("ROLLBACK TO repair_group")
+                for issue, params in entries:
+                    if conn.execute(sql, params).rowcount == 0:
+                        failures.setdefault(issue.issue_id, "修复语句未影响任何记录")
+            conn.execute("RELEASE repair_group")
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK TO repair_group")
+            conn.execute("RELEASE repair_group")
+            for issue, _ in entries:
+                failures.setdefault(issue.issue_id, str(e))
     
-    def _repair_missing_reference(self, issue: IntegrityIssue) -> bool:
-        """修复缺失引用"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                if issue.repair_strategy == RepairStrategy.CASCADE_DELETE:
-                    # 删除引用无效的记录
-                    conn.execute(f"""
-                        DELETE FROM {issue.table_name}
-                        WHERE id = ?
-                    """, (issue.record_id,))
-                    conn.commit()
-                    return True
-                elif issue.repair_strategy == RepairStrategy.DEFAULT_VALUE:
-                    # 设置为NULL或默认值
-                    conn.execute(f"""
-                        UPDATE {issue.table_name}
-                        SET {issue.column_name} = NULL
-                        WHERE id = ?
-                    """, (issue.record_id,))
-                    conn.commit()
-                    return True
-        except Exception as e:
-            logger.error(f"修复缺失引用失败: {e}")
-        return False
+    def _get_repair_connection(self) -> sqlite3.Connection:
+        """获取修复用的长连接（调用方需持有 _conn_lock）"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            for pragma in _REPAIR_CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._conn = conn
+        return self._conn
     
-    def _repair_duplicate_data(self, issue: IntegrityIssue) -> bool:
-        """修复重复数据"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                if 'task_ids' in issue.metadata:
-                    # 保留最新的，删除其他的
-                    task_ids = issue.metadata['task_ids']
-                    if len(task_ids) > 1:
-                        # 保留第一个
-                        tasks_to_delete = task_ids[1:]
-                        placeholders = ','.join(['?'] * len(tasks_to_delete))
-                        conn.execute(f"""
-                            DELETE FROM {issue.table_name}
-                            WHERE id IN ({placeholders})
-                        """, tasks_to_delete)
-                        conn.commit()
-                        return True
-        except Exception as e:
-            logger.error(f"修复重复数据失败: {e}")
-        return False
+    def close(self):
+        """关闭修复用的长连接"""
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
     
-    def _repair_inconsistent_state(self, issue: IntegrityIssue) -> bool:
-        """修复不一致状态"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                if issue.column_name == 'status':
-                    # 重置为pending状态
-                    conn.execute(f"""
-                        UPDATE {issue.table_name}
-                        SET status = 'pending', updated_at = datetime('now')
-                        WHERE id = ?
-                    """, (issue.record_id,))
-                    conn.commit()
-                    return True
-        except Exception as e:
-            logger.error(f"修复不一致状态失败: {e}")
-        return False
+    def _repair_orphan_record(self, issue: IntegrityIssue) -> Optional[List[RepairStatement]]:
+        """生成孤立记录的修复语句"""
+        if issue.repair_strategy == RepairStrategy.CASCADE_DELETE:
+            # 删除孤立记录
+            return [(f"DELETE FROM {issue.table_name} WHERE id = ?", (issue.record_id,))]
+        return None
     
-    def _repair_invalid_data(self, issue: IntegrityIssue) -> bool:
-        """修复无效数据"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                if issue.repair_strategy == RepairStrategy.DEFAULT_VALUE:
-                    # 根据列类型设置默认值
-                    default_values = {
-                        'status': 'pending',
-                        'priority': 1,
-                        'retry_count': 0,
-                        'is_active': 1
-                    }
-                    
-                    default_value = default_values.get(issue.column_name, '')
-                    
-                    conn.execute(f"""
-                        UPDATE {issue.table_name}
-                        SET {issue.column_name} = ?
-                        WHERE id = ?
-                    """, (default_value, issue.record_id))
-                    conn.commit()
-                    return True
-        except Exception as e:
-            logger.error(f"修复无效数据失败: {e}")
-        return False
+    def _repair_missing_reference(self, issue: IntegrityIssue) -> Optional[List[RepairStatement]]:
+        """生成缺失引用的修复语句"""
+        if issue.repair_strategy == RepairStrategy.CASCADE_DELETE:
+            # 删除引用无效的记录
+            return [(f"DELETE FROM {issue.table_name} WHERE id = ?", (issue.record_id,))]
+        elif issue.repair_strategy == RepairStrategy.DEFAULT_VALUE:
+            # 设置为NULL或默认值
+            return [(f"UPDATE {issue.table_name} SET {issue.column_name} = NULL WHERE id = ?",
+                     (issue.record_id,))]
+        return None
+    
+    def _repair_duplicate_data(self, issue: IntegrityIssue) -> Optional[List[RepairStatement]]:
+        """生成重复数据的修复语句"""
+        task_ids = issue.metadata.get('task_ids', [])
+        if len(task_ids) > 1:
+            # 保留第一个，删除其他的
+            sql = f"DELETE FROM {issue.table_name} WHERE id = ?"
+            return [(sql, (task_id,)) for task_id in task_ids[1:]]
+        return None
+    
+    def _repair_inconsistent_state(self, issue: IntegrityIssue) -> Optional[List[RepairStatement]]:
+        """生成不一致状态的修复语句"""
+        if issue.column_name == 'status':
+            # 重置为pending状态
+            return [(f"UPDATE {issue.table_name} SET status = 'pending', updated_at = datetime('now') "
+                     f"WHERE id = ?", (issue.record_id,))]
+        return None
+    
+    def _repair_invalid_data(self, issue: IntegrityIssue) -> Optional[List[RepairStatement]]:
+        """生成无效数据的修复语句"""
+        if issue.repair_strategy == RepairStrategy.DEFAULT_VALUE:
+            # 根据列类型设置默认值
+            default_values = {
+                'status': 'pending',
+                'priority': 1,
+                'retry_count': 0,
+                'is_active': 1
+            }
+            
+            default_value = default_values.get(issue.column_name, '')
+            return [(f"UPDATE {issue.table_name} SET {issue.column_name} = ? WHERE id = ?",
+                     (default_value, issue.record_id))]
+        return None
     
-    def _repair_corrupted_data(self, issue: IntegrityIssue) -> bool:
+    def _repair_corrupted_data(self, issue: IntegrityIssue) -> Optional[List[RepairStatement]]:
         """修复损坏数据"""
         # 通常需要从备份恢复
         logger.warning(f"损坏数据需要从备份恢复: {issue}")
-        return False
+        return None
     
-    def _repair_constraint_violation(self, issue: IntegrityIssue) -> bool:
-        """修复约束违反"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                if issue.column_name and issue.repair_strategy == RepairStrategy.DEFAULT_VALUE:
-                    # 设置为NULL或默认值
-                    conn.execute(f"""
-                        UPDATE {issue.table_name}
-                        SET {issue.column_name} = NULL
-                        WHERE id = ?
-                    """, (issue.record_id,))
-                    conn.commit()
-                    return True
-        except Exception as e:
-            logger.error(f"修复约束违反失败: {e}")
-        return False
+    def _repair_constraint_violation(self, issue: IntegrityIssue) -> Optional[List[RepairStatement]]:
+        """生成约束违反的修复语句"""
+        if issue.column_name and issue.repair_strategy == RepairStrategy.DEFAULT_VALUE:
+            # 设置为NULL或默认值
+            return [(f"UPDATE {issue.table_name} SET {issue.column_name} = NULL WHERE id = ?",
+                     (issue.record_id,))]
+        return None
     
-    def _repair_schema_mismatch(self, issue: IntegrityIssue) -> bool:
+    def _repair_schema_mismatch(self, issue: IntegrityIssue) -> Optional[List[RepairStatement]]:
         """修复模式不匹配"""
         # 通常需要数据库迁移
         logger.warning(f"模式不匹配需要数据库迁移: {issue}")
-        return False
+        return None
     
-    def _repair_sequence_gap(self, issue: IntegrityIssue) -> bool:
+    def _repair_sequence_gap(self, issue: IntegrityIssue) -> Optional[List[RepairStatement]]:
         """修复序列间隙"""
-        # 序列间隙通常可以忽略
+        # 序列间隙通常可以忽略，无需执行语句
         if issue.repair_strategy == RepairStrategy.IGNORE:
-            return True
-        return False
+            return []
+        return None
     
-    def _repair_timestamp_anomaly(self, issue: IntegrityIssue) -> bool:
-        """修复时间戳异常"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                if 'created_at' in issue.metadata and 'updated_at' in issue.metadata:
-                    # 修正更新时间
-                    conn.execute(f"""
-                        UPDATE {issue.table_name}
-                        SET updated_at = created_at
-                        WHERE id = ?
-                    """, (issue.record_id,))
-                    conn.commit()
-                    return True
-                elif issue.column_name == 'created_at':
-                    # 修正未来时间戳
-                    conn.execute(f"""
-                        UPDATE {issue.table_name}
-                        SET created_at = datetime('now')
-                        WHERE id = ?
-                    """, (issue.record_id,))
-                    conn.commit()
-                    return True
-        except Exception as e:
-            logger.error(f"修复时间戳异常失败: {e}")
-        return False
+    def _repair_timestamp_anomaly(self, issue: IntegrityIssue) -> Optional[List[RepairStatement]]:
+        """生成时间戳异常的修复语句"""
+        if 'created_at' in issue.metadata and 'updated_at' in issue.metadata:
+            # 修正更新时间
+            return [(f"UPDATE {issue.table_name} SET updated_at = created_at WHERE id = ?",
+                     (issue.record_id,))]
+        elif issue.column_name == 'created_at':
+            # 修正未来时间戳
+            return [(f"UPDATE {issue.table_name} SET created_at = datetime('now') WHERE id = ?",
+                     (issue.record_id,))]
+        return None
     
-    def _create_backup(self):
-        """创建数据库备份"""
+    def _create_backup(self, conn: sqlite3.Connection):
+        """通过在线备份API创建数据库备份（WAL模式下直接复制文件会丢失未检查点的写入）"""
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_dir = os.path.dirname(self.db_path)
             backup_path = os.path.join(backup_dir, f"backup_{timestamp}.db")
             
-            shutil.copy2(self.db_path, backup_path)
+            backup_conn = sqlite3.connect(backup_path)
+            try:
+                # 分步复制，每步之间释放源库的读锁，不长时间阻塞写入
+                conn.backup(backup_conn, pages=1024)
+            finally:
+                backup_conn.close()
             logger.info(f"🔍 创建数据库备份: {backup_path}")
             
             # 清理旧备份（保留最近10个）
@@ -1175,18 +1876,16 @@ class DataIntegrityChecker:
             logger.error(f"创建备份失败: {e}")
     
     def _cleanup_old_backups(self, backup_dir: str):
-        """清理旧备份"""
+        """清理旧备份（按修改时间保留最近10个）"""
         try:
-            backup_files = [
-                f for f in os.listdir(backup_dir)
-                if f.startswith('backup_') and f.endswith('.db')
-            ]
+            backup_files = sorted(
+                Path(backup_dir).glob('backup_*.db'),
+                key=lambda path: path.stat().st_mtime
+            )
             
-            if len(backup_files) > 10:
-                backup_files.sort()
-                for old_backup in backup_files[:-10]:
-                    os.remove(os.path.join(backup_dir, old_backup))
-                    logger.debug(f"删除旧备份: {old_backup}")
+            for old_backup in backup_files[:-10]:
+                old_backup.unlink()
+                logger.debug(f"删除旧备份: {old_backup.name}")
                     
         except Exception as e:
             logger.error(f"清理旧备份失败: {e}")
@@ -1195,25 +1894,20 @@ class DataIntegrityChecker:
         """生成优化建议"""
         recommendations = []
         
-        # 统计问题类型
-        issue_types = defaultdict(int)
-        severity_counts = defaultdict(int)
-        
-        for issue in issues:
-            issue_types[issue.issue_type] += 1
-            severity_counts[issue.severity] += 1
+        # 一次遍历统计问题类型和严重程度
+        type_counts, severity_counts = _issue_histograms(issues)
         
         # 根据问题类型生成建议
-        if issue_types[IntegrityIssueType.MISSING_REFERENCE] > 0:
+        if type_counts[_ISSUE_TYPE_INDEX[IntegrityIssueType.MISSING_REFERENCE]] > 0:
             recommendations.append("建议启用外键约束以防止引用完整性问题")
         
-        if issue_types[IntegrityIssueType.DUPLICATE_DATA] > 0:
+        if type_counts[_ISSUE_TYPE_INDEX[IntegrityIssueType.DUPLICATE_DATA]] > 0:
             recommendations.append("建议添加唯一索引以防止数据重复")
         
-        if issue_types[IntegrityIssueType.TIMESTAMP_ANOMALY] > 0:
+        if type_counts[_ISSUE_TYPE_INDEX[IntegrityIssueType.TIMESTAMP_ANOMALY]] > 0:
             recommendations.append("建议使用触发器自动维护时间戳字段")
         
-        if issue_types[IntegrityIssueType.ORPHAN_RECORD] > 0:
+        if type_counts[_ISSUE_TYPE_INDEX[IntegrityIssueType.ORPHAN_RECORD]] > 0:
             recommendations.append("建议定期清理孤立记录")
         
         # 根据严重性生成建议
@@ -1256,11 +1950,16 @@ class DataIntegrityChecker:
         self.statistics['total_checks'] += 1
         self.statistics['total_issues'] += len(report.issues_found)
         
-        # 更新平均检查时长
-        current_avg = self.statistics['check_duration_avg']
-        new_avg = (current_avg * (self.statistics['total_checks'] - 1) + 
-                  report.duration_seconds) / self.statistics['total_checks']
-        self.statistics['check_duration_avg'] = new_avg
+        # 记录检查时长，平均值按最近的检查窗口计算
+        self._check_durations.append(report.duration_seconds)
+        self.statistics['check_duration_avg'] = statistics.fmean(self._check_durations)
+    
+    def _duration_percentile(self, percentile: int) -> float:
+        """计算最近检查耗时的百分位数"""
+        durations = list(self._check_durations)
+        if len(durations) < 2:
+            return durations[0] if durations else 0.0
+        return statistics.quantiles(durations, n=100, method='inclusive')[percentile - 1]
     
     def _log_report(self, report: IntegrityReport):
         """记录检查报告"""
@@ -1282,14 +1981,11 @@ class DataIntegrityChecker:
     
     def _generate_check_id(self) -> str:
         """生成检查ID"""
-        timestamp = datetime.now().isoformat()
-        return hashlib.md5(f"check_{timestamp}".encode()).hexdigest()[:12]
+        return secrets.token_hex(6)
     
     def _generate_issue_id(self) -> str:
         """生成问题ID"""
-        timestamp = datetime.now().isoformat()
-        random_str = str(time.time())
-        return hashlib.md5(f"issue_{timestamp}_{random_str}".encode()).hexdigest()[:16]
+        return secrets.token_hex(8)
     
     def start_monitoring(self):
         """启动监控"""
@@ -1297,6 +1993,7 @@ class DataIntegrityChecker:
             return
         
         self.monitoring = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
         self.monitor_thread.start()
         
@@ -1304,48 +2001,73 @@ class DataIntegrityChecker:
     
     def stop_monitoring(self):
         """停止监控"""
-        self.monitoring = False
+        with self.lock:
+            self.monitoring = False
+            # 取消尚未执行的检查；正在执行的检查结束后不再重新调度
+            for event in self._scheduler.queue:
+                try:
+                    self._scheduler.cancel(event)
+                except ValueError:
+                    pass
+        self._stop_event.set()
+        
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
         
         logger.info("🔍 数据完整性监控已停止")
     
     def _monitoring_loop(self):
-        """监控循环"""
+        """监控循环：调度器在下一次检查到期时才唤醒线程，队列为空时返回"""
         logger.info("🔍 数据完整性监控循环启动")
         
-        while self.monitoring:
-            try:
-                # 执行定期检查
-                if self._should_perform_check():
-                    report = self.perform_full_check()
-                    
-                    # 如果发现严重问题，发送警报
-                    if report.critical_issues > 0:
-                        self._send_alert(report)
-                
-                time.sleep(60)  # 每分钟检查一次是否需要执行
-                
-            except Exception as e:
-                logger.error(f"🔍 监控循环异常: {e}")
-                time.sleep(60)
+        self._schedule_next_check(self._next_deadline())
+        self._scheduler.run()
         
         logger.info("🔍 数据完整性监控循环结束")
     
-    def _should_perform_check(self) -> bool:
-        """判断是否应该执行检查"""
-        if not self.last_check_time:
-            return True
+    def _wait_for_stop(self, timeout: float):
+        """调度器的等待函数，停止监控时立即返回"""
+        self._stop_event.wait(timeout)
+    
+    def _schedule_next_check(self, deadline: float):
+        """在监控仍在运行时调度下一次检查"""
+        with self.lock:
+            if self.monitoring:
+                self._scheduler.enterabs(deadline, 1, self._run_scheduled_check)
+    
+    def _next_deadline(self) -> float:
+        """下一次检查的截止时间（time.monotonic 时钟）"""
+        if self._last_check_mono is None:
+            return time.monotonic()
         
-        elapsed = (datetime.now() - self.last_check_time).total_seconds()
-        return elapsed >= self.check_interval
+        return max(time.monotonic(), self._last_check_mono + self.check_interval)
+    
+    def _run_scheduled_check(self):
+        """执行一次定期检查并调度下一次"""
+        try:
+            report = self.perform_incremental_check()
+            
+            # 如果发现严重问题，发送警报
+            if report.critical_issues > 0:
+                self._send_alert(report)
+            
+            deadline = self._next_deadline()
+        except Exception as e:
+            logger.error(f"🔍 监控循环异常: {e}")
+            deadline = time.monotonic() + _MONITOR_RETRY_DELAY
+        
+        self._schedule_next_check(deadline)
     
     def _send_alert(self, report: IntegrityReport):
         """发送警报"""
-        logger.warning(f"🚨 数据完整性警报: 发现 {report.critical_issues} 个严重问题!")
+        self._alert(f"发现 {report.critical_issues} 个严重问题!")
+    
+    def _alert(self, message: str):
+        """输出数据完整性警报"""
+        logger.warning(f"🚨 数据完整性警报: {message}")
         
         # 这里可以集成邮件、Slack等通知机制
-        
+    
     def get_statistics(self) -> Dict[str, Any]:
         """获取统计信息"""
         return {
@@ -1355,6 +2077,7 @@ class DataIntegrityChecker:
             'manual_required': self.statistics['manual_required'],
             'failed_repairs': self.statistics['failed_repairs'],
             'check_duration_avg': self.statistics['check_duration_avg'],
+            'check_duration_p95': self._duration_percentile(95),
             'active_issues': len(self.active_issues),
             'monitoring': self.monitoring,
             'last_check_time': self.last_check_time.isoformat() if self.last_check_time else None
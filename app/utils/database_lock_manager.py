@@ -13,18 +13,19 @@
 6. 锁统计与分析
 """
 
+import os
 import sqlite3
 import threading
 import time
-import queue
-import hashlib
+import heapq
+import itertools
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable, Tuple
+from typing import Dict, List, Optional, Any, Callable, Tuple, Set, Deque, Iterator
 from dataclasses import dataclass, field
 from enum import Enum
 from contextlib import contextmanager
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 import random
 import psutil
 
@@ -32,6 +33,44 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 连接空闲超过该秒数后，下次签出时才重新探活；其余情况依赖使用时的异常惰性回收
+_CONNECTION_VALIDATION_INTERVAL = 300
+
+# WAL 文件超过该大小时执行 RESTART 检查点，避免长期读者导致 WAL 无限增长
+_WAL_SIZE_LIMIT = 64 * 1024 * 1024
+
+# 检查点期间写连接使用的忙等待超时（毫秒）；存在读者时尽快放弃 RESTART，不长时间阻塞写入
+_WAL_CHECKPOINT_BUSY_TIMEOUT_MS = 200
+
+# 新建连接的PRAGMA设置；cache_size 取负值表示 KiB（20MB），与页大小无关
+_CONNECTION_PRAGMAS = """
+{prologue}
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-20000;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA busy_timeout={busy_timeout_ms};
+PRAGMA foreign_keys=ON;
+{epilogue}
+"""
+# 增量清理空间须在启用 WAL 前设置；只在新建的空库上生效，已有库需经 vacuum_full() 转换
+_WRITE_CONNECTION_PROLOGUE = "PRAGMA auto_vacuum=INCREMENTAL;"
+_READ_CONNECTION_EPILOGUE = "PRAGMA query_only=1;"
+_WAL_CHECKPOINT_INTERVAL = 60
+
+# 一次查询读取 get_system_metrics 所需的全部 PRAGMA，结果缓存若干秒
+_SQLITE_METRICS_SQL = (
+    "SELECT (SELECT page_count FROM pragma_page_count),"
+    " (SELECT page_size FROM pragma_page_size),"
+    " (SELECT cache_size FROM pragma_cache_size),"
+    " (SELECT journal_mode FROM pragma_journal_mode)"
+)
+_SQLITE_METRICS_TTL = 30
+
+# get_statistics 中表级分布最多返回的表数
+_TABLE_DISTRIBUTION_TOP_K = 100
+
 class LockType(Enum):
     """锁类型枚举"""
     SHARED = "shared"          # 共享锁（读锁）
@@ -49,25 +88,34 @@ class LockState(Enum):
     RELEASED = "released"      # 已释放
     FAILED = "failed"          # 失败
 
+# 锁事件历史记录: (请求ID, 表名, 锁类型, 状态, 单调时间戳, 等待时间)
+LockEvent = Tuple[str, Optional[str], LockType, LockState, float, float]
+
 @dataclass
 class LockRequest:
     """锁请求信息"""
     request_id: str
-    connection_id: str
+    connection_id: Optional[str]          # 持有的连接池连接ID，表级锁不绑定连接时为 None
     lock_type: LockType
     table_name: Optional[str]
-    request_time: datetime
+    request_time: datetime                # 仅用于展示
     timeout_seconds: float
     priority: int = 1
     retry_count: int = 0
     max_retries: int = 3
+    request_time_mono: float = field(default_factory=time.monotonic)  # 用于计时
+    rollback_cost_estimate: float = 0.0   # 回滚代价估计（如已写入字节数），由调用方更新
+    thread_id: int = 0                    # 发起请求的线程
     
     def is_expired(self) -> bool:
         """检查请求是否超时"""
-        elapsed = (datetime.now() - self.request_time).total_seconds()
-        return elapsed > self.timeout_seconds
+        return time.monotonic() - self.request_time_mono > self.timeout_seconds
+    
+    def victim_key(self) -> Tuple[int, float, int, float]:
+        """死锁牺牲者排序键：优先级低、回滚代价小、重试少、请求最晚的排在前面"""
+        return (self.priority, self.rollback_cost_estimate, self.retry_count, -self.request_time_mono)
     
-    def __hash__(self):
+    def __hash__(self) -> int:
         return hash(self.request_id)
 
 @dataclass
@@ -78,10 +126,16 @@ class LockStatistics:
     timeouts: int = 0
     deadlocks: int = 0
     retries: int = 0
-    average_wait_time: float = 0.0
+    sum_wait_time: float = 0.0             # 累计等待时间，平均值读取时再计算
+    wait_samples: int = 0
     peak_concurrent_locks: int = 0
-    lock_type_distribution: Dict[str, int] = field(default_factory=dict)
-    table_lock_distribution: Dict[str, int] = field(default_factory=dict)
+    lock_type_distribution: Counter = field(default_factory=Counter)
+    table_lock_distribution: Counter = field(default_factory=Counter)
+    
+    @property
+    def average_wait_time(self) -> float:
+        """平均等待时间（秒）"""
+        return self.sum_wait_time / self.wait_samples if self.wait_samples else 0.0
 
 @dataclass
 class ConnectionInfo:
@@ -89,17 +143,24 @@ class ConnectionInfo:
     connection_id: str
     connection: sqlite3.Connection
     created_at: datetime
-    last_used: datetime
+    readonly: bool = False
     in_use: bool = False
     transaction_active: bool = False
     lock_count: int = 0
+    # 单调时钟秒数，不受系统时间调整影响
+    last_used_mono: float = field(default_factory=time.monotonic)
+    validated_at: float = field(default_factory=time.monotonic)
     
     def is_idle(self, idle_timeout_seconds: int = 300) -> bool:
         """检查连接是否空闲"""
         if self.in_use:
             return False
-        idle_time = (datetime.now() - self.last_used).total_seconds()
-        return idle_time > idle_timeout_seconds
+        return time.monotonic() - self.last_used_mono > idle_timeout_seconds
+    
+    def needs_validation(self, interval_seconds: int = _CONNECTION_VALIDATION_INTERVAL) -> bool:
+        """检查连接是否长时间未使用，需要在签出前重新探活"""
+        last_seen = max(self.last_used_mono, self.validated_at)
+        return time.monotonic() - last_seen > interval_seconds
 
 class DatabaseLockManager:
     """🔒 高级数据库锁管理器"""
@@ -115,36 +176,65 @@ class DatabaseLockManager:
         self.max_wait_time = self.config.get('max_wait_time', 60)
         self.deadlock_check_interval = self.config.get('deadlock_check_interval', 5)
         self.connection_idle_timeout = self.config.get('connection_idle_timeout', 300)
+        self.connection_validation_interval = self.config.get(
+            'connection_validation_interval', _CONNECTION_VALIDATION_INTERVAL
+        )
+        self.wal_size_limit = self.config.get('wal_size_limit', _WAL_SIZE_LIMIT)
+        self.wal_checkpoint_interval = self.config.get('wal_checkpoint_interval', _WAL_CHECKPOINT_INTERVAL)
         
         # 重试策略参数
         self.base_retry_delay = self.config.get('base_retry_delay', 0.1)
         self.max_retry_delay = self.config.get('max_retry_delay', 5.0)
-        self.retry_jitter = self.config.get('retry_jitter', 0.2)
+        # full: 在 [0, 指数上限] 内均匀取值; decorrelated: 基于上次延迟的去相关抖动
+        self.retry_backoff = self.config.get('retry_backoff', 'full')
         
-        # 连接池
+        # 进程内单调递增的ID序列
+        self._conn_seq: Iterator[int] = itertools.count()
+        self._req_seq: Iterator[int] = itertools.count()
+        
+        # 连接池：一个写连接（进程内串行化）+ 最多 max_connections-1 个只读连接
         self.connection_pool: Dict[str, ConnectionInfo] = {}
-        self.available_connections: queue.Queue = queue.Queue()
+        self.max_read_connections = max(1, self.max_connections - 1)
+        # 作为栈使用（后进先出）：优先复用最近归还的只读连接，保持其页缓存热度
+        self.available_connections: List[str] = []
+        self._write_connection_id: Optional[str] = None
+        self._write_lock = threading.Lock()
         
         # 锁管理
         self.active_locks: Dict[str, LockRequest] = {}
-        self.waiting_queue: queue.PriorityQueue = queue.PriorityQueue()
-        self.lock_wait_graph: Dict[str, List[str]] = defaultdict(list)  # 用于死锁检测
+        # 按表分桶的持有者: 表名 -> 锁类型 -> 请求ID集合，冲突检查只看同表的锁
+        self._locks_by_table: Dict[Optional[str], Dict[LockType, Set[str]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        # 按表分桶的等待堆: 表名 -> [(-priority, 入队序号, 请求)]，数字越大优先级越高，同优先级先到先得
+        self._waiters_by_table: Dict[Optional[str], List[Tuple[int, int, LockRequest]]] = {}
+        self._waiting_seq: Iterator[int] = itertools.count()
         
         # 统计信息
         self.statistics = LockStatistics()
-        self.lock_history: deque = deque(maxlen=1000)  # 保留最近1000条锁记录
+        # 保留最近1000条锁记录: (请求ID, 表名, 锁类型, 状态, 单调时间戳, 等待时间)，读取时再格式化
+        self.lock_history: Deque[LockEvent] = deque(maxlen=1000)
         
         # 线程同步
         self.manager_lock = threading.RLock()
         self.condition = threading.Condition(self.manager_lock)
+        # 只读连接归还或释放名额时通知等待者
+        self._pool_cv = threading.Condition(self.manager_lock)
         
         # 监控线程
         self.monitoring = False
         self.monitor_thread = None
+        self._last_wal_check_mono = time.monotonic()
+        
+        # SQLite 指标缓存: (单调时间戳, 指标)
+        self._sqlite_metrics_cache: Optional[Tuple[float, Dict[str, Any]]] = None
         
         # 初始化连接池
         self._initialize_connection_pool()
         
+        # 预热CPU采样基准，之后的非阻塞调用返回距上次调用的使用率
+        psutil.cpu_percent(interval=None)
+        
         logger.info("🔒 数据库锁管理器已初始化")
         logger.info(f"  - 数据库路径: {self.db_path}")
         logger.info(f"  - 最大连接数: {self.max_connections}")
@@ -153,41 +243,45 @@ class DatabaseLockManager:
     def _initialize_connection_pool(self):
         """初始化连接池"""
         try:
-            for i in range(self.min_connections):
-                conn_info = self._create_connection()
+            # 先建写连接，确保 WAL 模式由可写连接设置
+            write_conn = self._create_connection()
+            if write_conn:
+                self.connection_pool[write_conn.connection_id] = write_conn
+                self._write_connection_id = write_conn.connection_id
+                
+            for i in range(max(1, self.min_connections - 1)):
+                conn_info = self._create_connection(readonly=True)
                 if conn_info:
                     self.connection_pool[conn_info.connection_id] = conn_info
-                    self.available_connections.put(conn_info.connection_id)
+                    self.available_connections.append(conn_info.connection_id)
                     
             logger.info(f"🔒 连接池初始化完成，创建了 {self.min_connections} 个连接")
             
         except Exception as e:
             logger.error(f"🔒 连接池初始化失败: {e}")
     
-    def _create_connection(self) -> Optional[ConnectionInfo]:
-        """创建新的数据库连接"""
+    def _create_connection(self, readonly: bool = False) -> Optional[ConnectionInfo]:
+        """创建新的数据库连接（readonly 时设置 PRAGMA query_only）"""
         try:
             connection_id = self._generate_connection_id()
             
             # 创建连接并设置优化参数
             conn = sqlite3.connect(self.db_path, timeout=self.default_timeout, check_same_thread=False)
             
-            # 设置SQLite优化参数
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute("PRAGMA cache_size=10000")
-            conn.execute("PRAGMA temp_store=MEMORY")
-            conn.execute("PRAGMA mmap_size=268435456")  # 256MB
-            conn.execute(f"PRAGMA busy_timeout={self.default_timeout * 1000}")  # 毫秒
-            
-            # 启用外键约束
-            conn.execute("PRAGMA foreign_keys=ON")
+            # 一次 executescript 设置全部连接参数
+            conn.executescript(
+                _CONNECTION_PRAGMAS.format(
+                    prologue="" if readonly else _WRITE_CONNECTION_PROLOGUE,
+                    busy_timeout_ms=int(self.default_timeout * 1000),
+                    epilogue=_READ_CONNECTION_EPILOGUE if readonly else ""
+                )
+            )
             
             conn_info = ConnectionInfo(
                 connection_id=connection_id,
                 connection=conn,
                 created_at=datetime.now(),
-                last_used=datetime.now()
+                readonly=readonly
             )
             
             logger.debug(f"🔒 创建新连接: {connection_id}")
@@ -199,27 +293,31 @@ class DatabaseLockManager:
     
     def _generate_connection_id(self) -> str:
         """生成唯一的连接ID"""
-        timestamp = datetime.now().isoformat()
-        random_str = str(random.random())
-        return hashlib.md5(f"{timestamp}_{random_str}".encode()).hexdigest()[:12]
+        return f"c{next(self._conn_seq):012x}"
     
     @contextmanager
-    def acquire_connection(self, timeout: Optional[float] = None) -> sqlite3.Connection:
+    def acquire_connection(self, timeout: Optional[float] = None,
+                           readonly: bool = False) -> Iterator[sqlite3.Connection]:
         """
         获取数据库连接（上下文管理器）
         
         Args:
             timeout: 超时时间（秒）
+            readonly: 是否只需读取；只读请求使用只读连接池，WAL 模式下不等待写者
             
         Yields:
             sqlite3.Connection: 数据库连接
         """
         timeout = timeout or self.default_timeout
         connection_id = None
+        broken = False
         
         try:
-            # 尝试从池中获取连接
-            connection_id = self._get_connection_from_pool(timeout)
+            # 只读请求从只读池获取，写请求独占唯一的写连接
+            if readonly:
+                connection_id = self._get_connection_from_pool(timeout)
+            else:
+                connection_id = self._get_write_connection(timeout)
             
             if not connection_id:
                 raise TimeoutError(f"无法在 {timeout} 秒内获取数据库连接")
@@ -227,62 +325,102 @@ class DatabaseLockManager:
             with self.manager_lock:
                 conn_info = self.connection_pool[connection_id]
                 conn_info.in_use = True
-                conn_info.last_used = datetime.now()
+                conn_info.last_used_mono = time.monotonic()
                 
             yield conn_info.connection
             
+        except (sqlite3.ProgrammingError, sqlite3.OperationalError) as e:
+            # 使用时才发现连接失效，回收而不是放回池中
+            broken = self._is_connection_broken(e)
+            raise
+            
         finally:
             # 释放连接回池
             if connection_id:
-                self._release_connection_to_pool(connection_id)
+                if broken:
+                    logger.warning(f"🔒 连接 {connection_id} 已失效，回收该连接")
+                    self._remove_connection(connection_id)
+                else:
+                    self._release_connection_to_pool(connection_id)
+                    
+                if not readonly:
+                    self._write_lock.release()
+    
+    def _get_write_connection(self, timeout: float) -> Optional[str]:
+        """获取写连接（持有 _write_lock 返回，失败时不持有）"""
+        if not self._write_lock.acquire(timeout=timeout):
+            return None
+            
+        with self.manager_lock:
+            connection_id = self._write_connection_id
+            if connection_id in self.connection_pool:
+                return connection_id
+                
+            # 写连接尚未创建或已被回收，重新创建
+            new_conn = self._create_connection()
+            if new_conn:
+                self.connection_pool[new_conn.connection_id] = new_conn
+                self._write_connection_id = new_conn.connection_id
+                return new_conn.connection_id
+                
+        self._write_lock.release()
+        return None
+    
+    @staticmethod
+    def _is_connection_broken(error: Exception) -> bool:
+        """判断异常是否意味着连接本身已不可用"""
+        error_msg = str(error).lower()
+        return 'closed' in error_msg or 'disk i/o error' in error_msg
     
     def _get_connection_from_pool(self, timeout: float) -> Optional[str]:
         """从池中获取连接"""
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
         
-        while time.time() - start_time < timeout:
-            try:
+        with self._pool_cv:
+            while True:
                 # 尝试获取可用连接
-                connection_id = self.available_connections.get(timeout=0.1)
-                
-                with self.manager_lock:
-                    if connection_id in self.connection_pool:
-                        conn_info = self.connection_pool[connection_id]
+                while self.available_connections:
+                    connection_id = self.available_connections.pop()
+                    conn_info = self.connection_pool.get(connection_id)
+                    if conn_info is None:
+                        continue
                         
-                        # 检查连接是否有效
-                        try:
-                            conn_info.connection.execute("SELECT 1")
-                            return connection_id
-                        except:
-                            # 连接无效，创建新连接
-                            logger.warning(f"🔒 连接 {connection_id} 无效，创建新连接")
-                            self._remove_connection(connection_id)
-                            new_conn = self._create_connection()
-                            if new_conn:
-                                self.connection_pool[new_conn.connection_id] = new_conn
-                                return new_conn.connection_id
-                                
-            except queue.Empty:
-                # 检查是否可以创建新连接
-                with self.manager_lock:
-                    if len(self.connection_pool) < self.max_connections:
-                        new_conn = self._create_connection()
-                        if new_conn:
-                            self.connection_pool[new_conn.connection_id] = new_conn
-                            return new_conn.connection_id
-                            
-                # 等待一小段时间再重试
-                time.sleep(0.1)
-                
-        return None
+                    # 只有长时间未使用的连接才探活，其余失效在使用时惰性回收
+                    if not conn_info.needs_validation(self.connection_validation_interval):
+                        return connection_id
+                    
+                    try:
+                        conn_info.connection.execute("SELECT 1")
+                        conn_info.validated_at = time.monotonic()
+                        return connection_id
+                    except sqlite3.Error:
+                        # 连接无效，移除后继续取下一个或新建
+                        logger.warning(f"🔒 连接 {connection_id} 无效，创建新连接")
+                        self._remove_connection(connection_id)
+                        
+                # 检查是否可以创建新的只读连接
+                if self._read_connection_count() < self.max_read_connections:
+                    new_conn = self._create_connection(readonly=True)
+                    if new_conn:
+                        self.connection_pool[new_conn.connection_id] = new_conn
+                        return new_conn.connection_id
+                        
+                # 等待连接归还或空出名额
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._pool_cv.wait_for(
+                    lambda: self.available_connections
+                    or self._read_connection_count() < self.max_read_connections,
+                    timeout=remaining
+                ):
+                    return None
     
-    def _release_connection_to_pool(self, connection_id: str):
+    def _release_connection_to_pool(self, connection_id: str) -> None:
         """释放连接回池"""
         with self.manager_lock:
             if connection_id in self.connection_pool:
                 conn_info = self.connection_pool[connection_id]
                 conn_info.in_use = False
-                conn_info.last_used = datetime.now()
+                conn_info.last_used_mono = time.monotonic()
                 
                 # 回滚未提交的事务
                 if conn_info.transaction_active:
@@ -292,9 +430,15 @@ class DatabaseLockManager:
                     except:
                         pass
                         
-                self.available_connections.put(connection_id)
+                if conn_info.readonly:
+                    self.available_connections.append(connection_id)
+                    self._pool_cv.notify()
+    
+    def _read_connection_count(self) -> int:
+        """当前只读连接数"""
+        return len(self.connection_pool) - (self._write_connection_id in self.connection_pool)
     
-    def _remove_connection(self, connection_id: str):
+    def _remove_connection(self, connection_id: str) -> None:
         """移除连接"""
         with self.manager_lock:
             if connection_id in self.connection_pool:
@@ -304,43 +448,61 @@ class DatabaseLockManager:
                 except:
                     pass
                 del self.connection_pool[connection_id]
+                
+                if conn_info.readonly:
+                    if connection_id in self.available_connections:
+                        self.available_connections.remove(connection_id)
+                    # 空出的名额可供等待者新建连接
+                    self._pool_cv.notify()
+                    
                 logger.debug(f"🔒 移除连接: {connection_id}")
     
-    def execute_with_retry(self, func: Callable, *args, max_retries: int = 3, **kwargs) -> Any:
+    def execute_with_retry(self, func: Callable, *args, max_retries: int = 3,
+                           readonly: bool = False, **kwargs) -> Any:
         """
         带重试机制执行数据库操作
         
         Args:
             func: 要执行的函数
             max_retries: 最大重试次数
+            readonly: 函数是否只读，只读操作使用只读连接池
             *args, **kwargs: 函数参数
             
         Returns:
             函数执行结果
         """
         last_error = None
+        delay = self.base_retry_delay
         
         for attempt in range(max_retries + 1):
             try:
                 # 计算重试延迟
                 if attempt > 0:
-                    delay = self._calculate_retry_delay(attempt)
+                    delay = self._calculate_retry_delay(attempt, delay)
                     logger.info(f"🔒 重试第 {attempt} 次，延迟 {delay:.2f} 秒")
                     time.sleep(delay)
                     self.statistics.retries += 1
                     
                 # 执行函数
-                with self.acquire_connection() as conn:
+                with self.acquire_connection(readonly=readonly) as conn:
                     result = func(conn, *args, **kwargs)
                     
                 self.statistics.successful_acquisitions += 1
                 return result
                 
-            except sqlite3.OperationalError as e:
+            except (sqlite3.ProgrammingError, sqlite3.OperationalError) as e:
                 last_error = e
                 error_msg = str(e).lower()
                 
-                if 'database is locked' in error_msg:
+                if self._is_connection_broken(e):
+                    # acquire_connection 已回收失效连接，重试时会取到或新建可用连接
+                    logger.warning(f"🔒 连接失效，尝试 {attempt + 1}/{max_retries + 1}: {e}")
+                    
+                elif isinstance(e, sqlite3.ProgrammingError):
+                    logger.error(f"🔒 数据库操作错误: {e}")
+                    raise
+                    
+                elif 'database is locked' in error_msg:
                     logger.warning(f"🔒 数据库锁定，尝试 {attempt + 1}/{max_retries + 1}")
                     self.statistics.timeouts += 1
                     
@@ -361,16 +523,16 @@ class DatabaseLockManager:
         logger.error(f"🔒 所有重试都失败: {last_error}")
         raise last_error
     
-    def _calculate_retry_delay(self, attempt: int) -> float:
-        """计算重试延迟（指数退避 + 抖动）"""
-        # 指数退避
-        delay = min(self.base_retry_delay * (2 ** (attempt - 1)), self.max_retry_delay)
+    def _calculate_retry_delay(self, attempt: int, prev_delay: Optional[float] = None) -> float:
+        """计算重试延迟（指数退避 + Full Jitter，或去相关抖动）"""
+        cap = self.max_retry_delay
         
-        # 添加随机抖动
-        jitter = delay * self.retry_jitter * (2 * random.random() - 1)
-        final_delay = max(0, delay + jitter)
-        
-        return final_delay
+        if self.retry_backoff == 'decorrelated':
+            prev_delay = prev_delay or self.base_retry_delay
+            return min(cap, random.uniform(self.base_retry_delay, prev_delay * 3))
+            
+        # 延迟在 [0, 指数上限] 内均匀分布，使并发重试彼此错开
+        return random.uniform(0, min(cap, self.base_retry_delay * (2 ** (attempt - 1))))
     
     def _handle_deadlock(self):
         """处理死锁情况"""
@@ -389,39 +551,64 @@ class DatabaseLockManager:
                     if victim:
                         logger.warning(f"🔒 选择牺牲者: {victim}")
                         self._abort_lock_request(victim)
-                        
-            # 清理等待图
-            self.lock_wait_graph.clear()
+
     
     def _detect_deadlock_cycles(self) -> List[List[str]]:
-        """检测死锁环（使用DFS）"""
-        visited = set()
-        rec_stack = set()
+        """检测死锁环（迭代式Tarjan强连通分量，O(V+E)，不递归）"""
+        graph = self._build_wait_graph()
+        index_of: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        scc_stack: List[str] = []
+        on_stack = set()
         cycles = []
         
-        def dfs(node: str, path: List[str]) -> bool:
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-            
-            for neighbor in self.lock_wait_graph.get(node, []):
-                if neighbor not in visited:
-                    if dfs(neighbor, path.copy()):
-                        return True
-                elif neighbor in rec_stack:
-                    # 找到环
-                    cycle_start = path.index(neighbor)
-                    cycle = path[cycle_start:]
-                    cycles.append(cycle)
-                    return True
-                    
-            rec_stack.remove(node)
-            return False
+        for root in list(graph.keys()):
+            if root in index_of:
+                continue
+                
+            index_of[root] = lowlink[root] = len(index_of)
+            scc_stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(graph.get(root, ())))]
             
-        for node in list(self.lock_wait_graph.keys()):
-            if node not in visited:
-                dfs(node, [])
+            while work:
+                node, neighbors = work[-1]
+                advanced = False
                 
+                for neighbor in neighbors:
+                    if neighbor not in index_of:
+                        index_of[neighbor] = lowlink[neighbor] = len(index_of)
+                        scc_stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(graph.get(neighbor, ()))))
+                        advanced = True
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[neighbor])
+                        
+                if advanced:
+                    continue
+                    
+                # node 的邻居已全部处理完，回溯
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                            
+                    # 多于一个节点的强连通分量或自环即为死锁环
+                    if len(component) > 1 or node in graph.get(node, ()):
+                        component.reverse()
+                        cycles.append(component)
+                        
         return cycles
     
     def _select_deadlock_victim(self, chain: List[str]) -> Optional[str]:
@@ -429,25 +616,28 @@ class DatabaseLockManager:
         if not chain:
             return None
             
-        # 选择优先级最低或等待时间最短的
-        victim = None
-        min_priority = float('inf')
-        
-        for request_id in chain:
-            if request_id in self.active_locks:
-                lock_request = self.active_locks[request_id]
-                if lock_request.priority < min_priority:
-                    min_priority = lock_request.priority
-                    victim = request_id
-                    
-        return victim
+        # 选择优先级最低、回滚代价最小的持有者
+        candidates = [
+            self.active_locks[request_id] for request_id in chain if request_id in self.active_locks
+        ]
+        if not candidates:
+            return None
+            
+        return min(candidates, key=LockRequest.victim_key).request_id
     
-    def _abort_lock_request(self, request_id: str):
+    def set_rollback_cost(self, request_id: str, cost: float):
+        """更新锁持有者的回滚代价估计，用于死锁牺牲者选择"""
+        with self.manager_lock:
+            lock_request = self.active_locks.get(request_id)
+            if lock_request is not None:
+                lock_request.rollback_cost_estimate = cost
+    
+    def _abort_lock_request(self, request_id: str) -> None:
         """中止锁请求"""
         if request_id in self.active_locks:
             lock_request = self.active_locks[request_id]
             
-            # 释放相关资源
+            # 释放相关资源（请求绑定了连接池连接时回滚其事务）
             if lock_request.connection_id in self.connection_pool:
                 conn_info = self.connection_pool[lock_request.connection_id]
                 try:
@@ -456,10 +646,13 @@ class DatabaseLockManager:
                     pass
                     
             # 从活动锁中移除
-            del self.active_locks[request_id]
+            self._remove_active_lock(lock_request)
             
             # 记录到历史
             self._record_lock_event(lock_request, LockState.DEADLOCK)
+            
+            # 牺牲者释放的表可能已可授予给等待者
+            self._process_waiting_queue(lock_request.table_name)
     
     def acquire_table_lock(self, table_name: str, lock_type: LockType = LockType.EXCLUSIVE,
                           timeout: Optional[float] = None, priority: int = 1) -> bool:
@@ -476,33 +669,39 @@ class DatabaseLockManager:
             bool: 是否成功获取锁
         """
         timeout = timeout or self.default_timeout
-        request_id = self._generate_request_id()
-        
-        lock_request = LockRequest(
-            request_id=request_id,
-            connection_id=threading.current_thread().ident,
-            lock_type=lock_type,
-            table_name=table_name,
-            request_time=datetime.now(),
-            timeout_seconds=timeout,
-            priority=priority
-        )
         
         with self.manager_lock:
-            # 检查是否可以立即获取锁
-            if self._can_acquire_lock(lock_request):
-                self.active_locks[request_id] = lock_request
+            # 先按 (表, 锁类型) 检查，确定走立即获取还是排队
+            can_acquire = self._can_acquire_lock(table_name, lock_type)
+            
+            # 持有中的锁同样需要请求记录（释放、死锁处理与历史都依赖它）
+            request_id = self._generate_request_id()
+            lock_request = LockRequest(
+                request_id=request_id,
+                connection_id=None,
+                lock_type=lock_type,
+                table_name=table_name,
+                request_time=datetime.now(),
+                timeout_seconds=timeout,
+                priority=priority,
+                thread_id=threading.get_ident()
+            )
+            
+            if can_acquire:
+                self._add_active_lock(lock_request)
                 self._record_lock_event(lock_request, LockState.ACQUIRED)
                 self.statistics.successful_acquisitions += 1
                 return True
                 
             # 加入等待队列
-            self.waiting_queue.put((priority, lock_request))
-            self._update_wait_graph(lock_request)
+            heapq.heappush(
+                self._waiters_by_table.setdefault(table_name, []),
+                (-priority, next(self._waiting_seq), lock_request)
+            )
             
         # 等待锁
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        start_time = time.monotonic()
+        while time.monotonic() - start_time < timeout:
             with self.condition:
                 if request_id in self.active_locks:
                     return True
@@ -515,109 +714,135 @@ class DatabaseLockManager:
         self.statistics.timeouts += 1
         return False
     
-    def _can_acquire_lock(self, request: LockRequest) -> bool:
+    def _add_active_lock(self, request: LockRequest) -> None:
+        """登记已获取的锁"""
+        self.active_locks[request.request_id] = request
+        self._locks_by_table[request.table_name][request.lock_type].add(request.request_id)
+    
+    def _remove_active_lock(self, request: LockRequest) -> None:
+        """注销已获取的锁，表下没有持有者时回收分桶"""
+        del self.active_locks[request.request_id]
+        holders = self._locks_by_table.get(request.table_name)
+        if holders is None:
+            return
+        holders[request.lock_type].discard(request.request_id)
+        if not holders[request.lock_type]:
+            del holders[request.lock_type]
+        if not holders:
+            del self._locks_by_table[request.table_name]
+    
+    def _can_acquire_lock(self, table_name: Optional[str], lock_type: LockType) -> bool:
         """检查是否可以获取锁"""
-        if request.lock_type == LockType.SHARED:
+        holders = self._locks_by_table.get(table_name)
+        if not holders:
+            return True
+            
+        if lock_type == LockType.SHARED:
             # 共享锁：检查是否有排他锁
-            for active_request in self.active_locks.values():
-                if (active_request.table_name == request.table_name and
-                    active_request.lock_type == LockType.EXCLUSIVE):
-                    return False
-        else:
-            # 排他锁：检查是否有任何锁
-            for active_request in self.active_locks.values():
-                if active_request.table_name == request.table_name:
-                    return False
-                    
-        return True
-    
-    def _update_wait_graph(self, request: LockRequest):
-        """更新等待图（用于死锁检测）"""
-        # 找出阻塞当前请求的锁
-        blocking_requests = []
-        
-        for active_request in self.active_locks.values():
-            if active_request.table_name == request.table_name:
-                if (request.lock_type == LockType.EXCLUSIVE or
-                    active_request.lock_type == LockType.EXCLUSIVE):
-                    blocking_requests.append(active_request.request_id)
-                    
-        # 更新等待图
-        if blocking_requests:
-            self.lock_wait_graph[request.request_id] = blocking_requests
+            return not holders.get(LockType.EXCLUSIVE)
+            
+        # 排他锁：检查是否有任何锁（空集合在释放时已回收）
+        return False
     
-    def release_table_lock(self, request_id: str):
+    def _build_wait_graph(self) -> Dict[str, List[str]]:
+        """按需构建等待图（等待者 -> 阻塞它的持有者），仅在死锁检测时调用"""
+        graph = {}
+        
+        for _, _, request in self._iter_waiters():
+            holders = self._locks_by_table.get(request.table_name)
+            if not holders:
+                continue
+                
+            # 与 _can_acquire_lock 一致：共享锁只被排他锁阻塞，其余锁被任何持有者阻塞
+            if request.lock_type == LockType.SHARED:
+                blocking_requests = list(holders.get(LockType.EXCLUSIVE, ()))
+            else:
+                blocking_requests = [
+                    request_id for request_ids in holders.values() for request_id in request_ids
+                ]
+                
+            if blocking_requests:
+                graph[request.request_id] = blocking_requests
+                
+        return graph
+    
+    def release_table_lock(self, request_id: str) -> None:
         """释放表级锁"""
         with self.manager_lock:
             if request_id in self.active_locks:
                 lock_request = self.active_locks[request_id]
-                del self.active_locks[request_id]
+                self._remove_active_lock(lock_request)
                 
                 self._record_lock_event(lock_request, LockState.RELEASED)
                 
                 # 通知等待线程
                 self.condition.notify_all()
                 
-                # 处理等待队列
-                self._process_waiting_queue()
+                # 处理该表的等待队列
+                self._process_waiting_queue(lock_request.table_name)
     
-    def _process_waiting_queue(self):
-        """处理等待队列"""
-        processed = []
-        
-        while not self.waiting_queue.empty():
-            priority, lock_request = self.waiting_queue.get()
+    def _process_waiting_queue(self, table_name: Optional[str]) -> None:
+        """处理指定表的等待队列（按优先级授予，队首受阻即停止）"""
+        heap = self._waiters_by_table.get(table_name)
+        if heap is None:
+            return
             
-            if self._can_acquire_lock(lock_request):
-                self.active_locks[lock_request.request_id] = lock_request
-                self._record_lock_event(lock_request, LockState.ACQUIRED)
-                self.condition.notify_all()
-            else:
-                processed.append((priority, lock_request))
+        granted = False
+        while heap:
+            lock_request = heap[0][2]
+            
+            if lock_request.is_expired():
+                # 请求方已超时放弃，不再授予
+                heapq.heappop(heap)
+                continue
+                
+            if not self._can_acquire_lock(lock_request.table_name, lock_request.lock_type):
+                break
                 
-        # 将未处理的请求放回队列
-        for item in processed:
-            self.waiting_queue.put(item)
+            heapq.heappop(heap)
+            self._add_active_lock(lock_request)
+            self._record_lock_event(lock_request, LockState.ACQUIRED)
+            granted = True
+            
+        if not heap:
+            del self._waiters_by_table[table_name]
+            
+        if granted:
+            self.condition.notify_all()
+    
+    def _iter_waiters(self) -> Iterator[Tuple[int, int, LockRequest]]:
+        """遍历所有表的等待项"""
+        for heap in self._waiters_by_table.values():
+            yield from heap
+    
+    def _waiting_count(self) -> int:
+        """当前等待中的请求数"""
+        return sum(len(heap) for heap in self._waiters_by_table.values())
     
     def _generate_request_id(self) -> str:
-        """生成唯一的请求ID"""
-        timestamp = datetime.now().isoformat()
-        thread_id = threading.current_thread().ident
-        random_str = str(random.random())
-        return hashlib.md5(f"{timestamp}_{thread_id}_{random_str}".encode()).hexdigest()[:16]
+        """生成唯一的请求ID（线程标识-序号，进程内唯一）"""
+        return f"{threading.get_ident():x}-{next(self._req_seq):x}"
     
-    def _record_lock_event(self, request: LockRequest, state: LockState):
+    def _record_lock_event(self, request: LockRequest, state: LockState) -> None:
         """记录锁事件"""
-        event = {
-            'request_id': request.request_id,
-            'table_name': request.table_name,
-            'lock_type': request.lock_type.value,
-            'state': state.value,
-            'timestamp': datetime.now().isoformat(),
-            'wait_time': (datetime.now() - request.request_time).total_seconds()
-        }
-        
-        self.lock_history.append(event)
+        now = time.monotonic()
+        wait_time = now - request.request_time_mono
+        self.lock_history.append(
+            (request.request_id, request.table_name, request.lock_type, state, now, wait_time)
+        )
         
         # 更新统计
         self.statistics.total_requests += 1
         
-        if request.lock_type.value not in self.statistics.lock_type_distribution:
-            self.statistics.lock_type_distribution[request.lock_type.value] = 0
         self.statistics.lock_type_distribution[request.lock_type.value] += 1
         
         if request.table_name:
-            if request.table_name not in self.statistics.table_lock_distribution:
-                self.statistics.table_lock_distribution[request.table_name] = 0
             self.statistics.table_lock_distribution[request.table_name] += 1
             
-        # 更新平均等待时间
+        # 累计等待时间
         if state == LockState.ACQUIRED:
-            wait_time = (datetime.now() - request.request_time).total_seconds()
-            current_avg = self.statistics.average_wait_time
-            current_count = self.statistics.successful_acquisitions
-            new_avg = (current_avg * current_count + wait_time) / (current_count + 1)
-            self.statistics.average_wait_time = new_avg
+            self.statistics.sum_wait_time += wait_time
+            self.statistics.wait_samples += 1
             
         # 更新峰值并发锁
         current_locks = len(self.active_locks)
@@ -651,7 +876,7 @@ class DatabaseLockManager:
             try:
                 # 检测死锁
                 with self.manager_lock:
-                    if self.lock_wait_graph:
+                    if self._waiters_by_table:
                         deadlock_chains = self._detect_deadlock_cycles()
                         if deadlock_chains:
                             logger.warning(f"🔒 检测到 {len(deadlock_chains)} 个潜在死锁")
@@ -663,6 +888,11 @@ class DatabaseLockManager:
                 # 处理超时请求
                 self._handle_timeout_requests()
                 
+                # 控制 WAL 文件大小
+                if time.monotonic() - self._last_wal_check_mono >= self.wal_checkpoint_interval:
+                    self._last_wal_check_mono = time.monotonic()
+                    self._checkpoint_wal_if_needed()
+                
                 # 记录统计信息
                 if self.statistics.total_requests > 0 and self.statistics.total_requests % 100 == 0:
                     self._log_statistics()
@@ -675,13 +905,37 @@ class DatabaseLockManager:
                 
         logger.info("🔒 数据库锁监控循环结束")
     
+    def _checkpoint_wal_if_needed(self):
+        """WAL 文件过大时执行 RESTART 检查点"""
+        try:
+            wal_size = os.path.getsize(f"{self.db_path}-wal")
+        except OSError:
+            return
+            
+        if wal_size <= self.wal_size_limit:
+            return
+            
+        with self.acquire_connection() as conn:
+            # 检查点持有写锁期间其他写入都在等待，临时缩短忙等待超时，结束后恢复
+            conn.execute(f"PRAGMA busy_timeout={_WAL_CHECKPOINT_BUSY_TIMEOUT_MS}")
+            try:
+                busy, log_pages, checkpointed = conn.execute("PRAGMA wal_checkpoint(RESTART)").fetchone()
+            finally:
+                conn.execute(f"PRAGMA busy_timeout={int(self.default_timeout * 1000)}")
+            
+        logger.info(
+            f"🔒 WAL 检查点: 文件 {wal_size / (1024 * 1024):.1f}MB，"
+            f"已回写 {checkpointed}/{log_pages} 页{'（存在读者，未能重启 WAL）' if busy else ''}"
+        )
+    
     def _cleanup_idle_connections(self):
         """清理空闲连接"""
         with self.manager_lock:
             idle_connections = []
             
+            # 写连接常驻，只回收空闲的只读连接
             for conn_id, conn_info in self.connection_pool.items():
-                if conn_info.is_idle(self.connection_idle_timeout):
+                if conn_info.readonly and conn_info.is_idle(self.connection_idle_timeout):
                     idle_connections.append(conn_id)
                     
             # 保留最小连接数
@@ -696,20 +950,23 @@ class DatabaseLockManager:
         with self.manager_lock:
             timeout_requests = []
             
-            # 检查等待队列中的超时请求
-            temp_queue = []
-            
-            while not self.waiting_queue.empty():
-                priority, request = self.waiting_queue.get()
-                if request.is_expired():
-                    timeout_requests.append(request)
-                    self._record_lock_event(request, LockState.TIMEOUT)
-                else:
-                    temp_queue.append((priority, request))
-                    
-            # 重新填充队列
-            for item in temp_queue:
-                self.waiting_queue.put(item)
+            # 检查各表等待队列中的超时请求
+            for table_name, heap in list(self._waiters_by_table.items()):
+                remaining = []
+                
+                for item in heap:
+                    request = item[2]
+                    if request.is_expired():
+                        timeout_requests.append(request)
+                        self._record_lock_event(request, LockState.TIMEOUT)
+                    else:
+                        remaining.append(item)
+                        
+                if len(remaining) < len(heap):
+                    heapq.heapify(remaining)
+                    self._waiters_by_table[table_name] = remaining
+                    # 移除超时的队首后，后续等待者可能已可授予
+                    self._process_waiting_queue(table_name)
                 
             if timeout_requests:
                 logger.warning(f"🔒 处理了 {len(timeout_requests)} 个超时请求")
@@ -729,67 +986,99 @@ class DatabaseLockManager:
     
     def get_statistics(self) -> Dict[str, Any]:
         """获取统计信息"""
+        stats = self.statistics
+        
+        # 锁内只读取标量计数，保证它们彼此一致
         with self.manager_lock:
-            return {
-                'total_requests': self.statistics.total_requests,
-                'successful_acquisitions': self.statistics.successful_acquisitions,
-                'success_rate': self.statistics.successful_acquisitions / self.statistics.total_requests 
-                                if self.statistics.total_requests > 0 else 0,
-                'timeouts': self.statistics.timeouts,
-                'deadlocks': self.statistics.deadlocks,
-                'retries': self.statistics.retries,
-                'average_wait_time': self.statistics.average_wait_time,
-                'peak_concurrent_locks': self.statistics.peak_concurrent_locks,
+            snapshot = {
+                'total_requests': stats.total_requests,
+                'successful_acquisitions': stats.successful_acquisitions,
+                'timeouts': stats.timeouts,
+                'deadlocks': stats.deadlocks,
+                'retries': stats.retries,
+                'average_wait_time': stats.average_wait_time,
+                'peak_concurrent_locks': stats.peak_concurrent_locks,
                 'current_active_locks': len(self.active_locks),
-                'waiting_requests': self.waiting_queue.qsize(),
+                'waiting_requests': self._waiting_count(),
                 'connection_pool_size': len(self.connection_pool),
-                'lock_type_distribution': dict(self.statistics.lock_type_distribution),
-                'table_lock_distribution': dict(self.statistics.table_lock_distribution)
             }
+            
+        # 分布在锁外复制：dict.copy 在C层一次完成，不会与并发写入交错
+        type_distribution = dict.copy(stats.lock_type_distribution)
+        table_distribution = Counter(dict.copy(stats.table_lock_distribution))
+        
+        snapshot['success_rate'] = (
+            snapshot['successful_acquisitions'] / snapshot['total_requests']
+            if snapshot['total_requests'] > 0 else 0
+        )
+        snapshot['lock_type_distribution'] = type_distribution
+        snapshot['table_lock_distribution'] = dict(table_distribution.most_common(_TABLE_DISTRIBUTION_TOP_K))
+        return snapshot
+    
+    def get_history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """获取锁事件历史（最近的在后）"""
+        with self.manager_lock:
+            events = list(self.lock_history)
+            
+        if limit is not None:
+            events = events[-limit:]
+            
+        # 单调时间戳换算为墙钟时间，仅在读取时进行
+        offset = time.time() - time.monotonic()
+        return [
+            {
+                'request_id': request_id,
+                'table_name': table_name,
+                'lock_type': lock_type.value,
+                'state': state.value,
+                'timestamp': datetime.fromtimestamp(offset + timestamp).isoformat(),
+                'wait_time': wait_time
+            }
+            for request_id, table_name, lock_type, state, timestamp, wait_time in events
+        ]
     
     def optimize_for_performance(self):
-        """优化数据库性能设置"""
+        """优化数据库性能设置（增量进行，不长时间阻塞写者）"""
         try:
             with self.acquire_connection() as conn:
-                # 分析数据库
-                conn.execute("ANALYZE")
+                # 只对统计信息过期的表重新分析
+                conn.execute("PRAGMA optimize")
                 
-                # 重建索引
-                conn.execute("REINDEX")
+                # 增量回收空闲页（需要 auto_vacuum=INCREMENTAL）
+                conn.execute("PRAGMA incremental_vacuum(1000)").fetchall()
                 
-                # 清理数据库
-                conn.execute("VACUUM")
+                # 不等待读者的被动检查点
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
                 
                 logger.info("🔒 数据库性能优化完成")
                 
         except Exception as e:
             logger.error(f"🔒 性能优化失败: {e}")
     
+    def vacuum_full(self):
+        """完整重建数据库文件（会长时间独占数据库，仅在维护窗口执行）"""
+        try:
+            with self.acquire_connection() as conn:
+                # VACUUM 时应用增量 auto_vacuum 模式，已有库借此完成转换
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+                conn.execute("REINDEX")
+                
+                logger.info("🔒 数据库完整清理完成")
+                
+        except Exception as e:
+            logger.error(f"🔒 数据库完整清理失败: {e}")
+    
     def get_system_metrics(self) -> Dict[str, Any]:
         """获取系统指标"""
         try:
             # 获取系统资源使用情况
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             
             # 获取SQLite特定指标
-            sqlite_metrics = {}
-            
-            with self.acquire_connection() as conn:
-                # 页面缓存统计
-                result = conn.execute("PRAGMA page_count").fetchone()
-                sqlite_metrics['page_count'] = result[0] if result else 0
-                
-                result = conn.execute("PRAGMA page_size").fetchone()
-                sqlite_metrics['page_size'] = result[0] if result else 0
-                
-                result = conn.execute("PRAGMA cache_size").fetchone()
-                sqlite_metrics['cache_size'] = result[0] if result else 0
-                
-                # WAL模式检查
-                result = conn.execute("PRAGMA journal_mode").fetchone()
-                sqlite_metrics['journal_mode'] = result[0] if result else 'unknown'
+            sqlite_metrics = self._get_sqlite_metrics()
                 
             return {
                 'system': {
@@ -806,6 +1095,24 @@ class DatabaseLockManager:
         except Exception as e:
             logger.error(f"🔒 获取系统指标失败: {e}")
             return {}
+    
+    def _get_sqlite_metrics(self) -> Dict[str, Any]:
+        """获取SQLite指标（缓存 _SQLITE_METRICS_TTL 秒，避免频繁轮询反复查询数据库）"""
+        cached = self._sqlite_metrics_cache
+        if cached and time.monotonic() - cached[0] < _SQLITE_METRICS_TTL:
+            return dict(cached[1])
+            
+        with self.acquire_connection(readonly=True) as conn:
+            page_count, page_size, cache_size, journal_mode = conn.execute(_SQLITE_METRICS_SQL).fetchone()
+            
+        sqlite_metrics = {
+            'page_count': page_count or 0,
+            'page_size': page_size or 0,
+            'cache_size': cache_size or 0,
+            'journal_mode': journal_mode or 'unknown'
+        }
+        self._sqlite_metrics_cache = (time.monotonic(), sqlite_metrics)
+        return dict(sqlite_metrics)
 
 # 全局实例（延迟初始化）
 _database_lock_manager: Optional[DatabaseLockManager] = None
@@ -19,16 +19,206 @@
 """
 
 import os
+import re
+import stat
+import time
 import platform
+import threading
 from pathlib import Path
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, Tuple
 from functools import lru_cache
+from collections import OrderedDict
 
 from app.utils.logger import get_logger
 from app.utils.enhanced_config import get_enhanced_config
 
 logger = get_logger(__name__)
 
+# 硬编码路径模式（用于识别和转换）
+_HARDCODED_PATTERNS = {
+    'macos_dev': '/Users/ameureka/Desktop/twitter-trend',
+    'linux_prod': '/home/twitter-trend',
+    'linux_data2': '/data2/twitter-trend'
+}
+
+# 所有硬编码前缀合并成一个带命名分组的正则，一次扫描即可判断并定位命中的模式
+_HARDCODED_RE = re.compile('|'.join(
+    f'(?P<{name}>{re.escape(pattern)})' for name, pattern in _HARDCODED_PATTERNS.items()
+))
+
+# 可识别的运行环境
+_ENVIRONMENTS = ('development', 'production')
+
+# 路径解析结果缓存条目数
+_RESOLVE_CACHE_SIZE = 4096
+
+# stat 结果缓存的有效期（秒）与最大条目数
+_STAT_CACHE_TTL = 2.0
+_STAT_CACHE_MAX_ENTRIES = 4096
+
+# 已确认找不到的文件名的记录有效期（秒）与最多记录条数
+_MISSING_NAMES_TTL = 30.0
+_MISSING_NAMES_MAX = 1024
+
+# 项目目录下被视为媒体目录的名称关键字（与小写目录名比较）
+_MEDIA_DIR_KEYWORDS = ('output', 'media', 'video', 'audio')
+
+# 扫描项目目录查找媒体目录时的最大深度
+_MEDIA_DIR_SCAN_DEPTH = 3
+
+def _is_readable(st: os.stat_result) -> bool:
+    """根据 stat 结果判断当前进程是否可读，省去额外的 os.access 调用"""
+    if not hasattr(os, 'geteuid'):
+        return bool(st.st_mode & stat.S_IREAD)
+    
+    euid = os.geteuid()
+    if euid == 0:
+        return True
+    if st.st_uid == euid:
+        return bool(st.st_mode & stat.S_IRUSR)
+    if st.st_gid == os.getegid() or st.st_gid in os.getgroups():
+        return bool(st.st_mode & stat.S_IRGRP)
+    return bool(st.st_mode & stat.S_IROTH)
+
+def _is_hardcoded_path(path: str) -> bool:
+    """检查是否为硬编码路径"""
+    return _HARDCODED_RE.search(path) is not None
+
+def _convert_hardcoded_to_relative(hardcoded_path: str) -> str:
+    """将硬编码路径转换为相对路径"""
+    match = _HARDCODED_RE.search(hardcoded_path)
+    if match is not None:
+        pattern = _HARDCODED_PATTERNS[match.lastgroup]
+        # 移除硬编码前缀，获取相对部分
+        relative_part = hardcoded_path.replace(pattern, '').lstrip('/')
+        if relative_part:
+            logger.debug(f"硬编码路径转换: {hardcoded_path} -> {relative_part}")
+            return relative_part
+        else:
+            return '.'
+    
+    # 如果无法转换，尝试查找 'project' 目录
+    path_obj = Path(hardcoded_path)
+    parts = path_obj.parts
+    try:
+        project_index = parts.index('project')
+        relative_parts = parts[project_index:]
+        relative_path = str(Path(*relative_parts))
+        logger.debug(f"通过project目录转换: {hardcoded_path} -> {relative_path}")
+        return relative_path
+    except ValueError:
+        pass
+    
+    logger.warning(f"无法转换硬编码路径: {hardcoded_path}")
+    return hardcoded_path
+
+@lru_cache(maxsize=_RESOLVE_CACHE_SIZE)
+def _resolve_media_path(base_path: str, path_or_identifier: str) -> Path:
+    """基于给定基础路径解析媒体路径（按基础路径和原始字符串缓存）"""
+    is_hardcoded = _is_hardcoded_path(path_or_identifier)
+    
+    # 快速路径：非硬编码的 POSIX 绝对路径直接使用
+    if not is_hardcoded and path_or_identifier.startswith('/'):
+        return Path(path_or_identifier)
+    
+    path_obj = Path(path_or_identifier)
+    
+    # 如果是绝对路径
+    if path_obj.is_absolute():
+        # 检查是否为硬编码路径
+        if is_hardcoded:
+            # 转换为相对路径后重新解析
+            relative_path = _convert_hardcoded_to_relative(path_or_identifier)
+            return _resolve_media_path(base_path, relative_path)
+        else:
+            # 直接使用绝对路径
+            return path_obj
+    
+    # 相对路径：基于当前环境的基础路径解析
+    resolved_path = Path(base_path) / path_obj
+    
+    logger.debug(f"路径解析: {path_or_identifier} -> {resolved_path}")
+    return resolved_path
+
+@lru_cache(maxsize=4)
+def _detect_environment(env_var: Optional[str], config_env: Optional[str],
+                        current_path: str, system: str) -> str:
+    """根据环境变量、配置、当前目录和操作系统检测运行环境（按输入缓存）"""
+    # 优先使用环境变量
+    if env_var in _ENVIRONMENTS:
+        logger.info(f"从环境变量检测到环境: {env_var}")
+        return env_var
+    
+    # 从配置文件检测
+    if config_env in _ENVIRONMENTS:
+        logger.info(f"从配置文件检测到环境: {config_env}")
+        return config_env
+    
+    # 自动检测
+    # 开发环境指标
+    dev_indicators = [
+        '/Users/' in current_path,  # macOS用户目录
+        'Desktop' in current_path,  # 桌面开发
+        system == 'Darwin'  # macOS系统
+    ]
+    
+    # 生产环境指标
+    prod_indicators = [
+        '/home/' in current_path,  # Linux用户目录
+        '/data2/' in current_path,  # 生产服务器路径
+        system == 'Linux'  # Linux系统
+    ]
+    
+    dev_score = sum(dev_indicators)
+    prod_score = sum(prod_indicators)
+    
+    if dev_score > prod_score:
+        detected_env = 'development'
+    elif prod_score > dev_score:
+        detected_env = 'production'
+    else:
+        # 默认根据系统判断
+        detected_env = 'development' if system == 'Darwin' else 'production'
+    
+    logger.info(f"自动检测环境: {detected_env} (开发:{dev_score}, 生产:{prod_score})")
+    return detected_env
+
+@lru_cache(maxsize=4)
+def _determine_base_path(environment: str, current_path: str,
+                         env_base_path: Optional[str]) -> Path:
+    """根据环境、当前目录和环境变量确定基础路径（按输入缓存）"""
+    # 优先使用环境变量
+    if env_base_path and Path(env_base_path).exists():
+        logger.info(f"使用环境变量基础路径: {env_base_path}")
+        return Path(env_base_path)
+    
+    # 根据环境确定基础路径
+    if environment == 'development':
+        # 开发环境：优先使用当前项目目录
+        candidates = [
+            Path(current_path),  # 当前工作目录
+            Path(__file__).parent.parent.parent,  # 项目根目录
+            Path('/Users/ameureka/Desktop/twitter-trend')  # 默认开发路径
+        ]
+    else:
+        # 生产环境：使用生产路径
+        candidates = [
+            Path('/home/twitter-trend'),
+            Path('/data2/twitter-trend'),
+            Path(current_path)  # 当前工作目录作为后备
+        ]
+    
+    # 选择第一个存在的路径
+    for candidate in candidates:
+        if candidate.exists() and (candidate / 'app').exists():
+            logger.info(f"选择基础路径: {candidate}")
+            return candidate
+    
+    # 如果都不存在，使用当前工作目录
+    fallback = Path(current_path)
+    logger.warning(f"使用后备基础路径: {fallback}")
+    return fallback
+
 class DynamicPathManager:
     """动态路径管理器"""
     
@@ -37,15 +227,19 @@ class DynamicPathManager:
         self._base_path_cache = None
         self._environment_cache = None
         
+        # stat 结果缓存: 路径 -> (单调时间戳, stat 结果或 None)
+        self._stat_cache: Dict[str, Tuple[float, Optional[os.stat_result]]] = {}
+        
+        # 负查找缓存: 文件名 -> 确认不存在时的单调时间戳（按记录先后淘汰，过期后重新查找）
+        self._missing_names: OrderedDict[str, float] = OrderedDict()
+        # 实例为进程级单例，负查找缓存的读改写需加锁
+        self._missing_lock = threading.Lock()
+        
         # 环境检测模式
         self.auto_detect_environment = True
         
         # 硬编码路径模式（用于识别和转换）
-        self.hardcoded_patterns = {
-            'macos_dev': '/Users/ameureka/Desktop/twitter-trend',
-            'linux_prod': '/home/twitter-trend',
-            'linux_data2': '/data2/twitter-trend'
-        }
+        self.hardcoded_patterns = _HARDCODED_PATTERNS
         
         logger.info(f"动态路径管理器初始化完成")
         logger.info(f"当前系统: {platform.system()}")
@@ -67,84 +261,21 @@ class DynamicPathManager:
     
     def _detect_environment(self) -> str:
         """检测当前运行环境"""
-        # 优先使用环境变量
         env_var = os.environ.get('TWITTER_TREND_ENV')
-        if env_var in ['development', 'production']:
-            logger.info(f"从环境变量检测到环境: {env_var}")
-            return env_var
-        
-        # 从配置文件检测
-        config_env = self.config.get('environment')
-        if config_env in ['development', 'production']:
-            logger.info(f"从配置文件检测到环境: {config_env}")
-            return config_env
-        
-        # 自动检测
-        current_path = os.getcwd()
-        system = platform.system()
-        
-        # 开发环境指标
-        dev_indicators = [
-            '/Users/' in current_path,  # macOS用户目录
-            'Desktop' in current_path,  # 桌面开发
-            system == 'Darwin'  # macOS系统
-        ]
-        
-        # 生产环境指标
-        prod_indicators = [
-            '/home/' in current_path,  # Linux用户目录
-            '/data2/' in current_path,  # 生产服务器路径
-            system == 'Linux'  # Linux系统
-        ]
-        
-        dev_score = sum(dev_indicators)
-        prod_score = sum(prod_indicators)
-        
-        if dev_score > prod_score:
-            detected_env = 'development'
-        elif prod_score > dev_score:
-            detected_env = 'production'
-        else:
-            # 默认根据系统判断
-            detected_env = 'development' if system == 'Darwin' else 'production'
-        
-        logger.info(f"自动检测环境: {detected_env} (开发:{dev_score}, 生产:{prod_score})")
-        return detected_env
+        config_env = None
+        if env_var not in _ENVIRONMENTS:
+            config_env = self.config.get('environment')
+            if config_env not in _ENVIRONMENTS:
+                config_env = None
+        
+        # 检测结果按输入缓存，重复创建实例时无需再次探测
+        return _detect_environment(env_var, config_env, os.getcwd(), platform.system())
     
     def _determine_base_path(self) -> Path:
         """确定基础路径"""
-        # 优先使用环境变量
-        env_base_path = os.environ.get('TWITTER_TREND_BASE_PATH')
-        if env_base_path and Path(env_base_path).exists():
-            logger.info(f"使用环境变量基础路径: {env_base_path}")
-            return Path(env_base_path)
-        
-        # 根据环境确定基础路径
-        if self.current_environment == 'development':
-            # 开发环境：优先使用当前项目目录
-            candidates = [
-                Path.cwd(),  # 当前工作目录
-                Path(__file__).parent.parent.parent,  # 项目根目录
-                Path('/Users/ameureka/Desktop/twitter-trend')  # 默认开发路径
-            ]
-        else:
-            # 生产环境：使用生产路径
-            candidates = [
-                Path('/home/twitter-trend'),
-                Path('/data2/twitter-trend'),
-                Path.cwd()  # 当前工作目录作为后备
-            ]
-        
-        # 选择第一个存在的路径
-        for candidate in candidates:
-            if candidate.exists() and (candidate / 'app').exists():
-                logger.info(f"选择基础路径: {candidate}")
-                return candidate
-        
-        # 如果都不存在，使用当前工作目录
-        fallback = Path.cwd()
-        logger.warning(f"使用后备基础路径: {fallback}")
-        return fallback
+        return _determine_base_path(
+            self.current_environment, os.getcwd(), os.environ.get('TWITTER_TREND_BASE_PATH')
+        )
     
     def resolve_media_path(self, path_or_identifier: str) -> Path:
         """解析媒体文件路径
@@ -158,55 +289,46 @@ class DynamicPathManager:
         if not path_or_identifier:
             raise ValueError("路径不能为空")
         
-        path_obj = Path(path_or_identifier)
-        
-        # 如果是绝对路径
-        if path_obj.is_absolute():
-            # 检查是否为硬编码路径
-            if self._is_hardcoded_path(path_or_identifier):
-                # 转换为相对路径后重新解析
-                relative_path = self._convert_hardcoded_to_relative(path_or_identifier)
-                return self.resolve_media_path(relative_path)
-            else:
-                # 直接使用绝对路径
-                return path_obj
-        
-        # 相对路径：基于当前环境的基础路径解析
-        resolved_path = self.base_path / path_obj
-        
-        logger.debug(f"路径解析: {path_or_identifier} -> {resolved_path}")
-        return resolved_path
+        # 基础路径作为缓存键的一部分，基础路径变化后自然不会命中旧结果
+        return _resolve_media_path(str(self.base_path), path_or_identifier)
     
     def _is_hardcoded_path(self, path: str) -> bool:
         """检查是否为硬编码路径"""
-        return any(pattern in path for pattern in self.hardcoded_patterns.values())
+        return _is_hardcoded_path(path)
     
     def _convert_hardcoded_to_relative(self, hardcoded_path: str) -> str:
         """将硬编码路径转换为相对路径"""
-        for pattern_name, pattern in self.hardcoded_patterns.items():
-            if pattern in hardcoded_path:
-                # 移除硬编码前缀，获取相对部分
-                relative_part = hardcoded_path.replace(pattern, '').lstrip('/')
-                if relative_part:
-                    logger.debug(f"硬编码路径转换: {hardcoded_path} -> {relative_part}")
-                    return relative_part
-                else:
-                    return '.'
-        
-        # 如果无法转换，尝试查找 'project' 目录
-        path_obj = Path(hardcoded_path)
-        parts = path_obj.parts
-        try:
-            project_index = parts.index('project')
-            relative_parts = parts[project_index:]
-            relative_path = str(Path(*relative_parts))
-            logger.debug(f"通过project目录转换: {hardcoded_path} -> {relative_path}")
-            return relative_path
-        except ValueError:
-            pass
+        return _convert_hardcoded_to_relative(hardcoded_path)
+    
+    def _cached_stat(self, path: Union[str, Path]) -> Optional[os.stat_result]:
+        """获取文件 stat 结果（短时缓存），文件不存在时返回 None"""
+        key = str(path)
+        now = time.monotonic()
+        
+        cached = self._stat_cache.get(key)
+        if cached is not None and now - cached[0] < _STAT_CACHE_TTL:
+            return cached[1]
         
-        logger.warning(f"无法转换硬编码路径: {hardcoded_path}")
-        return hardcoded_path
+        try:
+            st = os.stat(key)
+        except (OSError, ValueError):
+            st = None
+        
+        if len(self._stat_cache) >= _STAT_CACHE_MAX_ENTRIES:
+            self._stat_cache.clear()
+        self._stat_cache[key] = (now, st)
+        return st
+    
+    def _fill_file_status(self, result: Dict[str, Any], path: Path):
+        """用一次 stat 填充存在性、可读性和大小"""
+        st = self._cached_stat(path)
+        result['exists'] = st is not None
+        
+        if st is not None:
+            result['readable'] = _is_readable(st)
+            result['size'] = st.st_size
+            # 文件存在且可读则认为有效
+            result['valid'] = result['readable'] and result['size'] > 0
     
     def validate_media_file(self, path_or_identifier: str) -> Dict[str, Any]:
         """验证媒体文件
@@ -242,25 +364,16 @@ class DynamicPathManager:
                 result['converted_path'] = self._convert_hardcoded_to_relative(path_or_identifier)
             
             # 检查文件存在性
-            result['exists'] = resolved_path.exists()
+            self._fill_file_status(result, resolved_path)
             
-            if result['exists']:
-                result['readable'] = os.access(resolved_path, os.R_OK)
-                result['size'] = resolved_path.stat().st_size
-                # 文件存在且可读则认为有效
-                result['valid'] = result['readable'] and result['size'] > 0
-            else:
+            if not result['exists']:
                 # 如果文件不存在，尝试通过文件名搜索
                 found_files = self._find_files_by_name(Path(path_or_identifier).name)
                 if found_files:
                     # 使用找到的第一个文件
                     found_path = Path(found_files[0])
                     result['resolved_path'] = str(found_path)
-                    result['exists'] = found_path.exists()
-                    if result['exists']:
-                        result['readable'] = os.access(found_path, os.R_OK)
-                        result['size'] = found_path.stat().st_size
-                        result['valid'] = result['readable'] and result['size'] > 0
+                    self._fill_file_status(result, found_path)
             
         except Exception as e:
             result['error'] = str(e)
@@ -305,6 +418,9 @@ class DynamicPathManager:
         """
         full_path = self.base_path / relative_path
         full_path.mkdir(parents=True, exist_ok=True)
+        # 目录刚创建，缓存中的“不存在”结果已失效
+        self._stat_cache.clear()
+        self._missing_names.clear()
         return full_path
     
     @lru_cache(maxsize=128)
@@ -335,12 +451,24 @@ class DynamicPathManager:
             if media_path.exists():
                 search_paths.append(media_path)
         
-        # 3. 递归搜索项目目录下的媒体目录
+        # 3. 扫描项目目录下的媒体目录（只遍历目录，限制深度，不跟随符号链接）
         if project_dir.exists():
-            for subdir in project_dir.rglob('*'):
-                if subdir.is_dir() and any(keyword in subdir.name.lower() 
-                                         for keyword in ['output', 'media', 'video', 'audio']):
-                    search_paths.append(subdir)
+            stack = [(str(project_dir), 0)]
+            while stack:
+                current_dir, depth = stack.pop()
+                if depth >= _MEDIA_DIR_SCAN_DEPTH:
+                    continue
+                try:
+                    with os.scandir(current_dir) as entries:
+                        for entry in entries:
+                            if not entry.is_dir(follow_symlinks=False):
+                                continue
+                            name = entry.name.lower()
+                            if any(keyword in name for keyword in _MEDIA_DIR_KEYWORDS):
+                                search_paths.append(Path(entry.path))
+                            stack.append((entry.path, depth + 1))
+                except OSError as e:
+                    logger.debug(f"扫描目录失败 {current_dir}: {e}")
         
         logger.debug(f"媒体搜索路径: {[str(p) for p in search_paths]}")
         return search_paths
@@ -356,19 +484,24 @@ class DynamicPathManager:
         """
         search_paths = self.get_media_search_paths()
         
+        # 先在所有搜索路径中直接查找，大多数情况在这一步命中
         for search_path in search_paths:
-            # 直接查找
             file_path = search_path / filename
-            if file_path.exists():
+            if self._cached_stat(file_path) is not None:
                 logger.info(f"找到媒体文件: {file_path}")
                 return file_path
-            
-            # 递归查找
-            for found_file in search_path.rglob(filename):
-                if found_file.is_file():
-                    logger.info(f"递归找到媒体文件: {found_file}")
-                    return found_file
         
+        # 近期已确认不存在的文件名不再递归遍历（记录过期后会重新查找）
+        if self._is_known_missing(filename):
+            logger.warning(f"未找到媒体文件: {filename}")
+            return None
+        
+        # 直接查找全部失败后再递归查找，找到即返回
+        for found_file in self._walk_for_file(search_paths, filename):
+            logger.info(f"递归找到媒体文件: {found_file}")
+            return found_file
+        
+        self._remember_missing(filename)
         logger.warning(f"未找到媒体文件: {filename}")
         return None
     
@@ -387,19 +520,56 @@ class DynamicPathManager:
         for search_path in search_paths:
             # 直接查找
             file_path = search_path / filename
-            if file_path.exists():
+            if self._cached_stat(file_path) is not None:
                 found_files.append(str(file_path))
-            
-            # 递归查找
-            for found_file in search_path.rglob(filename):
-                if found_file.is_file():
-                    found_files.append(str(found_file))
+        
+        # 递归查找（近期已确认不存在的文件名跳过遍历）
+        if found_files or not self._is_known_missing(filename):
+            found_files.extend(str(found_file) for found_file in self._walk_for_file(search_paths, filename))
         
         # 去重
         found_files = list(set(found_files))
+        
+        if not found_files:
+            self._remember_missing(filename)
+        
         logger.debug(f"通过文件名 '{filename}' 找到文件: {found_files}")
         return found_files
     
+    def _walk_for_file(self, search_paths: list[Path], filename: str):
+        """递归遍历搜索路径，逐个产出名为 filename 的文件
+        
+        已被先前搜索路径覆盖的子目录不会重复遍历，也不跟随符号链接。
+        """
+        walked_roots = []
+        for search_path in search_paths:
+            if any(root == search_path or root in search_path.parents for root in walked_roots):
+                continue
+            walked_roots.append(search_path)
+            
+            for root, _dirs, files in os.walk(search_path, followlinks=False):
+                if filename in files:
+                    yield Path(root) / filename
+    
+    def _is_known_missing(self, filename: str) -> bool:
+        """文件名是否在有效期内被确认不存在，过期记录顺带删除"""
+        with self._missing_lock:
+            missed_at = self._missing_names.get(filename)
+            if missed_at is None:
+                return False
+            if time.monotonic() - missed_at < _MISSING_NAMES_TTL:
+                return True
+            del self._missing_names[filename]
+            return False
+    
+    def _remember_missing(self, filename: str):
+        """记录确认不存在的文件名，超出上限时淘汰最早的记录"""
+        with self._missing_lock:
+            self._missing_names.pop(filename, None)
+            self._missing_names[filename] = time.monotonic()
+            if len(self._missing_names) > _MISSING_NAMES_MAX:
+                self._missing_names.popitem(last=False)
+    
     def get_environment_info(self) -> Dict[str, Any]:
         """获取环境信息
         
@@ -424,17 +594,26 @@ class DynamicPathManager:
         """清除缓存"""
         self._base_path_cache = None
         self._environment_cache = None
+        self._stat_cache.clear()
+        self._missing_names.clear()
         self.get_media_search_paths.cache_clear()
+        _resolve_media_path.cache_clear()
+        _detect_environment.cache_clear()
+        _determine_base_path.cache_clear()
         logger.info("路径管理器缓存已清除")
 
 # 全局实例
 _dynamic_path_manager = None
+_dynamic_path_manager_lock = threading.Lock()
 
 def get_dynamic_path_manager() -> DynamicPathManager:
     """获取动态路径管理器实例"""
     global _dynamic_path_manager
+    # 已初始化时直接返回，无需加锁
     if _dynamic_path_manager is None:
-        _dynamic_path_manager = DynamicPathManager()
+        with _dynamic_path_manager_lock:
+            if _dynamic_path_manager is None:
+                _dynamic_path_manager = DynamicPathManager()
     return _dynamic_path_manager
 
 def resolve_media_path(path_or_identifier: str) -> Path:
@@ -30,6 +30,61 @@ from app.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+# 扁平化的默认配置（点分键），配置文件缺失时的回退来源
+_DEFAULTS_FLAT: Dict[str, Any] = {
+    'project_base_path': './project',
+    'database.path': './data/twitter_publisher.db',
+    'database.backup_path': './data/backups',
+    'logging.path': './logs/app.log',
+    'logging.level': 'INFO',
+    'logging.max_size': '10MB',
+    'logging.backup_count': 5,
+    'scheduler.interval': 30,
+    'scheduler.max_retries': 3,
+    'scheduler.max_workers': 3,
+    'scheduler.batch_size': 5,
+    'scheduler.backoff_factor': 2.0,
+    'task.stuck_timeout': 300,
+    'task.lock_timeout': 60,
+    'task.max_retries': 3,
+    'publishing.default_language': 'zh',
+    'publishing.ai_enhancement': True,
+    'publishing.rate_limit.tweets_per_hour': 50,
+    'publishing.rate_limit.tweets_per_day': 300,
+    'api.host': '127.0.0.1',
+    'api.port': 8050,
+    'api.debug': False,
+    'api.cors_origins': ['*'],
+    'monitoring.enabled': True,
+    'monitoring.metrics_retention_days': 30,
+    'monitoring.alert_thresholds.error_rate': 0.1,
+    'monitoring.alert_thresholds.response_time': 5.0,
+}
+
+# 嵌套默认配置的JSON序列化结果，首次使用时构建
+_DEFAULTS_JSON: Optional[str] = None
+
+
+def _rebuild_nested(flat: Dict[str, Any]) -> Dict[str, Any]:
+    """将点分键的扁平字典还原为嵌套字典"""
+    nested: Dict[str, Any] = {}
+    for dotted_key, value in flat.items():
+        *parents, leaf = dotted_key.split('.')
+        current = nested
+        for k in parents:
+            current = current.setdefault(k, {})
+        current[leaf] = value
+    return nested
+
+
+def _get_defaults_json() -> str:
+    """获取嵌套默认配置的JSON字符串（惰性构建）"""
+    global _DEFAULTS_JSON
+    if _DEFAULTS_JSON is None:
+        _DEFAULTS_JSON = json.dumps(_rebuild_nested(_DEFAULTS_FLAT), ensure_ascii=False)
+    return _DEFAULTS_JSON
+
+
 @dataclass
 class ConfigSchema:
     """配置模式定义"""
@@ -302,54 +357,8 @@ class EnhancedConfigManager:
         }
         
     def _get_default_config(self) -> Dict[str, Any]:
-        """获取默认配置"""
-        return {
-            'project_base_path': './project',
-            'database': {
-                'path': './data/twitter_publisher.db',
-                'backup_path': './data/backups'
-            },
-            'logging': {
-                'path': './logs/app.log',
-                'level': 'INFO',
-                'max_size': '10MB',
-                'backup_count': 5
-            },
-            'scheduler': {
-                'interval': 30,
-                'max_retries': 3,
-                'max_workers': 3,
-                'batch_size': 5,
-                'backoff_factor': 2.0
-            },
-            'task': {
-                'stuck_timeout': 300,
-                'lock_timeout': 60,
-                'max_retries': 3
-            },
-            'publishing': {
-                'default_language': 'zh',
-                'ai_enhancement': True,
-                'rate_limit': {
-                    'tweets_per_hour': 50,
-                    'tweets_per_day': 300
-                }
-            },
-            'api': {
-                'host': '127.0.0.1',
-                'port': 8050,
-                'debug': False,
-                'cors_origins': ['*']
-            },
-            'monitoring': {
-                'enabled': True,
-                'metrics_retention_days': 30,
-                'alert_thresholds': {
-                    'error_rate': 0.1,
-                    'response_time': 5.0
-                }
-            }
-        }
+        """获取默认配置（从预序列化的默认配置反序列化，返回独立副本）"""
+        return json.loads(_get_defaults_json())
         
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置值"""
@@ -562,6 +571,16 @@ class EnhancedConfigManager:
                 
         return result
         
+    @property
+    def config_file_path(self) -> str:
+        """配置文件路径"""
+        return str(self.config_path)
+        
+    @property
+    def env_file_path(self) -> str:
+        """环境变量文件路径（load_dotenv 默认读取的 .env）"""
+        return str(Path('.env'))
+        
     def get_config_info(self) -> Dict[str, Any]:
         """获取配置信息"""
         return {
@@ -124,11 +124,15 @@ class PerformanceMonitor:
                 logger.error(f"性能监控错误: {e}")
                 time.sleep(self.monitoring_interval)
     
-    def _collect_metrics(self) -> PerformanceMetrics:
-        """收集性能指标"""
+    def _collect_metrics(self, cpu_interval: Optional[float] = 1) -> PerformanceMetrics:
+        """收集性能指标
+        
+        Args:
+            cpu_interval: CPU使用率的采样间隔（秒），None 表示不阻塞，返回自上次采样以来的使用率
+        """
         try:
             # CPU使用率
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=cpu_interval)
             
             # 内存使用情况
             memory = psutil.virtual_memory()
@@ -187,6 +191,10 @@ class PerformanceMonitor:
         with self._lock:
             return self.metrics_history[-1] if self.metrics_history else None
     
+    def sample_now(self) -> PerformanceMetrics:
+        """立即采集一次性能指标（不阻塞，不写入历史记录）"""
+        return self._collect_metrics(cpu_interval=None)
+    
     def get_metrics_summary(self, duration_minutes: int = 60) -> Dict[str, Any]:
         """获取指定时间段内的性能指标摘要"""
         cutoff_time = datetime.now() - timedelta(minutes=duration_minutes)
@@ -89,6 +89,13 @@ def validate_configuration():
             for warning in result['warnings']:
                 logger.warning(f"  - {warning}")
         
+        # 验证通过后创建运行所需的目录
+        dir_errors = validator.ensure_directories()
+        if dir_errors:
+            for error in dir_errors:
+                logger.error(f"  - {error}")
+            return False
+        
         logger.info("配置验证通过")
         return True
         